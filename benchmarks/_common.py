@@ -0,0 +1,266 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2016-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import array
+import asyncio
+import datetime
+import types
+import uuid
+
+from tests import _fakeserver as fs
+from gel.protocol import asyncio_proto
+from gel.protocol import protocol
+
+
+ROWS = 1000
+
+_str = fs.Scalar('std::str')
+_int64 = fs.Scalar('std::int64')
+_float64 = fs.Scalar('std::float64')
+
+# Representative result shapes: (type, rows).
+SHAPES = {
+    'flat_objects': (
+        fs.Shape({
+            'id': fs.Scalar('std::uuid'),
+            'name': _str,
+            'email': _str,
+            'bio': _str,
+            'age': _int64,
+            'visits': fs.Scalar('std::int32'),
+            'score': _float64,
+            'rating': fs.Scalar('std::float32'),
+            'active': fs.Scalar('std::bool'),
+            'session_length': fs.Scalar('std::duration'),
+        }, type_name='default::User'),
+        [
+            {
+                'id': uuid.UUID(int=i),
+                'name': f'user {i}',
+                'email': f'user{i}@example.com',
+                'bio': 'lorem ipsum dolor sit amet ' * 4,
+                'age': i,
+                'visits': i * 3,
+                'score': i / 7,
+                'rating': 4.5,
+                'active': i % 2 == 0,
+                'session_length': datetime.timedelta(seconds=i),
+            }
+            for i in range(ROWS)
+        ],
+    ),
+    'wide_objects': (
+        fs.Shape({
+            **{f'count{j}': _int64 for j in range(12)},
+            **{f'ratio{j}': _float64 for j in range(12)},
+            **{f'flag{j}': fs.Scalar('std::bool') for j in range(4)},
+            **{f'label{j}': _str for j in range(4)},
+        }, type_name='default::Metrics'),
+        [
+            {
+                **{f'count{j}': i * j for j in range(12)},
+                **{f'ratio{j}': i / (j + 1) for j in range(12)},
+                **{f'flag{j}': (i + j) % 2 == 0 for j in range(4)},
+                **{f'label{j}': f'label {i}' for j in range(4)},
+            }
+            for i in range(ROWS)
+        ],
+    ),
+    'nested_links': (
+        fs.Shape({
+            'title': _str,
+            'author': fs.Shape(
+                {'name': _str, 'email': _str}, type_name='default::User'),
+            'comments': fs.Set(fs.Shape({
+                'body': _str,
+                'author': fs.Shape({'name': _str}, type_name='default::User'),
+            }, type_name='default::Comment')),
+        }, type_name='default::Post'),
+        [
+            {
+                'title': f'post {i}',
+                'author': {'name': 'alice', 'email': 'alice@example.com'},
+                'comments': [
+                    {'body': f'comment {j}', 'author': {'name': 'bob'}}
+                    for j in range(5)
+                ],
+            }
+            for i in range(ROWS)
+        ],
+    ),
+    'arrays': (
+        fs.Shape({
+            'ints': fs.Array(_int64),
+            'strs': fs.Array(_str),
+        }),
+        [
+            {
+                'ints': list(range(100)),
+                'strs': [f'tag {j}' for j in range(10)],
+            }
+            for _ in range(ROWS)
+        ],
+    ),
+    'json': (
+        fs.Scalar('std::json'),
+        [
+            {'id': i, 'tags': ['a', 'b', 'c'], 'payload': 'x' * 900}
+            for i in range(ROWS)
+        ],
+    ),
+    'vectors': (
+        fs.Scalar('ext::pgvector::vector'),
+        [[float(j) for j in range(1536)] for _ in range(ROWS // 10)],
+    ),
+    'halfvecs': (
+        fs.Scalar('ext::pgvector::halfvec'),
+        [[j / 8 for j in range(1536)] for _ in range(ROWS // 10)],
+    ),
+    'bigints': (
+        fs.Tuple(*[fs.Scalar('std::bigint')] * 3),
+        [(i, i * 10 ** 15 + 12345, -(i + 1) * 7 ** 200) for i in range(ROWS)],
+    ),
+    'geometry': (
+        fs.Scalar('ext::postgis::geometry'),
+        # WKB of POINT(1 2)
+        [
+            b'\x01\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\xf0?'
+            b'\x00\x00\x00\x00\x00\x00\x00@'
+        ] * ROWS,
+    ),
+}
+
+ARGS_QUERY = fs.Query(
+    'INSERT User { name := <str>$name, age := <int64>$age, '
+    'score := <float64>$score, tags := <array<str>>$tags, '
+    'meta := <json>$meta }',
+    args=fs.Shape({
+        'name': _str,
+        'age': _int64,
+        'score': _float64,
+        'tags': fs.Array(_str),
+        'meta': fs.Scalar('std::json'),
+    }),
+    status='INSERT',
+)
+
+BIGINT_ARGS_QUERY = fs.Query(
+    'INSERT Entry { small := <bigint>$0, large := <bigint>$1, '
+    'huge := <bigint>$2 }',
+    args=fs.Shape({
+        '0': fs.Scalar('std::bigint'),
+        '1': fs.Scalar('std::bigint'),
+        '2': fs.Scalar('std::bigint'),
+    }),
+    status='INSERT',
+)
+
+BIGINT_ARGS = (42, 123456789012345678, -7 ** 200)
+
+VECTOR_ARGS_QUERY = fs.Query(
+    'INSERT Document { embedding := <ext::pgvector::vector>$0, '
+    'half := <ext::pgvector::halfvec>$1 }',
+    args=fs.Shape({
+        '0': fs.Scalar('ext::pgvector::vector'),
+        '1': fs.Scalar('ext::pgvector::halfvec'),
+    }),
+    status='INSERT',
+)
+
+VECTOR_ARGS = (
+    array.array('f', [j / 8 for j in range(1536)]),
+    array.array('f', [j / 8 for j in range(1536)]),
+)
+
+ARGS = {
+    'name': 'alice',
+    'age': 42,
+    'score': 0.5,
+    'tags': ['a', 'b', 'c', 'd'],
+    'meta': '{"key": "value"}',
+}
+
+
+def shape_query(name):
+    output, rows = SHAPES[name]
+    return fs.Query(f'SELECT {name}', output=output, rows=rows)
+
+
+def all_queries():
+    return [shape_query(name) for name in SHAPES] + [
+        ARGS_QUERY, BIGINT_ARGS_QUERY, VECTOR_ARGS_QUERY]
+
+
+class _LoopbackTransport(asyncio.Transport):
+    # Passes everything the protocol writes to a fake server session
+    # and feeds the reply back right away, so that a query completes
+    # without any I/O or event loop iteration.
+
+    def __init__(self, session):
+        super().__init__()
+        self._session = session
+        self.protocol = None
+
+    def write(self, data):
+        out = self._session.feed(bytes(data))
+        if out:
+            self.protocol.data_received(out)
+
+    def close(self):
+        pass
+
+    def is_closing(self):
+        return False
+
+    def pause_reading(self):
+        pass
+
+    def resume_reading(self):
+        pass
+
+
+async def connect_loopback(server):
+    """Return a protocol connected to the server without a socket."""
+    loop = asyncio.get_running_loop()
+    params = types.SimpleNamespace(
+        user='edgedb', database='edgedb', secret_key=None)
+    proto = asyncio_proto.AsyncIOProtocol(params, loop)
+    transport = _LoopbackTransport(server.new_session())
+    transport.protocol = proto
+    proto.connection_made(transport)
+    await proto.connect()
+    return proto
+
+
+def execute_context(
+    query, reg, qc, *, args=(), kwargs=None, output=True, lazy_objects=False
+):
+    return protocol.ExecuteContext(
+        query=query,
+        args=args,
+        kwargs=kwargs or {},
+        reg=reg,
+        qc=qc,
+        input_language=protocol.InputLanguage.EDGEQL,
+        output_format=(
+            protocol.OutputFormat.BINARY if output
+            else protocol.OutputFormat.NONE
+        ),
+        lazy_objects=lazy_objects,
+    )
@@ -0,0 +1,127 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2016-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""Decode and argument encode throughput of the protocol and codecs.
+
+Queries run on a protocol wired directly to a fake server session,
+so the timings cover message parsing and codec work only::
+
+    $ python -m benchmarks.bench_codecs
+"""
+
+
+import asyncio
+import time
+
+from tests import _fakeserver as fs
+from gel.protocol import protocol
+
+from . import _common
+
+
+async def _prepare(queries):
+    server = fs.FakeServer(queries)
+    proto = await _common.connect_loopback(server)
+    reg = protocol.CodecsRegistry()
+    qc = protocol.LRUMapping(maxsize=100)
+    return proto, reg, qc
+
+
+async def _bench_decode(loops, name):
+    query = _common.shape_query(name)
+    proto, reg, qc = await _prepare([query])
+    # Warm up the codecs and the query cache.
+    await proto.query(_common.execute_context(query.text, reg, qc))
+    t0 = time.perf_counter()
+    for _ in range(loops):
+        await proto.query(_common.execute_context(query.text, reg, qc))
+    return time.perf_counter() - t0
+
+
+async def _bench_decode_lazy(loops, name, field):
+    # Lazy decoding only pays off if few fields are read, so read one.
+    query = _common.shape_query(name)
+    proto, reg, qc = await _prepare([query])
+
+    def ctx():
+        return _common.execute_context(
+            query.text, reg, qc, lazy_objects=True)
+
+    await proto.query(ctx())
+    t0 = time.perf_counter()
+    for _ in range(loops):
+        for row in await proto.query(ctx()):
+            getattr(row, field)
+    return time.perf_counter() - t0
+
+
+async def _bench_encode_args(loops, query, args, kwargs):
+    proto, reg, qc = await _prepare([query])
+
+    def ctx():
+        return _common.execute_context(
+            query.text, reg, qc, args=args, kwargs=kwargs, output=False)
+
+    await proto.execute(ctx())
+    t0 = time.perf_counter()
+    for _ in range(loops):
+        await proto.execute(ctx())
+    return time.perf_counter() - t0
+
+
+def bench_decode(loops, name):
+    return asyncio.run(_bench_decode(loops, name))
+
+
+def bench_decode_lazy(loops, name, field):
+    return asyncio.run(_bench_decode_lazy(loops, name, field))
+
+
+def bench_encode_args(loops):
+    return asyncio.run(_bench_encode_args(
+        loops, _common.ARGS_QUERY, (), _common.ARGS))
+
+
+def bench_encode_bigint_args(loops):
+    return asyncio.run(_bench_encode_args(
+        loops, _common.BIGINT_ARGS_QUERY, _common.BIGINT_ARGS, None))
+
+
+def bench_encode_vector_args(loops):
+    return asyncio.run(_bench_encode_args(
+        loops, _common.VECTOR_ARGS_QUERY, _common.VECTOR_ARGS, None))
+
+
+def main():
+    import pyperf
+
+    runner = pyperf.Runner()
+    for name in _common.SHAPES:
+        runner.bench_time_func(f'decode_{name}', bench_decode, name)
+    runner.bench_time_func(
+        'decode_flat_objects_lazy', bench_decode_lazy, 'flat_objects', 'name')
+    runner.bench_time_func(
+        'decode_nested_links_lazy', bench_decode_lazy, 'nested_links', 'title')
+    runner.bench_time_func('encode_args', bench_encode_args)
+    runner.bench_time_func('encode_bigint_args', bench_encode_bigint_args)
+    runner.bench_time_func('encode_vector_args', bench_encode_vector_args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2016-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""Connection pool acquire/release overhead.
+
+The pool is connected to a fake server, the connection is acquired
+and released right away without running any queries::
+
+    $ python -m benchmarks.bench_pool
+"""
+
+
+import asyncio
+import time
+
+import gel
+from tests import _fakeserver as fs
+from gel import blocking_client
+
+
+async def _bench_acquire_async(loops):
+    async with fs.FakeServer() as server:
+        client = gel.create_async_client(**server.connect_args())
+        await client.ensure_connected()
+        impl = client._impl
+        try:
+            t0 = time.perf_counter()
+            for _ in range(loops):
+                con = await impl.acquire()
+                await impl.release(con)
+            return time.perf_counter() - t0
+        finally:
+            await client.aclose()
+
+
+def bench_acquire_async(loops):
+    return asyncio.run(_bench_acquire_async(loops))
+
+
+def bench_acquire_blocking(loops):
+    with fs.FakeServer().run_in_thread() as server:
+        client = gel.create_client(**server.connect_args())
+        client.ensure_connected()
+        impl = client._impl
+        try:
+            t0 = time.perf_counter()
+            for _ in range(loops):
+                con = blocking_client._iter_coroutine(impl.acquire())
+                blocking_client._iter_coroutine(impl.release(con))
+            return time.perf_counter() - t0
+        finally:
+            client.close()
+
+
+def main():
+    import pyperf
+
+    runner = pyperf.Runner()
+    runner.bench_time_func('pool_acquire_async', bench_acquire_async)
+    runner.bench_time_func('pool_acquire_blocking', bench_acquire_blocking)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2016-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""End-to-end client.query() latency against a fake server over TLS.
+
+    $ python -m benchmarks.bench_query
+"""
+
+
+import asyncio
+import time
+
+import gel
+from tests import _fakeserver as fs
+
+from . import _common
+
+
+QUERIES = {
+    'scalar': fs.Query(
+        'SELECT 1', output=fs.Scalar('std::int64'), rows=[1]),
+    'flat_objects': _common.shape_query('flat_objects'),
+}
+
+
+async def _bench_query_async(loops, name):
+    query = QUERIES[name]
+    async with fs.FakeServer([query]) as server:
+        client = gel.create_async_client(**server.connect_args())
+        try:
+            await client.query(query.text)
+            t0 = time.perf_counter()
+            for _ in range(loops):
+                await client.query(query.text)
+            return time.perf_counter() - t0
+        finally:
+            await client.aclose()
+
+
+def bench_query_async(loops, name):
+    return asyncio.run(_bench_query_async(loops, name))
+
+
+def bench_query_blocking(loops, name):
+    query = QUERIES[name]
+    with fs.FakeServer([query]).run_in_thread() as server:
+        client = gel.create_client(**server.connect_args())
+        try:
+            client.query(query.text)
+            t0 = time.perf_counter()
+            for _ in range(loops):
+                client.query(query.text)
+            return time.perf_counter() - t0
+        finally:
+            client.close()
+
+
+def main():
+    import pyperf
+
+    runner = pyperf.Runner()
+    for name in QUERIES:
+        runner.bench_time_func(
+            f'query_{name}_async', bench_query_async, name)
+        runner.bench_time_func(
+            f'query_{name}_blocking', bench_query_blocking, name)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2016-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import base64
+import hashlib
+import json
+import os
+import pathlib
+import tempfile
+import typing
+
+
+# (cardinality, capabilities, in type id, in type descriptor,
+#  out type id, out type descriptor)
+Entry = typing.Tuple[bytes, int, bytes, bytes, bytes, bytes]
+
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode('ascii')
+
+
+def _encode_entry(key: tuple, entry: Entry) -> str:
+    cardinality, capabilities, in_tid, in_data, out_tid, out_data = entry
+    return json.dumps([
+        [key[0], int(key[1]), *key[2:]],
+        _b64(cardinality),
+        capabilities,
+        _b64(in_tid),
+        _b64(in_data),
+        _b64(out_tid),
+        _b64(out_data),
+    ]) + '\n'
+
+
+def _decode_entry(line: str) -> typing.Tuple[tuple, Entry]:
+    key, cardinality, capabilities, *descs = json.loads(line)
+    in_tid, in_data, out_tid, out_data = [
+        base64.b64decode(d, validate=True) for d in descs
+    ]
+    return tuple(key), (
+        base64.b64decode(cardinality, validate=True),
+        int(capabilities),
+        in_tid,
+        in_data,
+        out_tid,
+        out_data,
+    )
+
+
+class DescriptorCache:
+    """Type descriptors of parsed queries persisted across restarts.
+
+    Stores the results of Parse the same way the in-memory query cache
+    does, but as the raw type descriptors sent by the server, so that a
+    new process can rebuild the codecs without asking the server again.
+
+    There is one file per server address, branch and protocol version in
+    *directory*.  New entries are appended to it as they are parsed and
+    the file is compacted once it grows to twice *maxsize* entries.  The
+    cache is only a hint: the server checks the type ids sent along with
+    every Execute and describes the query again if they are outdated.
+    All I/O errors are ignored.
+    """
+
+    def __init__(self, directory, *, maxsize: int):
+        self._directory = pathlib.Path(directory)
+        self._maxsize = maxsize
+        self._path = None
+        self._entries: typing.Dict[tuple, Entry] = {}
+        self._lines = 0
+        self.protocol_version = None
+
+    def bind(self, addr, branch: str, protocol_version: tuple) -> None:
+        """Load the entries stored for the given server and branch.
+
+        Called once the first connection of the pool is established;
+        until then the cache is empty and nothing is written.
+        """
+        ident = repr((addr, branch, tuple(protocol_version)))
+        digest = hashlib.sha256(ident.encode('utf-8')).hexdigest()[:32]
+        self._path = self._directory / f'descriptors-{digest}.jsonl'
+        self.protocol_version = tuple(protocol_version)
+        self._entries = {}
+        self._lines = 0
+
+        try:
+            with open(self._path, encoding='utf-8') as f:
+                for line in f:
+                    self._lines += 1
+                    try:
+                        key, entry = _decode_entry(line)
+                    except (ValueError, TypeError):
+                        # Ignore entries truncated or interleaved by
+                        # concurrent writers.
+                        continue
+                    self._entries.pop(key, None)
+                    self._entries[key] = entry
+        except OSError:
+            pass
+
+        while len(self._entries) > self._maxsize:
+            del self._entries[next(iter(self._entries))]
+
+    def get(self, key: tuple) -> typing.Optional[Entry]:
+        return self._entries.get(key)
+
+    def discard(self, key: tuple) -> None:
+        self._entries.pop(key, None)
+
+    def put(self, key: tuple, entry: Entry) -> None:
+        if self._path is None or self._entries.get(key) == entry:
+            return
+
+        self._entries.pop(key, None)
+        self._entries[key] = entry
+        if len(self._entries) > self._maxsize:
+            del self._entries[next(iter(self._entries))]
+
+        try:
+            if self._lines >= 2 * self._maxsize:
+                self._compact()
+            else:
+                self._directory.mkdir(parents=True, exist_ok=True)
+                with open(self._path, 'a', encoding='utf-8') as f:
+                    f.write(_encode_entry(key, entry))
+                self._lines += 1
+        except OSError:
+            pass
+
+    def _compact(self) -> None:
+        self._directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self._directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                for key, entry in self._entries.items():
+                    f.write(_encode_entry(key, entry))
+            os.replace(tmp, self._path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        self._lines = len(self._entries)
@@ -20,6 +20,7 @@
 from __future__ import annotations
 import abc
 import dataclasses
+import datetime
 import typing
 
 from . import datatypes
@@ -53,12 +54,46 @@ class QueryWithArgs(typing.NamedTuple):
 class QueryCache(typing.NamedTuple):
     codecs_registry: protocol.CodecsRegistry
     query_cache: protocol.LRUMapping
+    descriptor_cache: typing.Optional[typing.Any] = None
 
 
 class QueryOptions(typing.NamedTuple):
     output_format: protocol.OutputFormat
     expect_one: bool
     required_one: bool
+    columnar_format: typing.Optional[str] = None
+
+
+_EMPTY_STATE = options.State()
+
+
+def _lower_state(
+    state: typing.Optional[options.State],
+    query_timeout: typing.Optional[float],
+) -> typing.Optional[dict]:
+    if state is None:
+        if query_timeout is None:
+            return None
+        state = _EMPTY_STATE
+
+    # The protocol caches the encoded state by the identity of this
+    # dict, so hand out the same one while the timeout doesn't change.
+    # State objects are immutable, so it is stored on the state.
+    lowered = state._lowered
+    if lowered is not None and lowered[0] == query_timeout:
+        return lowered[1]
+
+    rv = state.as_dict()
+    if query_timeout is not None:
+        # Let the server cancel the query, which keeps the connection
+        # usable, unlike a cancellation on the client side.
+        rv["config"] = {
+            **rv.get("config", {}),
+            "query_execution_timeout": datetime.timedelta(
+                seconds=query_timeout),
+        }
+    state._lowered = (query_timeout, rv)
+    return rv
 
 
 class QueryContext(typing.NamedTuple):
@@ -69,9 +104,14 @@ class QueryContext(typing.NamedTuple):
     state: typing.Optional[options.State]
     warning_handler: options.WarningHandler
     annotations: typing.Dict[str, str]
+    query_timeout: typing.Optional[float] = None
+    lazy_objects: bool = False
 
     def lower(
-        self, *, allow_capabilities: enums.Capability
+        self,
+        *,
+        allow_capabilities: enums.Capability,
+        query_timeout: typing.Optional[float] = None,
     ) -> protocol.ExecuteContext:
         return protocol.ExecuteContext(
             query=self.query.query,
@@ -79,13 +119,16 @@ class QueryContext(typing.NamedTuple):
             kwargs=self.query.kwargs,
             reg=self.cache.codecs_registry,
             qc=self.cache.query_cache,
+            descriptor_cache=self.cache.descriptor_cache,
             input_language=self.query.input_language,
             output_format=self.query_options.output_format,
             expect_one=self.query_options.expect_one,
             required_one=self.query_options.required_one,
             allow_capabilities=allow_capabilities,
-            state=self.state.as_dict() if self.state else None,
+            state=_lower_state(self.state, query_timeout),
             annotations=self.annotations,
+            columnar_format=self.query_options.columnar_format,
+            lazy_objects=self.lazy_objects,
         )
 
 
@@ -96,9 +139,13 @@ class ExecuteContext(typing.NamedTuple):
     state: typing.Optional[options.State]
     warning_handler: options.WarningHandler
     annotations: typing.Dict[str, str]
+    query_timeout: typing.Optional[float] = None
 
     def lower(
-        self, *, allow_capabilities: enums.Capability
+        self,
+        *,
+        allow_capabilities: enums.Capability,
+        query_timeout: typing.Optional[float] = None,
     ) -> protocol.ExecuteContext:
         return protocol.ExecuteContext(
             query=self.query.query,
@@ -106,10 +153,11 @@ class ExecuteContext(typing.NamedTuple):
             kwargs=self.query.kwargs,
             reg=self.cache.codecs_registry,
             qc=self.cache.query_cache,
+            descriptor_cache=self.cache.descriptor_cache,
             input_language=self.query.input_language,
             output_format=protocol.OutputFormat.NONE,
             allow_capabilities=allow_capabilities,
-            state=self.state.as_dict() if self.state else None,
+            state=_lower_state(self.state, query_timeout),
             annotations=self.annotations,
         )
 
@@ -179,6 +227,24 @@ _query_required_single_json_opts = QueryOptions(
     expect_one=True,
     required_one=True,
 )
+_query_columns_opts = QueryOptions(
+    output_format=protocol.OutputFormat.BINARY,
+    expect_one=False,
+    required_one=False,
+    columnar_format='array',
+)
+_query_numpy_opts = QueryOptions(
+    output_format=protocol.OutputFormat.BINARY,
+    expect_one=False,
+    required_one=False,
+    columnar_format='numpy',
+)
+_query_arrow_opts = QueryOptions(
+    output_format=protocol.OutputFormat.BINARY,
+    expect_one=False,
+    required_one=False,
+    columnar_format='arrow',
+)
 
 
 class BaseReadOnlyExecutor(abc.ABC):
@@ -203,6 +269,12 @@ class BaseReadOnlyExecutor(abc.ABC):
     def _get_annotations(self) -> typing.Dict[str, str]:
         return {}
 
+    def _get_query_timeout(self) -> typing.Optional[float]:
+        return None
+
+    def _get_lazy_objects(self) -> bool:
+        return False
+
 
 class ReadOnlyExecutor(BaseReadOnlyExecutor):
     """Subclasses can execute *at least* read-only queries"""
@@ -222,6 +294,8 @@ class ReadOnlyExecutor(BaseReadOnlyExecutor):
             state=self._get_state(),
             warning_handler=self._get_warning_handler(),
             annotations=self._get_annotations(),
+            query_timeout=self._get_query_timeout(),
+            lazy_objects=self._get_lazy_objects(),
         ))
 
     def query_single(
@@ -235,6 +309,8 @@ class ReadOnlyExecutor(BaseReadOnlyExecutor):
             state=self._get_state(),
             warning_handler=self._get_warning_handler(),
             annotations=self._get_annotations(),
+            query_timeout=self._get_query_timeout(),
+            lazy_objects=self._get_lazy_objects(),
         ))
 
     def query_required_single(self, query: str, *args, **kwargs) -> typing.Any:
@@ -246,6 +322,8 @@ class ReadOnlyExecutor(BaseReadOnlyExecutor):
             state=self._get_state(),
             warning_handler=self._get_warning_handler(),
             annotations=self._get_annotations(),
+            query_timeout=self._get_query_timeout(),
+            lazy_objects=self._get_lazy_objects(),
         ))
 
     def query_json(self, query: str, *args, **kwargs) -> str:
@@ -257,6 +335,8 @@ class ReadOnlyExecutor(BaseReadOnlyExecutor):
             state=self._get_state(),
             warning_handler=self._get_warning_handler(),
             annotations=self._get_annotations(),
+            query_timeout=self._get_query_timeout(),
+            lazy_objects=self._get_lazy_objects(),
         ))
 
     def query_single_json(self, query: str, *args, **kwargs) -> str:
@@ -268,6 +348,8 @@ class ReadOnlyExecutor(BaseReadOnlyExecutor):
             state=self._get_state(),
             warning_handler=self._get_warning_handler(),
             annotations=self._get_annotations(),
+            query_timeout=self._get_query_timeout(),
+            lazy_objects=self._get_lazy_objects(),
         ))
 
     def query_required_single_json(self, query: str, *args, **kwargs) -> str:
@@ -279,6 +361,51 @@ class ReadOnlyExecutor(BaseReadOnlyExecutor):
             state=self._get_state(),
             warning_handler=self._get_warning_handler(),
             annotations=self._get_annotations(),
+            query_timeout=self._get_query_timeout(),
+            lazy_objects=self._get_lazy_objects(),
+        ))
+
+    def query_columns(
+        self, query: str, *args, **kwargs
+    ) -> typing.Dict[str, typing.Any]:
+        return self._query(QueryContext(
+            query=QueryWithArgs(query, args, kwargs),
+            cache=self._get_query_cache(),
+            query_options=_query_columns_opts,
+            retry_options=self._get_retry_options(),
+            state=self._get_state(),
+            warning_handler=self._get_warning_handler(),
+            annotations=self._get_annotations(),
+            query_timeout=self._get_query_timeout(),
+            lazy_objects=self._get_lazy_objects(),
+        ))
+
+    def query_numpy(
+        self, query: str, *args, **kwargs
+    ) -> typing.Dict[str, typing.Any]:
+        return self._query(QueryContext(
+            query=QueryWithArgs(query, args, kwargs),
+            cache=self._get_query_cache(),
+            query_options=_query_numpy_opts,
+            retry_options=self._get_retry_options(),
+            state=self._get_state(),
+            warning_handler=self._get_warning_handler(),
+            annotations=self._get_annotations(),
+            query_timeout=self._get_query_timeout(),
+            lazy_objects=self._get_lazy_objects(),
+        ))
+
+    def query_arrow(self, query: str, *args, **kwargs) -> typing.Any:
+        return self._query(QueryContext(
+            query=QueryWithArgs(query, args, kwargs),
+            cache=self._get_query_cache(),
+            query_options=_query_arrow_opts,
+            retry_options=self._get_retry_options(),
+            state=self._get_state(),
+            warning_handler=self._get_warning_handler(),
+            annotations=self._get_annotations(),
+            query_timeout=self._get_query_timeout(),
+            lazy_objects=self._get_lazy_objects(),
         ))
 
     def query_sql(self, query: str, *args, **kwargs) -> list[datatypes.Record]:
@@ -295,6 +422,8 @@ class ReadOnlyExecutor(BaseReadOnlyExecutor):
             state=self._get_state(),
             warning_handler=self._get_warning_handler(),
             annotations=self._get_annotations(),
+            query_timeout=self._get_query_timeout(),
+            lazy_objects=self._get_lazy_objects(),
         ))
 
     @abc.abstractmethod
@@ -309,6 +438,7 @@ class ReadOnlyExecutor(BaseReadOnlyExecutor):
             state=self._get_state(),
             warning_handler=self._get_warning_handler(),
             annotations=self._get_annotations(),
+            query_timeout=self._get_query_timeout(),
         ))
 
     def execute_sql(self, commands: str, *args, **kwargs) -> None:
@@ -324,6 +454,7 @@ class ReadOnlyExecutor(BaseReadOnlyExecutor):
             state=self._get_state(),
             warning_handler=self._get_warning_handler(),
             annotations=self._get_annotations(),
+            query_timeout=self._get_query_timeout(),
         ))
 
 
@@ -351,6 +482,8 @@ class AsyncIOReadOnlyExecutor(BaseReadOnlyExecutor):
             state=self._get_state(),
             warning_handler=self._get_warning_handler(),
             annotations=self._get_annotations(),
+            query_timeout=self._get_query_timeout(),
+            lazy_objects=self._get_lazy_objects(),
         ))
 
     async def query_single(self, query: str, *args, **kwargs) -> typing.Any:
@@ -362,6 +495,8 @@ class AsyncIOReadOnlyExecutor(BaseReadOnlyExecutor):
             state=self._get_state(),
             warning_handler=self._get_warning_handler(),
             annotations=self._get_annotations(),
+            query_timeout=self._get_query_timeout(),
+            lazy_objects=self._get_lazy_objects(),
         ))
 
     async def query_required_single(
@@ -378,6 +513,8 @@ class AsyncIOReadOnlyExecutor(BaseReadOnlyExecutor):
             state=self._get_state(),
             warning_handler=self._get_warning_handler(),
             annotations=self._get_annotations(),
+            query_timeout=self._get_query_timeout(),
+            lazy_objects=self._get_lazy_objects(),
         ))
 
     async def query_json(self, query: str, *args, **kwargs) -> str:
@@ -389,6 +526,8 @@ class AsyncIOReadOnlyExecutor(BaseReadOnlyExecutor):
             state=self._get_state(),
             warning_handler=self._get_warning_handler(),
             annotations=self._get_annotations(),
+            query_timeout=self._get_query_timeout(),
+            lazy_objects=self._get_lazy_objects(),
         ))
 
     async def query_single_json(self, query: str, *args, **kwargs) -> str:
@@ -400,6 +539,8 @@ class AsyncIOReadOnlyExecutor(BaseReadOnlyExecutor):
             state=self._get_state(),
             warning_handler=self._get_warning_handler(),
             annotations=self._get_annotations(),
+            query_timeout=self._get_query_timeout(),
+            lazy_objects=self._get_lazy_objects(),
         ))
 
     async def query_required_single_json(
@@ -416,6 +557,51 @@ class AsyncIOReadOnlyExecutor(BaseReadOnlyExecutor):
             state=self._get_state(),
             warning_handler=self._get_warning_handler(),
             annotations=self._get_annotations(),
+            query_timeout=self._get_query_timeout(),
+            lazy_objects=self._get_lazy_objects(),
+        ))
+
+    async def query_columns(
+        self, query: str, *args, **kwargs
+    ) -> typing.Dict[str, typing.Any]:
+        return await self._query(QueryContext(
+            query=QueryWithArgs(query, args, kwargs),
+            cache=self._get_query_cache(),
+            query_options=_query_columns_opts,
+            retry_options=self._get_retry_options(),
+            state=self._get_state(),
+            warning_handler=self._get_warning_handler(),
+            annotations=self._get_annotations(),
+            query_timeout=self._get_query_timeout(),
+            lazy_objects=self._get_lazy_objects(),
+        ))
+
+    async def query_numpy(
+        self, query: str, *args, **kwargs
+    ) -> typing.Dict[str, typing.Any]:
+        return await self._query(QueryContext(
+            query=QueryWithArgs(query, args, kwargs),
+            cache=self._get_query_cache(),
+            query_options=_query_numpy_opts,
+            retry_options=self._get_retry_options(),
+            state=self._get_state(),
+            warning_handler=self._get_warning_handler(),
+            annotations=self._get_annotations(),
+            query_timeout=self._get_query_timeout(),
+            lazy_objects=self._get_lazy_objects(),
+        ))
+
+    async def query_arrow(self, query: str, *args, **kwargs) -> typing.Any:
+        return await self._query(QueryContext(
+            query=QueryWithArgs(query, args, kwargs),
+            cache=self._get_query_cache(),
+            query_options=_query_arrow_opts,
+            retry_options=self._get_retry_options(),
+            state=self._get_state(),
+            warning_handler=self._get_warning_handler(),
+            annotations=self._get_annotations(),
+            query_timeout=self._get_query_timeout(),
+            lazy_objects=self._get_lazy_objects(),
         ))
 
     async def query_sql(self, query: str, *args, **kwargs) -> typing.Any:
@@ -432,6 +618,8 @@ class AsyncIOReadOnlyExecutor(BaseReadOnlyExecutor):
             state=self._get_state(),
             warning_handler=self._get_warning_handler(),
             annotations=self._get_annotations(),
+            query_timeout=self._get_query_timeout(),
+            lazy_objects=self._get_lazy_objects(),
         ))
 
     @abc.abstractmethod
@@ -446,6 +634,7 @@ class AsyncIOReadOnlyExecutor(BaseReadOnlyExecutor):
             state=self._get_state(),
             warning_handler=self._get_warning_handler(),
             annotations=self._get_annotations(),
+            query_timeout=self._get_query_timeout(),
         ))
 
     async def execute_sql(self, commands: str, *args, **kwargs) -> None:
@@ -461,6 +650,7 @@ class AsyncIOReadOnlyExecutor(BaseReadOnlyExecutor):
             state=self._get_state(),
             warning_handler=self._get_warning_handler(),
             annotations=self._get_annotations(),
+            query_timeout=self._get_query_timeout(),
         ))
 
 
@@ -28,6 +28,7 @@ from . import abstract
 from . import base_client
 from . import con_utils
 from . import errors
+from . import pipeline as _pipeline
 from . import transaction
 from .protocol import asyncio_proto
 from .protocol.protocol import InputLanguage, OutputFormat
@@ -61,6 +62,12 @@ class AsyncIOConnection(base_client.BaseConnection):
     async def sleep(self, seconds):
         await asyncio.sleep(seconds)
 
+    async def _wait_for(self, coro, timeout):
+        try:
+            return await asyncio.wait_for(coro, timeout)
+        except asyncio.TimeoutError as e:
+            raise TimeoutError from e
+
     async def aclose(self):
         """Send graceful termination message wait for connection to drop."""
         if not self.is_closed():
@@ -151,7 +158,7 @@ class _PoolConnectionHolder(base_client.PoolConnectionHolder):
 
 
 class _AsyncIOPoolImpl(base_client.BasePoolImpl):
-    __slots__ = ('_loop',)
+    __slots__ = ('_loop', '_prewarm_tasks')
     _holder_class = _PoolConnectionHolder
 
     def __init__(
@@ -160,6 +167,14 @@ class _AsyncIOPoolImpl(base_client.BasePoolImpl):
         *,
         max_concurrency: typing.Optional[int],
         connection_class,
+        query_cache_size: int = base_client.QUERY_CACHE_SIZE,
+        codecs_cache_size: int = base_client.CODECS_CACHE_SIZE,
+        share_codecs: bool = False,
+        descriptor_cache_dir: typing.Optional[str] = None,
+        min_size: int = 0,
+        max_idle_time: typing.Optional[float] = None,
+        max_lifetime: typing.Optional[float] = None,
+        load_balancing: str = 'least_outstanding',
     ):
         if not issubclass(connection_class, AsyncIOConnection):
             raise TypeError(
@@ -167,10 +182,19 @@ class _AsyncIOPoolImpl(base_client.BasePoolImpl):
                 f'gel.asyncio_client.AsyncIOConnection, '
                 f'got {connection_class}')
         self._loop = None
+        self._prewarm_tasks = set()
         super().__init__(
             connect_args,
             lambda *args: connection_class(self._loop, *args),
             max_concurrency=max_concurrency,
+            query_cache_size=query_cache_size,
+            codecs_cache_size=codecs_cache_size,
+            share_codecs=share_codecs,
+            descriptor_cache_dir=descriptor_cache_dir,
+            min_size=min_size,
+            max_idle_time=max_idle_time,
+            max_lifetime=max_lifetime,
+            load_balancing=load_balancing,
         )
 
     def _ensure_initialized(self):
@@ -179,6 +203,8 @@ class _AsyncIOPoolImpl(base_client.BasePoolImpl):
             self._queue = asyncio.LifoQueue(maxsize=self._max_concurrency)
             self._first_connect_lock = asyncio.Lock()
             self._resize_holder_pool()
+            self._start_reaper()
+            self._maybe_prewarm()
 
     def _set_queue_maxsize(self, maxsize):
         self._queue._maxsize = maxsize
@@ -191,27 +217,44 @@ class _AsyncIOPoolImpl(base_client.BasePoolImpl):
     async def acquire(self, timeout=None):
         self._ensure_initialized()
 
-        async def _acquire_impl():
-            ch = await self._queue.get()  # type: _PoolConnectionHolder
-            try:
-                proxy = await ch.acquire()  # type: AsyncIOConnection
-            except (Exception, asyncio.CancelledError):
-                self._queue.put_nowait(ch)
-                raise
-            else:
-                # Record the timeout, as we will apply it by default
-                # in release().
-                ch._timeout = timeout
-                return proxy
-
         if self._closing:
             raise errors.InterfaceError('pool is closing')
 
-        if timeout is None:
-            return await _acquire_impl()
+        # Fast path: take a free holder without suspending.
+        try:
+            ch = self._queue.get_nowait()  # type: _PoolConnectionHolder
+        except asyncio.QueueEmpty:
+            started = self._start_wait()
+            try:
+                if timeout is None:
+                    ch = await self._queue.get()
+                else:
+                    ch = await asyncio.wait_for(
+                        self._queue.get(), timeout=timeout)
+            except BaseException:
+                self._end_wait(started, False)
+                raise
+            waited = self._end_wait(started, True)
+        else:
+            self._count_acquire()
+            waited = 0
+
+        try:
+            if timeout is None or ch._is_connected():
+                proxy = await ch.acquire()  # type: AsyncIOConnection
+            else:
+                # Opening a connection counts towards the timeout.
+                proxy = await asyncio.wait_for(
+                    ch.acquire(), timeout=max(timeout - waited, 0))
+        except (Exception, asyncio.CancelledError):
+            self._put_holder(ch)
+            raise
         else:
-            return await asyncio.wait_for(
-                _acquire_impl(), timeout=timeout)
+            # Record the timeout, as we will apply it by default
+            # in release().
+            ch._timeout = timeout
+            proxy._pool_wait_time = waited
+            return proxy
 
     async def _release(self, holder):
 
@@ -228,6 +271,33 @@ class _AsyncIOPoolImpl(base_client.BasePoolImpl):
         # pool properly.
         return await asyncio.shield(holder.release(timeout))
 
+    @contextlib.contextmanager
+    def _locked_free_holders(self):
+        # Holders are only ever taken out of the list backing the queue
+        # directly, which never needs to wake up a waiter.
+        yield self._queue._queue
+
+    def _start_prewarm(self, holders):
+        for ch in holders:
+            task = self._loop.create_task(self._prewarm_holder(ch))
+            self._prewarm_tasks.add(task)
+            task.add_done_callback(self._prewarm_tasks.discard)
+
+    def _start_reaper(self):
+        interval = self._get_reaper_interval()
+        if interval is not None:
+            self._reaper = self._loop.create_task(self._run_reaper(interval))
+
+    def _stop_reaper(self):
+        if self._reaper is not None:
+            self._reaper.cancel()
+            self._reaper = None
+
+    async def _run_reaper(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            self._reap()
+
     async def aclose(self):
         """Attempt to gracefully close all connections in the pool.
 
@@ -247,6 +317,7 @@ class _AsyncIOPoolImpl(base_client.BasePoolImpl):
             return
 
         self._closing = True
+        self._stop_reaper()
 
         try:
             warning_callback = self._loop.call_later(
@@ -346,6 +417,15 @@ class AsyncIORetry(transaction.BaseRetry):
         return iteration
 
 
+class AsyncIOPipeline(_pipeline.BasePipeline):
+
+    __slots__ = ()
+
+    async def run(self) -> list:
+        """Send all recorded queries and return their results in order."""
+        return await self._client._pipeline(self._take_contexts())
+
+
 class AsyncIOClient(base_client.BaseClient, abstract.AsyncIOExecutor):
     """A lazy connection pool.
 
@@ -365,6 +445,14 @@ class AsyncIOClient(base_client.BaseClient, abstract.AsyncIOExecutor):
         await self._impl.ensure_connected()
         return self
 
+    def prewarm(self, size: typing.Optional[int] = None):
+        """Open connections concurrently in the background.
+
+        Return immediately, without waiting for the connections.
+        """
+        self._impl.prewarm(size)
+        return self
+
     async def aclose(self):
         """Attempt to gracefully close all connections in the pool.
 
@@ -381,6 +469,44 @@ class AsyncIOClient(base_client.BaseClient, abstract.AsyncIOExecutor):
     def transaction(self) -> AsyncIORetry:
         return AsyncIORetry(self)
 
+    def pipeline(self) -> AsyncIOPipeline:
+        return AsyncIOPipeline(self)
+
+    async def query_iter(
+        self, query: str, *args, **kwargs
+    ) -> typing.AsyncIterator[typing.Any]:
+        """Run a query and yield the elements of the result as they arrive.
+
+        If the iterator is closed before the result is exhausted, the
+        connection is reset unless the rest of the result has already been
+        received.  Inside a transaction the rest of the result is read and
+        discarded instead, so that the transaction is not lost.
+        """
+        con = await self._impl.acquire()
+        try:
+            batches = await con.raw_query_iter(
+                self._make_query_iter_context(query, args, kwargs)
+            )
+            try:
+                async for rows in batches:
+                    for row in rows:
+                        yield row
+            finally:
+                await batches.aclose()
+        finally:
+            await self._impl.release(con)
+
+    async def execute_many(
+        self,
+        commands: str,
+        args_seq: typing.Iterable[
+            typing.Union[typing.Sequence, typing.Mapping[str, typing.Any]]
+        ],
+    ) -> None:
+        await self._execute_many(
+            self._make_execute_many_context(commands), args_seq
+        )
+
     async def __aenter__(self):
         return await self.ensure_connected()
 
@@ -424,10 +550,27 @@ def create_async_client(
     tls_security: str = None,
     wait_until_available: int = 30,
     timeout: int = 10,
+    command_timeout: typing.Optional[float] = None,
+    query_cache_size: int = base_client.QUERY_CACHE_SIZE,
+    codecs_cache_size: int = base_client.CODECS_CACHE_SIZE,
+    share_codecs: bool = False,
+    descriptor_cache_dir: typing.Optional[str] = None,
+    min_size: int = 0,
+    max_idle_time: typing.Optional[float] = None,
+    max_lifetime: typing.Optional[float] = None,
+    load_balancing: str = 'least_outstanding',
 ):
     return AsyncIOClient(
         connection_class=AsyncIOConnection,
         max_concurrency=max_concurrency,
+        query_cache_size=query_cache_size,
+        codecs_cache_size=codecs_cache_size,
+        share_codecs=share_codecs,
+        descriptor_cache_dir=descriptor_cache_dir,
+        min_size=min_size,
+        max_idle_time=max_idle_time,
+        max_lifetime=max_lifetime,
+        load_balancing=load_balancing,
 
         # connect arguments
         dsn=dsn,
@@ -445,4 +588,5 @@ def create_async_client(
         tls_security=tls_security,
         wait_until_available=wait_until_available,
         timeout=timeout,
+        command_timeout=command_timeout,
     )
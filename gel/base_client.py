@@ -18,20 +18,127 @@
 
 
 import abc
+import bisect
+import contextlib
+import logging
 import random
 import time
 import typing
 
+from . import _descriptor_cache
 from . import abstract
 from . import con_utils
 from . import enums
 from . import errors
+from . import observers as _observers
 from . import options as _options
 from .protocol import protocol
 
 
 BaseConnection_T = typing.TypeVar('BaseConnection_T', bound='BaseConnection')
 QUERY_CACHE_SIZE = 1000
+CODECS_CACHE_SIZE = 1000
+# Seconds to wait for the server to cancel a query that has exceeded
+# its timeout before giving up on the connection.
+QUERY_TIMEOUT_GRACE = 1.0
+# Max number of server instances for which a shared codecs registry
+# is kept alive, see `share_codecs` of create_client().
+SHARED_CODECS_REGISTRIES = 16
+# Seconds for which a host that failed to accept a connection is not
+# used, doubled after every consecutive failure up to the max.
+HOST_EJECT_BACKOFF = 1.0
+HOST_EJECT_MAX_BACKOFF = 60.0
+LOAD_BALANCING_POLICIES = frozenset({'least_outstanding', 'round_robin'})
+# Upper bounds in seconds of the buckets of the histogram of the time
+# spent waiting for a free connection, see Client.pool_stats().
+POOL_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, float('inf'))
+
+_shared_codecs_registries = protocol.LRUMapping(
+    maxsize=SHARED_CODECS_REGISTRIES)
+
+logger = logging.getLogger(__name__)
+_NOT_OBSERVED = contextlib.nullcontext()
+
+
+def _get_shared_codecs_registry(key, cache_size):
+    # Type descriptors of one server instance are the same for all of
+    # its clients, so pools created with share_codecs=True connecting to
+    # the same instance and branch build every codec only once.  The
+    # size of the registry is fixed by the pool that creates it.
+    #
+    # The key is (address, branch, protocol version).  Another server
+    # behind the same address, e.g. after a failover, may have another
+    # schema, but codecs are looked up by type descriptor id, and an id
+    # never stands for two different types: shape ids are hashes of
+    # the descriptors, other ids are those of the schema types.  What
+    # a codec decodes also depends on the wire format though, which may
+    # change with a server upgrade, hence the protocol version.
+    try:
+        return _shared_codecs_registries[key]
+    except KeyError:
+        reg = protocol.CodecsRegistry(cache_size=cache_size)
+        _shared_codecs_registries[key] = reg
+        return reg
+
+
+class _HostState:
+    # State of one of the hosts of a multi-host pool.
+
+    __slots__ = ("addr", "failures", "ejected_until")
+
+    def __init__(self, addr):
+        self.addr = addr
+        self.failures = 0
+        self.ejected_until = 0.0
+
+    def is_available(self, now):
+        return self.ejected_until <= now
+
+    def eject(self, now):
+        self.failures += 1
+        backoff = min(
+            HOST_EJECT_BACKOFF * 2 ** (self.failures - 1),
+            HOST_EJECT_MAX_BACKOFF,
+        )
+        self.ejected_until = now + backoff
+        return backoff
+
+    def admit(self):
+        self.failures = 0
+        self.ejected_until = 0.0
+
+
+class CacheStats(typing.NamedTuple):
+    size: int
+    maxsize: int
+    hits: int
+    misses: int
+    evictions: int
+
+    @classmethod
+    def from_lru(cls, lru) -> 'CacheStats':
+        return cls(
+            size=len(lru),
+            maxsize=lru.maxsize,
+            hits=lru.hits,
+            misses=lru.misses,
+            evictions=lru.evictions,
+        )
+
+
+class ClientCacheStats(typing.NamedTuple):
+    query_cache: CacheStats
+    codecs: CacheStats
+
+
+class PoolStats(typing.NamedTuple):
+    max_concurrency: int
+    free: int
+    waiters: int
+    acquires: int
+    waits: int
+    wait_time: float
+    wait_time_histogram: typing.Tuple[typing.Tuple[float, int], ...]
 
 
 class BaseConnection(metaclass=abc.ABCMeta):
@@ -52,6 +159,9 @@ class BaseConnection(metaclass=abc.ABCMeta):
         "_params",
         "_log_listeners",
         "_holder",
+        "_observers",
+        "_probe",
+        "_pool_wait_time",
     )
 
     def __init__(
@@ -67,6 +177,9 @@ class BaseConnection(metaclass=abc.ABCMeta):
         self._params = params
         self._log_listeners = set()
         self._holder = None
+        self._observers = ()
+        self._probe = None
+        self._pool_wait_time = 0.0
 
     @abc.abstractmethod
     def _dispatch_log_message(self, msg):
@@ -79,6 +192,13 @@ class BaseConnection(metaclass=abc.ABCMeta):
     def connected_addr(self):
         return self._addr
 
+    def _observe(self, query):
+        # Returns a context manager reporting the query to the observers
+        # of the pool the connection belongs to, if there are any.
+        if not self._observers:
+            return _NOT_OBSERVED
+        return _observers._QueryProbe(self, query)
+
     def _get_last_status(self) -> typing.Optional[str]:
         if self._protocol is None:
             return None
@@ -135,6 +255,30 @@ class BaseConnection(metaclass=abc.ABCMeta):
     async def sleep(self, seconds):
         ...
 
+    @abc.abstractmethod
+    async def _wait_for(self, coro, timeout):
+        ...
+
+    def _get_query_timeout(self, context) -> typing.Optional[float]:
+        if context.query_timeout is not None:
+            return context.query_timeout
+        return self._config.command_timeout
+
+    async def _with_query_timeout(self, coro, timeout):
+        if timeout is None:
+            return await coro
+        try:
+            # The server cancels the query itself, so the deadline here
+            # only catches a server that stopped responding.
+            return await self._wait_for(coro, timeout + QUERY_TIMEOUT_GRACE)
+        except TimeoutError:
+            # The protocol state is unknown after an interrupted query,
+            # so the connection cannot go back to the pool.
+            self.terminate()
+            raise errors.QueryTimeoutError(
+                f"query did not complete within {timeout} seconds"
+            ) from None
+
     async def connect(self, *, single_attempt=False):
         start = time.monotonic()
         if single_attempt:
@@ -205,6 +349,10 @@ class BaseConnection(metaclass=abc.ABCMeta):
             try:
                 if reconnect:
                     await self.connect(single_attempt=True)
+                    if self._probe is not None:
+                        self._probe.watch(self._protocol)
+                if self._probe is not None:
+                    self._probe.attempts = i
                 return await func()
 
             except errors.EdgeDBError as e:
@@ -236,19 +384,97 @@ class BaseConnection(metaclass=abc.ABCMeta):
             allow_capabilities = enums.Capability.LEGACY_EXECUTE
         else:
             allow_capabilities = enums.Capability.EXECUTE
-        ctx = query_context.lower(allow_capabilities=allow_capabilities)
+        timeout = self._get_query_timeout(query_context)
+        ctx = query_context.lower(
+            allow_capabilities=allow_capabilities,
+            query_timeout=None if self._protocol.is_legacy else timeout,
+        )
+
+        if (
+            self._protocol.is_legacy
+            and query_context.query_options.columnar_format is not None
+        ):
+            raise errors.InterfaceError(
+                "Legacy protocol doesn't support columnar results"
+            )
 
         async def _inner():
             if self._protocol.is_legacy:
-                return await self._protocol.legacy_execute_anonymous(ctx)
+                return await self._with_query_timeout(
+                    self._protocol.legacy_execute_anonymous(ctx), timeout
+                )
             else:
-                res = await self._protocol.query(ctx)
+                res = await self._with_query_timeout(
+                    self._protocol.query(ctx), timeout
+                )
                 if ctx.warnings:
                     res = query_context.warning_handler(ctx.warnings, res)
                 return res
 
+        with self._observe(query_context.query.query):
+            return await self._retry_operation(
+                _inner, query_context.retry_options, ctx
+            )
+
+    async def raw_query_iter(
+        self, query_context: abstract.QueryContext
+    ) -> typing.AsyncIterator[list]:
+        if self.is_closed():
+            await self.connect()
+
+        if self._protocol.is_legacy:
+            raise errors.InterfaceError(
+                "Legacy protocol doesn't support query_iter()"
+            )
+        ctx = query_context.lower(
+            allow_capabilities=enums.Capability.EXECUTE,
+            query_timeout=self._get_query_timeout(query_context),
+        )
+        return self._iter_batches(ctx, query_context.warning_handler)
+
+    async def _iter_batches(self, ctx, warning_handler):
+        batches = self._protocol.execute_iter(ctx)
+        try:
+            async for rows in batches:
+                yield rows
+        finally:
+            # Skips the unread part of the result, if any.
+            await batches.aclose()
+        if ctx.warnings:
+            warning_handler(ctx.warnings, None)
+
+    async def raw_pipeline(
+        self,
+        contexts: typing.List[typing.Union[
+            abstract.QueryContext, abstract.ExecuteContext
+        ]],
+    ) -> list:
+        if self.is_closed():
+            await self.connect()
+
+        if self._protocol.is_legacy:
+            raise errors.InterfaceError(
+                "Legacy protocol doesn't support pipelining"
+            )
+        ctxs = [
+            context.lower(
+                allow_capabilities=enums.Capability.EXECUTE,
+                query_timeout=self._get_query_timeout(context),
+            )
+            for context in contexts
+        ]
+
+        async def _inner():
+            results = await self._protocol.execute_pipeline(ctxs)
+            for i, (context, ctx) in enumerate(zip(contexts, ctxs)):
+                if ctx.warnings:
+                    results[i] = context.warning_handler(
+                        ctx.warnings, results[i]
+                    )
+            return results
+
         return await self._retry_operation(
-            _inner, query_context.retry_options, ctx
+            _inner, contexts[0].retry_options, _PipelineCapabilities(ctxs)
         )
 
     async def _execute(self, execute_context: abstract.ExecuteContext) -> None:
@@ -257,21 +483,49 @@ class BaseConnection(metaclass=abc.ABCMeta):
                 raise errors.InterfaceError(
                     "Legacy protocol doesn't support arguments in execute()"
                 )
-            await self._protocol.legacy_simple_query(
-                execute_context.query.query, enums.Capability.LEGACY_EXECUTE
+            await self._with_query_timeout(
+                self._protocol.legacy_simple_query(
+                    execute_context.query.query,
+                    enums.Capability.LEGACY_EXECUTE,
+                ),
+                self._get_query_timeout(execute_context),
             )
         else:
+            timeout = self._get_query_timeout(execute_context)
             ctx = execute_context.lower(
-                allow_capabilities=enums.Capability.EXECUTE
+                allow_capabilities=enums.Capability.EXECUTE,
+                query_timeout=timeout,
             )
             async def _inner():
-                res = await self._protocol.execute(ctx)
+                res = await self._with_query_timeout(
+                    self._protocol.execute(ctx), timeout
+                )
                 if ctx.warnings:
                     res = execute_context.warning_handler(ctx.warnings, res)
 
-            return await self._retry_operation(
-                _inner, execute_context.retry_options, ctx
+            with self._observe(execute_context.query.query):
+                return await self._retry_operation(
+                    _inner, execute_context.retry_options, ctx
+                )
+
+    async def _execute_many(
+        self,
+        execute_context: abstract.ExecuteContext,
+        args_seq: typing.Iterable[
+            typing.Union[typing.Sequence, typing.Mapping[str, typing.Any]]
+        ],
+    ) -> None:
+        if self._protocol.is_legacy:
+            raise errors.InterfaceError(
+                "Legacy protocol doesn't support execute_many()"
             )
+        ctx = execute_context.lower(
+            allow_capabilities=enums.Capability.EXECUTE,
+            query_timeout=self._get_query_timeout(execute_context),
+        )
+        await self._protocol.execute_many(ctx, args_seq)
+        if ctx.warnings:
+            execute_context.warning_handler(ctx.warnings, None)
 
     async def describe(
         self, describe_context: abstract.DescribeContext
@@ -305,6 +559,22 @@ class BaseConnection(metaclass=abc.ABCMeta):
                 id=id(self))
 
 
+class _PipelineCapabilities:
+    # Stands in for an ExecuteContext in BaseConnection._retry_operation():
+    # a pipeline is only retried if none of its queries has capabilities.
+    __slots__ = ("_ctxs",)
+
+    def __init__(self, ctxs):
+        self._ctxs = ctxs
+
+    @property
+    def capabilities(self):
+        capabilities = 0
+        for ctx in self._ctxs:
+            capabilities |= ctx.capabilities
+        return capabilities
+
+
 class PoolConnectionHolder(abc.ABC):
     __slots__ = (
         "_con",
@@ -312,6 +582,9 @@ class PoolConnectionHolder(abc.ABC):
         "_release_event",
         "_timeout",
         "_generation",
+        "_connecting",
+        "_connected_at",
+        "_idle_since",
     )
     _event_class = NotImplemented
 
@@ -322,6 +595,9 @@ class PoolConnectionHolder(abc.ABC):
 
         self._timeout = None
         self._generation = None
+        self._connecting = False
+        self._connected_at = None
+        self._idle_since = None
 
         self._release_event = self._event_class()
         self._release_event.set()
@@ -340,10 +616,39 @@ class PoolConnectionHolder(abc.ABC):
                 'PoolConnectionHolder.connect() called while another '
                 'connection already exists')
 
-        self._con = await self._pool._get_new_connection()
+        self._connecting = True
+        try:
+            self._con = await self._pool._get_new_connection()
+        finally:
+            self._connecting = False
         assert self._con._holder is None
         self._con._holder = self
         self._generation = self._pool._generation
+        self._connected_at = self._idle_since = time.monotonic()
+
+    async def prewarm(self):
+        # The holder has been taken out of the pool queue and marked as
+        # checked out by BasePoolImpl._select_prewarm_holders().
+        try:
+            if self._con is not None and self._con.is_closed():
+                self._con = None
+            if self._con is None:
+                await self.connect()
+        finally:
+            self._connecting = False
+            self._release()
+
+        if self._pool._closed:
+            # The pool was terminated while we were connecting.
+            self.terminate()
+
+    def _is_connected(self):
+        # Whether acquire() can return without connecting.
+        return (
+            self._con is not None
+            and not self._con.is_closed()
+            and self._generation == self._pool._generation
+        )
 
     async def acquire(self) -> BaseConnection:
         if self._con is None or self._con.is_closed():
@@ -398,6 +703,9 @@ class PoolConnectionHolder(abc.ABC):
     def _release_on_close(self):
         self._release()
         self._con = None
+        # Replace the lost connection if the pool keeps a minimum
+        # number of connections open.
+        self._pool._maybe_prewarm()
 
     def _release(self):
         """Release this connection holder."""
@@ -408,7 +716,15 @@ class PoolConnectionHolder(abc.ABC):
         self._release_event.set()
 
         # Put ourselves back to the pool queue.
-        self._pool._queue.put_nowait(self)
+        self._pool._put_holder(self)
+
+    def _detach(self):
+        # Take the connection away from the holder, so that closing it
+        # does not release the holder again.
+        con, self._con = self._con, None
+        if con is not None:
+            con._holder = None
+        return con
 
 
 class BasePoolImpl(abc.ABC):
@@ -424,12 +740,30 @@ class BasePoolImpl(abc.ABC):
         "_working_addr",
         "_working_config",
         "_working_params",
+        "_hosts",
+        "_next_host",
+        "_load_balancing",
         "_holders",
         "_initialized",
         "_initializing",
         "_closing",
         "_closed",
         "_generation",
+        "_query_cache_size",
+        "_codecs_cache_size",
+        "_share_codecs",
+        "_descriptor_cache_dir",
+        "_descriptor_cache",
+        "_min_size",
+        "_max_idle_time",
+        "_max_lifetime",
+        "_reaper",
+        "_stats_lock",
+        "_acquires",
+        "_waiters",
+        "_wait_time",
+        "_wait_histogram",
+        "_observers",
     )
 
     _holder_class = NotImplemented
@@ -440,19 +774,67 @@ class BasePoolImpl(abc.ABC):
         connection_factory,
         *,
         max_concurrency: typing.Optional[int],
+        query_cache_size: int = QUERY_CACHE_SIZE,
+        codecs_cache_size: int = CODECS_CACHE_SIZE,
+        share_codecs: bool = False,
+        descriptor_cache_dir: typing.Optional[str] = None,
+        min_size: int = 0,
+        max_idle_time: typing.Optional[float] = None,
+        max_lifetime: typing.Optional[float] = None,
+        load_balancing: str = 'least_outstanding',
     ):
-        self._connection_factory = connection_factory
-        self._connect_args = connect_args
-        self._codecs_registry = protocol.CodecsRegistry()
-        self._query_cache = protocol.LRUMapping(maxsize=QUERY_CACHE_SIZE)
-
         if max_concurrency is not None and max_concurrency <= 0:
             raise ValueError(
                 'max_concurrency is expected to be greater than zero'
             )
+        if min_size < 0:
+            raise ValueError(
+                'min_size is expected to be greater or equal to zero'
+            )
+        if max_concurrency is not None and min_size > max_concurrency:
+            raise ValueError(
+                'min_size is expected to be less or equal to max_concurrency'
+            )
+        if max_idle_time is not None and max_idle_time <= 0:
+            raise ValueError(
+                'max_idle_time is expected to be greater than zero'
+            )
+        if max_lifetime is not None and max_lifetime <= 0:
+            raise ValueError(
+                'max_lifetime is expected to be greater than zero'
+            )
+        if load_balancing not in LOAD_BALANCING_POLICIES:
+            raise ValueError(
+                f'load_balancing is expected to be one of '
+                f'{", ".join(sorted(LOAD_BALANCING_POLICIES))}, '
+                f'got {load_balancing!r}'
+            )
+        if query_cache_size <= 0:
+            raise ValueError(
+                'query_cache_size is expected to be greater than zero'
+            )
+        if codecs_cache_size <= 0:
+            raise ValueError(
+                'codecs_cache_size is expected to be greater than zero'
+            )
+
+        self._connection_factory = connection_factory
+        self._connect_args = connect_args
+        self._query_cache_size = query_cache_size
+        self._codecs_cache_size = codecs_cache_size
+        self._share_codecs = share_codecs
+        self._descriptor_cache_dir = descriptor_cache_dir
+        self._descriptor_cache = self._new_descriptor_cache()
+        self._codecs_registry = protocol.CodecsRegistry(
+            cache_size=codecs_cache_size)
+        self._query_cache = protocol.LRUMapping(maxsize=query_cache_size)
 
         self._user_max_concurrency = max_concurrency
         self._max_concurrency = max_concurrency if max_concurrency else 1
+        self._min_size = min_size
+        self._max_idle_time = max_idle_time
+        self._max_lifetime = max_lifetime
+        self._reaper = None
 
         self._holders = []
         self._queue = None
@@ -461,6 +843,16 @@ class BasePoolImpl(abc.ABC):
         self._working_addr = None
         self._working_config = None
         self._working_params = None
+        self._hosts = None
+        self._next_host = 0
+        self._load_balancing = load_balancing
+
+        self._stats_lock = contextlib.nullcontext()
+        self._acquires = 0
+        self._waiters = 0
+        self._wait_time = 0.0
+        self._wait_histogram = [0] * len(POOL_WAIT_BUCKETS)
+        self._observers = []
 
         self._closing = False
         self._closed = False
@@ -486,6 +878,24 @@ class BasePoolImpl(abc.ABC):
     async def _release(self, connection):
         ...
 
+    @abc.abstractmethod
+    def _locked_free_holders(self):
+        # A context manager giving access to the list backing the
+        # queue of free holders, with the queue locked if need be.
+        ...
+
+    @abc.abstractmethod
+    def _start_prewarm(self, holders):
+        ...
+
+    @abc.abstractmethod
+    def _start_reaper(self):
+        ...
+
+    @abc.abstractmethod
+    def _stop_reaper(self):
+        ...
+
     @property
     def codecs_registry(self):
         return self._codecs_registry
@@ -494,6 +904,16 @@ class BasePoolImpl(abc.ABC):
     def query_cache(self):
         return self._query_cache
 
+    @property
+    def descriptor_cache(self):
+        return self._descriptor_cache
+
+    def _new_descriptor_cache(self):
+        if self._descriptor_cache_dir is None:
+            return None
+        return _descriptor_cache.DescriptorCache(
+            self._descriptor_cache_dir, maxsize=self._query_cache_size)
+
     def _resize_holder_pool(self):
         resize_diff = self._max_concurrency - len(self._holders)
 
@@ -507,12 +927,106 @@ class BasePoolImpl(abc.ABC):
                 self._holders.append(ch)
                 self._queue.put_nowait(ch)
         elif resize_diff < 0:
-            # TODO: shrink the pool
-            pass
+            # Free holders are dropped right away, starting with the
+            # ones idle for the longest time at the bottom of the LIFO
+            # queue.  Holders in use are dropped when they are released.
+            with self._locked_free_holders() as free:
+                dropped = free[:-resize_diff]
+                del free[:-resize_diff]
+                for ch in dropped:
+                    self._holders.remove(ch)
+            self._set_queue_maxsize(self._max_concurrency)
+
+            for ch in dropped:
+                con = ch._detach()
+                if con is not None:
+                    con.terminate()
+
+    def _put_holder(self, ch):
+        with self._locked_free_holders():
+            drop = len(self._holders) > self._max_concurrency
+            if drop:
+                self._holders.remove(ch)
+        if drop:
+            con = ch._detach()
+            if con is not None:
+                con.terminate()
+        else:
+            ch._idle_since = time.monotonic()
+            self._queue.put_nowait(ch)
+
+    def _update_max_concurrency(self, con):
+        if self._user_max_concurrency is not None:
+            return
+        suggested_concurrency = con.get_settings().get(
+            'suggested_pool_concurrency')
+        if (
+            suggested_concurrency
+            and suggested_concurrency != self._max_concurrency
+        ):
+            self._max_concurrency = suggested_concurrency
+            self._resize_holder_pool()
+            # min_size could not be reached before the pool was
+            # resized.
+            self._maybe_prewarm()
+
+    def _get_reaper_interval(self):
+        limits = [
+            t for t in (self._max_idle_time, self._max_lifetime)
+            if t is not None
+        ]
+        if not limits:
+            return None
+        return min(limits) / 2
+
+    def _reap(self):
+        """Close free connections that are idle or old for too long.
+
+        Connections idle for longer than max_idle_time are closed as
+        long as more than min_size connections stay open.  Connections
+        older than max_lifetime are always closed, and replaced if
+        needed to keep min_size connections open.
+        """
+        if self._closing or self._closed or self._queue is None:
+            return
+        now = time.monotonic()
+        floor = min(self._min_size, self._max_concurrency)
+        expired = []
+
+        with self._locked_free_holders() as free:
+            open_count = sum(
+                1 for ch in self._holders
+                if ch._con is not None and not ch._con.is_closed()
+            )
+            # Start from the bottom of the LIFO queue, where the holders
+            # idle for the longest time are.
+            for ch in free:
+                if ch._con is None or ch._con.is_closed():
+                    continue
+                if (
+                    self._max_lifetime is not None
+                    and now - ch._connected_at > self._max_lifetime
+                ) or (
+                    self._max_idle_time is not None
+                    and now - ch._idle_since > self._max_idle_time
+                    and open_count > floor
+                ):
+                    # The holder stays in the queue, anyone acquiring
+                    # it from now on opens a new connection.
+                    expired.append(ch._detach())
+                    open_count -= 1
+
+        for con in expired:
+            con.terminate()
+        if expired:
+            self._maybe_prewarm()
 
     def get_max_concurrency(self):
         return self._max_concurrency
 
+    def get_min_size(self):
+        return self._min_size
+
     def get_free_size(self):
         if self._queue is None:
             # Queue has not been initialized yet
@@ -520,6 +1034,39 @@ class BasePoolImpl(abc.ABC):
 
         return self._queue.qsize()
 
+    def get_stats(self):
+        with self._stats_lock:
+            return PoolStats(
+                max_concurrency=self._max_concurrency,
+                free=self.get_free_size(),
+                waiters=self._waiters,
+                acquires=self._acquires,
+                waits=sum(self._wait_histogram),
+                wait_time=self._wait_time,
+                wait_time_histogram=tuple(
+                    zip(POOL_WAIT_BUCKETS, self._wait_histogram)),
+            )
+
+    def _count_acquire(self):
+        with self._stats_lock:
+            self._acquires += 1
+
+    def _start_wait(self):
+        with self._stats_lock:
+            self._waiters += 1
+        return time.monotonic()
+
+    def _end_wait(self, started, acquired):
+        waited = time.monotonic() - started
+        with self._stats_lock:
+            self._waiters -= 1
+            if acquired:
+                self._acquires += 1
+                self._wait_time += waited
+                self._wait_histogram[
+                    bisect.bisect_left(POOL_WAIT_BUCKETS, waited)] += 1
+        return waited
+
     def set_connect_args(self, dsn=None, **connect_kwargs):
         r"""Set the new connection arguments for this pool.
 
@@ -540,40 +1087,119 @@ class BasePoolImpl(abc.ABC):
 
         connect_kwargs["dsn"] = dsn
         self._connect_args = connect_kwargs
-        self._codecs_registry = protocol.CodecsRegistry()
-        self._query_cache = protocol.LRUMapping(maxsize=QUERY_CACHE_SIZE)
+        self._codecs_registry = protocol.CodecsRegistry(
+            cache_size=self._codecs_cache_size)
+        self._query_cache = protocol.LRUMapping(
+            maxsize=self._query_cache_size)
+        self._descriptor_cache = self._new_descriptor_cache()
         self._working_addr = None
         self._working_config = None
         self._working_params = None
+        self._hosts = None
 
     async def _get_first_connection(self):
         # First connection attempt on this pool.
-        connect_config, client_config = con_utils.parse_connect_arguments(
-            **self._connect_args,
-            # ToDos
-            command_timeout=None,
-            server_settings=None,
-        )
-        con = self._connection_factory(
-            [connect_config.address], client_config, connect_config
-        )
-        await con.connect()
+        configs = [
+            con_utils.parse_connect_arguments(
+                **{"command_timeout": None, **connect_args},
+                # ToDos
+                server_settings=None,
+            )
+            for connect_args in con_utils.split_hosts(self._connect_args)
+        ]
+        # All hosts share the other connection parameters.
+        connect_config, client_config = configs[0]
+        if len(configs) > 1:
+            self._hosts = [_HostState(cfg.address) for cfg, _ in configs]
+            self._working_config = client_config
+            self._working_params = connect_config
+            con = await self._connect_to_hosts()
+        else:
+            con = self._connection_factory(
+                [connect_config.address], client_config, connect_config
+            )
+            await con.connect()
         self._working_addr = con.connected_addr()
         self._working_config = client_config
         self._working_params = connect_config
 
-        if self._user_max_concurrency is None:
-            suggested_concurrency = con.get_settings().get(
-                'suggested_pool_concurrency')
-            if suggested_concurrency:
-                self._max_concurrency = suggested_concurrency
-                self._resize_holder_pool()
+        if self._share_codecs:
+            self._codecs_registry = _get_shared_codecs_registry(
+                (
+                    self._working_addr,
+                    connect_config.branch,
+                    con._protocol.protocol_version,
+                ),
+                self._codecs_cache_size,
+            )
+        if self._descriptor_cache is not None:
+            self._descriptor_cache.bind(
+                self._working_addr,
+                connect_config.branch,
+                con._protocol.protocol_version,
+            )
+
+        self._update_max_concurrency(con)
+        return con
+
+    def _order_hosts(self, now):
+        hosts = [h for h in self._hosts if h.is_available(now)]
+        if not hosts:
+            return hosts
+        if self._load_balancing == 'round_robin':
+            start = self._next_host % len(hosts)
+            self._next_host += 1
+            hosts = hosts[start:] + hosts[:start]
+        else:
+            # Least outstanding requests first, that is connections
+            # currently acquired, then least open connections.
+            load = {h.addr: [0, 0] for h in hosts}
+            for ch in self._holders:
+                if ch._con is None or ch._con.is_closed():
+                    continue
+                counts = load.get(ch._con.connected_addr())
+                if counts is not None:
+                    counts[0] += not ch._release_event.is_set()
+                    counts[1] += 1
+            hosts.sort(key=lambda h: load[h.addr])
+        return hosts
+
+    async def _connect_to_hosts(self):
+        for host in self._order_hosts(time.monotonic()):
+            con = self._connection_factory(
+                [host.addr], self._working_config, self._working_params
+            )
+            try:
+                await con.connect(single_attempt=True)
+            except errors.ClientConnectionError as e:
+                backoff = host.eject(time.monotonic())
+                logger.warning(
+                    'could not connect to %s, not using it for %.1f '
+                    'seconds: %s', host.addr, backoff, e,
+                )
+                continue
+            host.admit()
+            return con
+
+        # No host accepts connections right now, wait for any of them
+        # to become available.
+        con = self._connection_factory(
+            [h.addr for h in self._hosts],
+            self._working_config,
+            self._working_params,
+        )
+        await con.connect()
+        for host in self._hosts:
+            if host.addr == con.connected_addr():
+                host.admit()
         return con
 
     async def _get_new_connection(self):
         con = None
         if self._working_addr is None:
             con = await self._maybe_get_first_connection()
+        if con is None and self._hosts is not None:
+            con = await self._connect_to_hosts()
         if con is None:
             assert self._working_addr is not None
             # We've connected before and have a resolved address,
@@ -585,6 +1211,7 @@ class BasePoolImpl(abc.ABC):
             )
             await con.connect()
 
+        con._observers = self._observers
         return con
 
     async def release(self, connection):
@@ -606,12 +1233,17 @@ class BasePoolImpl(abc.ABC):
                 f'{connection!r} is not a member of this pool'
             )
 
+        # The server may change its suggested concurrency at any time,
+        # e.g. to ask clients to give connections back.
+        self._update_max_concurrency(connection)
+
         return await self._release(ch)
 
     def terminate(self):
         """Terminate all connections in the pool."""
         if self._closed:
             return
+        self._stop_reaper()
         for ch in self._holders:
             ch.terminate()
         self._closed = True
@@ -624,6 +1256,65 @@ class BasePoolImpl(abc.ABC):
         """
         self._generation += 1
 
+    def prewarm(self, size=None):
+        """Open connections in the background until *size* are open.
+
+        *size* defaults to the min_size of the pool, or to its max
+        concurrency if min_size is zero.
+        """
+        self._ensure_initialized()
+        if size is None:
+            size = self._min_size or self._max_concurrency
+        self._maybe_prewarm(size)
+
+    def _maybe_prewarm(self, size=None):
+        if self._closing or self._closed or self._queue is None:
+            return
+        if size is None:
+            size = self._min_size
+        if size > 0:
+            with self._locked_free_holders() as free:
+                holders = self._select_prewarm_holders(free, size)
+            if holders:
+                self._start_prewarm(holders)
+
+    def _select_prewarm_holders(self, free, size):
+        def is_open(ch):
+            return ch._connecting or (
+                ch._con is not None and not ch._con.is_closed()
+            )
+
+        missing = min(size, self._max_concurrency) - sum(
+            1 for ch in self._holders if is_open(ch))
+        holders = []
+        # Walk from the top of the LIFO queue, where the holders
+        # released most recently are.
+        for ch in reversed(free):
+            if missing <= 0:
+                break
+            if not is_open(ch):
+                holders.append(ch)
+                missing -= 1
+
+        for ch in holders:
+            # Check the holder out, so that it is neither acquired nor
+            # closed by the pool while the connection is being opened.
+            free.remove(ch)
+            ch._connecting = True
+            ch._release_event.clear()
+        return holders
+
+    async def _prewarm_holder(self, ch):
+        try:
+            await ch.prewarm()
+        except Exception:
+            # The next acquire() of this holder connects again and
+            # reports the error to the caller.
+            logger.warning(
+                'failed to open a connection in the background',
+                exc_info=True,
+            )
+
     async def ensure_connected(self):
         self._ensure_initialized()
 
@@ -631,9 +1322,18 @@ class BasePoolImpl(abc.ABC):
             if ch._con is not None and not ch._con.is_closed():
                 return
 
+        for ch in self._holders:
+            if ch._connecting:
+                # The connection is being opened by prewarm(), wait for
+                # it instead of opening another one.
+                await ch.wait_until_released()
+                if ch._con is not None and not ch._con.is_closed():
+                    return
+
         ch = self._holders[0]
         ch._con = None
         await ch.connect()
+        self._maybe_prewarm()
 
 
 class BaseClient(abstract.BaseReadOnlyExecutor, _options._OptionsMixin):
@@ -661,6 +1361,7 @@ class BaseClient(abstract.BaseReadOnlyExecutor, _options._OptionsMixin):
         tls_server_name: str = None,
         wait_until_available: int = 30,
         timeout: int = 10,
+        command_timeout: typing.Optional[float] = None,
         **kwargs,
     ):
         super().__init__()
@@ -681,6 +1382,7 @@ class BaseClient(abstract.BaseReadOnlyExecutor, _options._OptionsMixin):
             "tls_security": tls_security,
             "tls_server_name": tls_server_name,
             "wait_until_available": wait_until_available,
+            "command_timeout": command_timeout,
         }
 
         self._impl = self._impl_class(
@@ -699,6 +1401,7 @@ class BaseClient(abstract.BaseReadOnlyExecutor, _options._OptionsMixin):
         return abstract.QueryCache(
             codecs_registry=self._impl.codecs_registry,
             query_cache=self._impl.query_cache,
+            descriptor_cache=self._impl.descriptor_cache,
         )
 
     def _get_retry_options(self) -> typing.Optional[_options.RetryOptions]:
@@ -713,18 +1416,72 @@ class BaseClient(abstract.BaseReadOnlyExecutor, _options._OptionsMixin):
     def _get_annotations(self) -> typing.Dict[str, str]:
         return self._options.annotations
 
+    def _get_query_timeout(self) -> typing.Optional[float]:
+        return self._options.query_timeout
+
+    def _get_lazy_objects(self) -> bool:
+        return self._options.lazy_objects
+
     @property
     def max_concurrency(self) -> int:
         """Max number of connections in the pool."""
 
         return self._impl.get_max_concurrency()
 
+    @property
+    def min_size(self) -> int:
+        """Min number of connections the pool keeps open."""
+
+        return self._impl.get_min_size()
+
     @property
     def free_size(self) -> int:
         """Number of available connections in the pool."""
 
         return self._impl.get_free_size()
 
+    def cache_stats(self) -> ClientCacheStats:
+        """Return usage statistics of the client's caches.
+
+        ``query_cache`` covers the cache of parsed queries (keyed by
+        query text and options) and ``codecs`` the cache of codecs built
+        from type descriptors sent by the server.
+        """
+        return ClientCacheStats(
+            query_cache=CacheStats.from_lru(self._impl.query_cache),
+            codecs=CacheStats.from_lru(self._impl.codecs_registry.codecs),
+        )
+
+    def add_query_observer(
+        self, observer: _observers.QueryObserver
+    ) -> None:
+        """Add an observer notified of every query run by the client.
+
+        :param observer:
+            A :class:`gel.observers.QueryObserver` instance, e.g.
+            :class:`gel.observers.OpenTelemetryObserver`.
+        """
+        if observer not in self._impl._observers:
+            self._impl._observers.append(observer)
+
+    def remove_query_observer(
+        self, observer: _observers.QueryObserver
+    ) -> None:
+        """Remove a query observer."""
+        if observer in self._impl._observers:
+            self._impl._observers.remove(observer)
+
+    def pool_stats(self) -> PoolStats:
+        """Return usage statistics of the client's connection pool.
+
+        ``free`` and ``waiters`` are the current number of free
+        connections and of callers waiting for one.  ``waits`` counts
+        the acquires that found no free connection, and
+        ``wait_time_histogram`` their wait times bucketed by upper
+        bound in seconds.
+        """
+        return self._impl.get_stats()
+
     async def _query(self, query_context: abstract.QueryContext):
         con = await self._impl.acquire()
         try:
@@ -739,6 +1496,52 @@ class BaseClient(abstract.BaseReadOnlyExecutor, _options._OptionsMixin):
         finally:
             await self._impl.release(con)
 
+    def _make_query_iter_context(
+        self, query: str, args, kwargs
+    ) -> abstract.QueryContext:
+        return abstract.QueryContext(
+            query=abstract.QueryWithArgs(query, args, kwargs),
+            cache=self._get_query_cache(),
+            query_options=abstract._query_opts,
+            retry_options=None,
+            state=self._get_state(),
+            warning_handler=self._get_warning_handler(),
+            annotations=self._get_annotations(),
+            query_timeout=self._get_query_timeout(),
+            lazy_objects=self._get_lazy_objects(),
+        )
+
+    def _make_execute_many_context(
+        self, commands: str
+    ) -> abstract.ExecuteContext:
+        return abstract.ExecuteContext(
+            query=abstract.QueryWithArgs(commands, (), {}),
+            cache=self._get_query_cache(),
+            retry_options=self._get_retry_options(),
+            state=self._get_state(),
+            warning_handler=self._get_warning_handler(),
+            annotations=self._get_annotations(),
+            query_timeout=self._get_query_timeout(),
+        )
+
+    async def _execute_many(
+        self, execute_context: abstract.ExecuteContext, args_seq
+    ) -> None:
+        con = await self._impl.acquire()
+        try:
+            await con._execute_many(execute_context, args_seq)
+        finally:
+            await self._impl.release(con)
+
+    async def _pipeline(self, contexts) -> list:
+        if not contexts:
+            return []
+        con = await self._impl.acquire()
+        try:
+            return await con.raw_pipeline(contexts)
+        finally:
+            await self._impl.release(con)
+
     async def _describe(
         self, describe_context: abstract.DescribeContext
     ) -> abstract.DescribeResult:
@@ -30,6 +30,7 @@ from . import abstract
 from . import base_client
 from . import con_utils
 from . import errors
+from . import pipeline as _pipeline
 from . import transaction
 from .protocol import blocking_proto
 from .protocol.protocol import InputLanguage, OutputFormat
@@ -39,6 +40,15 @@ DEFAULT_PING_BEFORE_IDLE_TIMEOUT = datetime.timedelta(seconds=5)
 MINIMUM_PING_WAIT_TIME = datetime.timedelta(seconds=1)
 
 
+def _iter_coroutine(coro):
+    try:
+        coro.send(None)
+    except StopIteration as ex:
+        return ex.value
+    finally:
+        coro.close()
+
+
 class BlockingIOConnection(base_client.BaseConnection):
     __slots__ = ("_ping_wait_time",)
 
@@ -152,6 +162,9 @@ class BlockingIOConnection(base_client.BaseConnection):
     async def sleep(self, seconds):
         time.sleep(seconds)
 
+    async def _wait_for(self, coro, timeout):
+        return await self._protocol.wait_for(coro, timeout)
+
     def is_closed(self):
         proto = self._protocol
         return not (proto and proto.sock is not None and
@@ -181,7 +194,7 @@ class BlockingIOConnection(base_client.BaseConnection):
         for cb in self._log_listeners:
             cb(self, msg)
 
-    async def raw_query(self, query_context: abstract.QueryContext):
+    async def _ping_if_idle(self):
         try:
             if (
                 time.monotonic() - self._protocol.last_active_timestamp
@@ -191,8 +204,22 @@ class BlockingIOConnection(base_client.BaseConnection):
         except (errors.IdleSessionTimeoutError, errors.ClientConnectionError):
             await self.connect()
 
+    async def raw_query(self, query_context: abstract.QueryContext):
+        await self._ping_if_idle()
         return await super().raw_query(query_context)
 
+    async def raw_pipeline(self, contexts) -> list:
+        await self._ping_if_idle()
+        return await super().raw_pipeline(contexts)
+
+    async def _execute_many(self, execute_context, args_seq) -> None:
+        await self._ping_if_idle()
+        await super()._execute_many(execute_context, args_seq)
+
+    async def raw_query_iter(self, query_context: abstract.QueryContext):
+        await self._ping_if_idle()
+        return await super().raw_query_iter(query_context)
+
 
 class _PoolConnectionHolder(base_client.PoolConnectionHolder):
     __slots__ = ()
@@ -216,6 +243,14 @@ class _PoolImpl(base_client.BasePoolImpl):
         *,
         max_concurrency: typing.Optional[int],
         connection_class,
+        query_cache_size: int = base_client.QUERY_CACHE_SIZE,
+        codecs_cache_size: int = base_client.CODECS_CACHE_SIZE,
+        share_codecs: bool = False,
+        descriptor_cache_dir: typing.Optional[str] = None,
+        min_size: int = 0,
+        max_idle_time: typing.Optional[float] = None,
+        max_lifetime: typing.Optional[float] = None,
+        load_balancing: str = 'least_outstanding',
     ):
         if not issubclass(connection_class, BlockingIOConnection):
             raise TypeError(
@@ -226,13 +261,24 @@ class _PoolImpl(base_client.BasePoolImpl):
             connect_args,
             connection_class,
             max_concurrency=max_concurrency,
+            query_cache_size=query_cache_size,
+            codecs_cache_size=codecs_cache_size,
+            share_codecs=share_codecs,
+            descriptor_cache_dir=descriptor_cache_dir,
+            min_size=min_size,
+            max_idle_time=max_idle_time,
+            max_lifetime=max_lifetime,
+            load_balancing=load_balancing,
         )
+        self._stats_lock = threading.Lock()
 
     def _ensure_initialized(self):
         if self._queue is None:
             self._queue = queue.LifoQueue(maxsize=self._max_concurrency)
             self._first_connect_lock = threading.Lock()
             self._resize_holder_pool()
+            self._start_reaper()
+            self._maybe_prewarm()
 
     def _set_queue_maxsize(self, maxsize):
         with self._queue.mutex:
@@ -249,16 +295,31 @@ class _PoolImpl(base_client.BasePoolImpl):
         if self._closing:
             raise errors.InterfaceError('pool is closing')
 
-        ch = self._queue.get(timeout=timeout)
+        # Fast path: take a free holder without blocking.
+        try:
+            ch = self._queue.get_nowait()
+        except queue.Empty:
+            started = self._start_wait()
+            try:
+                ch = self._queue.get(timeout=timeout)
+            except BaseException:
+                self._end_wait(started, False)
+                raise
+            waited = self._end_wait(started, True)
+        else:
+            self._count_acquire()
+            waited = 0
+
         try:
             con = await ch.acquire()
         except Exception:
-            self._queue.put_nowait(ch)
+            self._put_holder(ch)
             raise
         else:
             # Record the timeout, as we will apply it by default
             # in release().
             ch._timeout = timeout
+            con._pool_wait_time = waited
             return con
 
     async def _release(self, holder):
@@ -271,10 +332,47 @@ class _PoolImpl(base_client.BasePoolImpl):
         timeout = None
         return await holder.release(timeout)
 
+    @contextlib.contextmanager
+    def _locked_free_holders(self):
+        with self._queue.mutex:
+            yield self._queue.queue
+
+    def _start_prewarm(self, holders):
+        # Connecting blocks, so every connection is opened in a thread
+        # of its own.
+        for ch in holders:
+            threading.Thread(
+                target=_iter_coroutine,
+                args=(self._prewarm_holder(ch),),
+                name='gel-pool-prewarm',
+                daemon=True,
+            ).start()
+
+    def _start_reaper(self):
+        interval = self._get_reaper_interval()
+        if interval is not None:
+            self._reaper = threading.Event()
+            threading.Thread(
+                target=self._run_reaper,
+                args=(self._reaper, interval),
+                name='gel-pool-reaper',
+                daemon=True,
+            ).start()
+
+    def _stop_reaper(self):
+        if self._reaper is not None:
+            self._reaper.set()
+            self._reaper = None
+
+    def _run_reaper(self, stopped, interval):
+        while not stopped.wait(interval):
+            self._reap()
+
     async def close(self, timeout=None):
         if self._closed:
             return
         self._closing = True
+        self._stop_reaper()
         try:
             if timeout is None:
                 for ch in self._holders:
@@ -377,6 +475,15 @@ class Retry(transaction.BaseRetry):
         return iteration
 
 
+class Pipeline(_pipeline.BasePipeline):
+
+    __slots__ = ()
+
+    def run(self) -> list:
+        """Send all recorded queries and return their results in order."""
+        return self._client._pipeline(self._take_contexts())
+
+
 class Client(base_client.BaseClient, abstract.Executor):
     """A lazy connection pool.
 
@@ -393,12 +500,7 @@ class Client(base_client.BaseClient, abstract.Executor):
     _impl_class = _PoolImpl
 
     def _iter_coroutine(self, coro):
-        try:
-            coro.send(None)
-        except StopIteration as ex:
-            return ex.value
-        finally:
-            coro.close()
+        return _iter_coroutine(coro)
 
     def _query(self, query_context: abstract.QueryContext):
         return self._iter_coroutine(super()._query(query_context))
@@ -406,13 +508,65 @@ class Client(base_client.BaseClient, abstract.Executor):
     def _execute(self, execute_context: abstract.ExecuteContext) -> None:
         self._iter_coroutine(super()._execute(execute_context))
 
+    def _pipeline(self, contexts) -> list:
+        return self._iter_coroutine(super()._pipeline(contexts))
+
     def ensure_connected(self):
         self._iter_coroutine(self._impl.ensure_connected())
         return self
 
+    def prewarm(self, size: typing.Optional[int] = None):
+        """Open connections concurrently in the background.
+
+        Return immediately, without waiting for the connections.
+        """
+        self._impl.prewarm(size)
+        return self
+
     def transaction(self) -> Retry:
         return Retry(self)
 
+    def pipeline(self) -> Pipeline:
+        return Pipeline(self)
+
+    def query_iter(
+        self, query: str, *args, **kwargs
+    ) -> typing.Iterator[typing.Any]:
+        """Run a query and yield the elements of the result as they arrive.
+
+        If the iterator is closed before the result is exhausted, the
+        connection is reset unless the rest of the result has already been
+        received.  Inside a transaction the rest of the result is read and
+        discarded instead, so that the transaction is not lost.
+        """
+        con = self._iter_coroutine(self._impl.acquire())
+        try:
+            batches = self._iter_coroutine(con.raw_query_iter(
+                self._make_query_iter_context(query, args, kwargs)
+            ))
+            try:
+                while True:
+                    try:
+                        rows = self._iter_coroutine(batches.__anext__())
+                    except StopAsyncIteration:
+                        break
+                    yield from rows
+            finally:
+                self._iter_coroutine(batches.aclose())
+        finally:
+            self._iter_coroutine(self._impl.release(con))
+
+    def execute_many(
+        self,
+        commands: str,
+        args_seq: typing.Iterable[
+            typing.Union[typing.Sequence, typing.Mapping[str, typing.Any]]
+        ],
+    ) -> None:
+        self._iter_coroutine(self._execute_many(
+            self._make_execute_many_context(commands), args_seq
+        ))
+
     def close(self, timeout=None):
         """Attempt to gracefully close all connections in the client.
 
@@ -466,10 +620,27 @@ def create_client(
     tls_security: str = None,
     wait_until_available: int = 30,
     timeout: int = 10,
+    command_timeout: typing.Optional[float] = None,
+    query_cache_size: int = base_client.QUERY_CACHE_SIZE,
+    codecs_cache_size: int = base_client.CODECS_CACHE_SIZE,
+    share_codecs: bool = False,
+    descriptor_cache_dir: typing.Optional[str] = None,
+    min_size: int = 0,
+    max_idle_time: typing.Optional[float] = None,
+    max_lifetime: typing.Optional[float] = None,
+    load_balancing: str = 'least_outstanding',
 ):
     return Client(
         connection_class=BlockingIOConnection,
         max_concurrency=max_concurrency,
+        query_cache_size=query_cache_size,
+        codecs_cache_size=codecs_cache_size,
+        share_codecs=share_codecs,
+        descriptor_cache_dir=descriptor_cache_dir,
+        min_size=min_size,
+        max_idle_time=max_idle_time,
+        max_lifetime=max_lifetime,
+        load_balancing=load_balancing,
 
         # connect arguments
         dsn=dsn,
@@ -487,4 +658,5 @@ def create_client(
         tls_security=tls_security,
         wait_until_available=wait_until_available,
         timeout=timeout,
+        command_timeout=command_timeout,
     )
@@ -1219,6 +1219,87 @@ def parse_connect_arguments(
     return connect_config, client_config
 
 
+def _split_hostspec(hostspec):
+    if hostspec.startswith('['):
+        # Bracketed IPv6 address, optionally followed by a port.
+        addr, _, rest = hostspec[1:].partition(']')
+        if rest and not rest.startswith(':'):
+            raise ValueError(f'invalid host: "{hostspec}"')
+        port = rest[1:]
+    elif hostspec.count(':') == 1:
+        addr, _, port = hostspec.partition(':')
+    else:
+        addr, port = hostspec, ''
+    if port:
+        try:
+            port = int(port)
+        except ValueError:
+            raise ValueError(
+                f'invalid port in host: "{hostspec}"') from None
+    return addr, port or None
+
+
+def split_hosts(connect_args):
+    """Split connect arguments naming several hosts into one per host.
+
+    Several hosts are given as a comma-separated list, with an optional
+    port for each of them, either in the host part of the DSN or in the
+    *host* argument, which can also be a list.  In the latter case
+    *port* can be a list of ports of the same length::
+
+        gel://user@host1,host2:5657/main
+        host="host1,host2:5657"
+
+    Return a list with a copy of *connect_args* for each host, or just
+    *connect_args* if only one host is named.
+    """
+    dsn = connect_args.get('dsn')
+    host = connect_args.get('host')
+
+    if dsn and DSN_RE.match(dsn):
+        parsed = urllib.parse.urlsplit(dsn)
+        userinfo, at, hostlist = parsed.netloc.rpartition('@')
+        if ',' not in hostlist:
+            return [connect_args]
+        return [
+            {
+                **connect_args,
+                'dsn': urllib.parse.urlunsplit(
+                    parsed._replace(netloc=f'{userinfo}{at}{hostspec}')
+                ),
+            }
+            for hostspec in hostlist.split(',')
+        ]
+
+    if isinstance(host, str):
+        if ',' not in host:
+            return [connect_args]
+        hostspecs = host.split(',')
+    elif host is not None:
+        hostspecs = list(host)
+    else:
+        return [connect_args]
+
+    ports = connect_args.get('port')
+    if isinstance(ports, (list, tuple)):
+        if len(ports) != len(hostspecs):
+            raise ValueError(
+                f'could not match {len(ports)} port numbers to '
+                f'{len(hostspecs)} hosts')
+    else:
+        ports = [ports] * len(hostspecs)
+
+    result = []
+    for hostspec, default_port in zip(hostspecs, ports):
+        addr, port = _split_hostspec(hostspec.strip())
+        result.append({
+            **connect_args,
+            'host': addr,
+            'port': port if port is not None else default_port,
+        })
+    return result
+
+
 def check_alpn_protocol(ssl_obj):
     if ssl_obj.selected_alpn_protocol() != 'edgedb-binary':
         raise errors.ClientConnectionFailedError(
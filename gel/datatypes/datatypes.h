@@ -118,6 +118,9 @@ typedef struct {
     PyObject *weakreflist;
     PyObject *desc;
     Py_hash_t cached_hash;
+    /* Callable decoding the fields left NULL in ob_item,
+       only set for lazily decoded objects. */
+    PyObject *loader;
     PyObject *ob_item[1];
 } EdgeObject;
 
@@ -126,6 +129,7 @@ PyObject * EdgeObject_New(PyObject *);
 PyObject * EdgeObject_GetRecordDesc(PyObject *);
 
 int EdgeObject_SetItem(PyObject *, Py_ssize_t, PyObject *);
+int EdgeObject_SetLoader(PyObject *, PyObject *);
 PyObject * EdgeObject_GetItem(PyObject *, Py_ssize_t);
 
 
@@ -56,6 +56,7 @@ cdef extern from "datatypes.h":
     object EdgeObject_InitType()
     object EdgeObject_New(object);
     int EdgeObject_SetItem(object, Py_ssize_t, object) except -1
+    int EdgeObject_SetLoader(object, object) except -1
     object EdgeObject_GetRecordDesc(object)
 
     object EdgeRecord_InitType()
@@ -73,6 +74,7 @@ cdef namedtuple_new(object namedtuple_type)
 cdef namedtuple_type_new(object desc)
 cdef object_new(object desc)
 cdef object_set(object tuple, Py_ssize_t pos, object elem)
+cdef object_set_loader(object obj, object loader)
 cdef record_new(object desc)
 cdef record_set(object obj, Py_ssize_t pos, object elem)
 
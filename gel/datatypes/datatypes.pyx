@@ -136,6 +136,9 @@ cdef object_new(object desc):
 cdef object_set(object obj, Py_ssize_t pos, object elem):
     EdgeObject_SetItem(obj, pos, elem)
 
+cdef object_set_loader(object obj, object loader):
+    EdgeObject_SetLoader(obj, loader)
+
 cdef record_new(object desc):
     return EdgeRecord_New(desc)
 
@@ -74,6 +74,7 @@ EdgeObject_New(PyObject *desc)
     o->desc = desc;
 
     o->cached_hash = -1;
+    o->loader = NULL;
 
     PyObject_GC_Track(o);
     return (PyObject *)o;
@@ -109,6 +110,71 @@ EdgeObject_SetItem(PyObject *ob, Py_ssize_t i, PyObject *el)
 }
 
 
+int
+EdgeObject_SetLoader(PyObject *ob, PyObject *loader)
+{
+    assert(EdgeObject_Check(ob));
+    EdgeObject *o = (EdgeObject *)ob;
+    Py_INCREF(loader);
+    Py_XSETREF(o->loader, loader);
+    return 0;
+}
+
+
+static PyObject *
+object_get_item(EdgeObject *o, Py_ssize_t i)
+{
+    /* Returns a new reference to the i-th field, decoding it first
+       if the object is lazily decoded and the field hasn't been
+       accessed yet. */
+    PyObject *el = EdgeObject_GET_ITEM(o, i);
+    if (el == NULL) {
+        if (o->loader == NULL) {
+            PyErr_BadInternalCall();
+            return NULL;
+        }
+        PyObject *idx = PyLong_FromSsize_t(i);
+        if (idx == NULL) {
+            return NULL;
+        }
+        el = PyObject_CallOneArg(o->loader, idx);
+        Py_DECREF(idx);
+        if (el == NULL) {
+            return NULL;
+        }
+        /* The loader might have been re-entered for the same field. */
+        if (EdgeObject_GET_ITEM(o, i) == NULL) {
+            EdgeObject_SET_ITEM(o, i, el);
+        }
+        else {
+            Py_DECREF(el);
+            el = EdgeObject_GET_ITEM(o, i);
+        }
+    }
+    Py_INCREF(el);
+    return el;
+}
+
+
+static int
+object_load_items(EdgeObject *o)
+{
+    Py_ssize_t i;
+
+    if (o->loader == NULL) {
+        return 0;
+    }
+    for (i = 0; i < Py_SIZE(o); i++) {
+        PyObject *el = object_get_item(o, i);
+        if (el == NULL) {
+            return -1;
+        }
+        Py_DECREF(el);
+    }
+    return 0;
+}
+
+
 PyObject *
 EdgeObject_GetItem(PyObject *ob, Py_ssize_t i)
 {
@@ -118,9 +184,7 @@ EdgeObject_GetItem(PyObject *ob, Py_ssize_t i)
         PyErr_BadInternalCall();
         return NULL;
     }
-    PyObject *el = EdgeObject_GET_ITEM(o, i);
-    Py_INCREF(el);
-    return el;
+    return object_get_item(o, i);
 }
 
 
@@ -132,6 +196,7 @@ object_dealloc(EdgeObject *o)
         PyObject_ClearWeakRefs((PyObject*)o);
     }
     Py_CLEAR(o->desc);
+    Py_CLEAR(o->loader);
     o->cached_hash = -1;
     Py_TRASHCAN_BEGIN(o, object_dealloc);
     EDGE_DEALLOC_WITH_FREELIST(EDGE_OBJECT, EdgeObject, o);
@@ -143,6 +208,7 @@ static int
 object_traverse(EdgeObject *o, visitproc visit, void *arg)
 {
     Py_VISIT(o->desc);
+    Py_VISIT(o->loader);
 
     Py_ssize_t i;
     for (i = Py_SIZE(o); --i >= 0;) {
@@ -178,11 +244,8 @@ object_getattr(EdgeObject *o, PyObject *name)
 
         case L_LINKPROP:
         case L_LINK:
-        case L_PROPERTY: {
-            PyObject *val = EdgeObject_GET_ITEM(o, pos);
-            Py_INCREF(val);
-            return val;
-        }
+        case L_PROPERTY:
+            return object_get_item(o, pos);
 
         default:
             abort();
@@ -207,11 +270,8 @@ object_getitem(EdgeObject *o, PyObject *name)
                 name);
             return NULL;
 
-        case L_LINKPROP: {
-            PyObject *val = EdgeObject_GET_ITEM(o, pos);
-            Py_INCREF(val);
-            return val;
-        }
+        case L_LINKPROP:
+            return object_get_item(o, pos);
 
         case L_NOT_FOUND: {
             int prefixed = 0;
@@ -256,6 +316,11 @@ static PyObject *
 object_repr(EdgeObject *o)
 {
     _PyUnicodeWriter writer;
+
+    if (object_load_items(o) < 0) {
+        return NULL;
+    }
+
     _PyUnicodeWriter_Init(&writer);
     writer.overallocate = 1;
 
@@ -86,6 +86,7 @@ class EdgeDBError(Exception, metaclass=EdgeDBErrorMeta):
 
     _code = None
     _query = None
+    _args_index = None
     tags = frozenset()
 
     def __init__(self, *args, **kwargs):
@@ -141,6 +142,9 @@ class EdgeDBError(Exception, metaclass=EdgeDBErrorMeta):
     def get_code(self):
         return self._code
 
+    def get_args_index(self):
+        return self._args_index
+
     def get_server_context(self):
         return self._read_str_field(FIELD_SERVER_TRACEBACK)
 
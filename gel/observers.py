@@ -0,0 +1,227 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2016-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import hashlib
+import logging
+import time
+import typing
+
+from . import errors
+
+
+logger = logging.getLogger(__name__)
+
+# Cumulative counters of a protocol instance that QueryStats is built of.
+_PROTOCOL_COUNTERS = (
+    "bytes_sent",
+    "bytes_received",
+    "rows_decoded",
+    "cache_hits",
+    "cache_misses",
+    "parse_time",
+    "execute_time",
+    "decode_time",
+)
+
+
+def query_hash(query: str) -> str:
+    """Return a short stable hash of the query text."""
+    return hashlib.blake2b(query.encode('utf-8'), digest_size=8).hexdigest()
+
+
+class QueryStats(typing.NamedTuple):
+    """Statistics of one query reported to query observers.
+
+    ``cache_hit`` is None if the query never reached the point of
+    looking up the query cache.  ``execute_time`` includes
+    ``decode_time``, and all times are in seconds.
+    """
+
+    query_hash: str
+    cache_hit: typing.Optional[bool]
+    parse_time: float
+    execute_time: float
+    decode_time: float
+    bytes_sent: int
+    bytes_received: int
+    rows: int
+    attempts: int
+    pool_wait_time: float
+    duration: float
+
+
+class QueryObserver:
+    """Base class for observers of the queries run by a client.
+
+    Observers are registered with ``Client.add_query_observer()``.
+    Exceptions raised by observers are logged and otherwise ignored.
+    """
+
+    def query_started(self, query: str, query_hash: str) -> typing.Any:
+        """Called before a query is sent.
+
+        The returned value is passed back to :meth:`query_finished`.
+        """
+        return None
+
+    def query_finished(
+        self,
+        token: typing.Any,
+        stats: QueryStats,
+        error: typing.Optional[BaseException],
+    ) -> None:
+        """Called once the query has completed or failed."""
+
+
+class OpenTelemetryObserver(QueryObserver):
+    """A query observer emitting an OpenTelemetry span for every query.
+
+    Spans are named ``gel.query`` and carry the fields of
+    :class:`QueryStats` as ``gel.*`` attributes.  The query text itself
+    is not recorded, only its hash.
+
+    :param tracer:
+        The tracer to create the spans with, by default the one
+        of the globally configured tracer provider.
+    """
+
+    def __init__(self, tracer=None):
+        try:
+            from opentelemetry import trace
+        except ImportError:
+            raise errors.InterfaceError(
+                'OpenTelemetryObserver requires the "opentelemetry-api" '
+                'package to be installed'
+            ) from None
+
+        if tracer is None:
+            tracer = trace.get_tracer(__name__)
+        self._tracer = tracer
+        self._trace = trace
+
+    def query_started(self, query, query_hash):
+        return self._tracer.start_span(
+            'gel.query',
+            kind=self._trace.SpanKind.CLIENT,
+            attributes={
+                'db.system': 'gel',
+                'gel.query.hash': query_hash,
+            },
+        )
+
+    def query_finished(self, span, stats, error):
+        if stats.cache_hit is not None:
+            span.set_attribute('gel.cache_hit', stats.cache_hit)
+        span.set_attributes({
+            'gel.parse_time': stats.parse_time,
+            'gel.execute_time': stats.execute_time,
+            'gel.decode_time': stats.decode_time,
+            'gel.bytes_sent': stats.bytes_sent,
+            'gel.bytes_received': stats.bytes_received,
+            'gel.rows': stats.rows,
+            'gel.attempts': stats.attempts,
+            'gel.pool_wait_time': stats.pool_wait_time,
+        })
+        if error is not None:
+            span.record_exception(error)
+            span.set_status(self._trace.Status(
+                self._trace.StatusCode.ERROR, str(error)))
+        span.end()
+
+
+class _QueryProbe:
+    # Collects the QueryStats of one query run on a connection.  The
+    # protocol counters are cumulative, so the probe keeps a snapshot
+    # of every protocol the query has run on, there is more than one
+    # if the connection was re-established between retries.
+    __slots__ = (
+        "_con",
+        "_query",
+        "_hash",
+        "_tokens",
+        "_snapshots",
+        "_started",
+        "_pool_wait_time",
+        "attempts",
+    )
+
+    def __init__(self, con, query):
+        self._con = con
+        self._query = query
+        self._hash = query_hash(query)
+        self._tokens = []
+        self._snapshots = []
+        self._started = 0.0
+        self._pool_wait_time = con._pool_wait_time
+        con._pool_wait_time = 0.0
+        self.attempts = 1
+
+    def watch(self, proto):
+        self._snapshots.append(
+            (proto, [getattr(proto, c) for c in _PROTOCOL_COUNTERS]))
+
+    def _get_totals(self):
+        totals = [0] * len(_PROTOCOL_COUNTERS)
+        for proto, snapshot in self._snapshots:
+            for i, c in enumerate(_PROTOCOL_COUNTERS):
+                totals[i] += getattr(proto, c) - snapshot[i]
+        return totals
+
+    def __enter__(self):
+        self._con._probe = self
+        self.watch(self._con._protocol)
+        for observer in tuple(self._con._observers):
+            try:
+                token = observer.query_started(self._query, self._hash)
+            except Exception:
+                logger.exception('query observer %r failed', observer)
+                token = None
+            self._tokens.append((observer, token))
+        self._started = time.monotonic()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.monotonic() - self._started
+        self._con._probe = None
+        (
+            bytes_sent, bytes_received, rows, cache_hits, cache_misses,
+            parse_time, execute_time, decode_time,
+        ) = self._get_totals()
+        stats = QueryStats(
+            query_hash=self._hash,
+            cache_hit=(
+                None if not cache_hits and not cache_misses
+                else not cache_misses
+            ),
+            parse_time=parse_time,
+            execute_time=execute_time,
+            decode_time=decode_time,
+            bytes_sent=bytes_sent,
+            bytes_received=bytes_received,
+            rows=rows,
+            attempts=self.attempts,
+            pool_wait_time=self._pool_wait_time,
+            duration=duration,
+        )
+        for observer, token in self._tokens:
+            try:
+                observer.query_finished(token, stats, exc)
+            except Exception:
+                logger.exception('query observer %r failed', observer)
+        return False
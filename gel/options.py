@@ -141,7 +141,7 @@ class TransactionOptions:
 
 
 class State:
-    __slots__ = ['_module', '_aliases', '_config', '_globals']
+    __slots__ = ['_module', '_aliases', '_config', '_globals', '_lowered']
 
     def __init__(
         self,
@@ -156,6 +156,8 @@ class State:
         self._globals = (
             {} if globals_ is None else self.with_globals(globals_)._globals
         )
+        # (query_timeout, dict) memoized by abstract._lower_state()
+        self._lowered = None
 
     @classmethod
     def _new(cls, default_module, module_aliases, config, globals_):
@@ -164,6 +166,7 @@ class State:
         rv._aliases = module_aliases
         rv._config = config
         rv._globals = globals_
+        rv._lowered = None
         return rv
 
     @classmethod
@@ -366,6 +369,56 @@ class _OptionsMixin:
         result._options = self._options.with_state(state)
         return result
 
+    def with_query_timeout(self, timeout: typing.Optional[float] = None):
+        """Returns object with adjusted timeout for future queries.
+
+        :param timeout float:
+            Number of seconds a query may run for, or ``None`` to fall
+            back to the ``command_timeout`` of the client.
+
+        The timeout is enforced by the server, which cancels the query
+        with a ``QueryTimeoutError`` and keeps the connection usable.
+        If the server doesn't reply shortly after the timeout either,
+        the connection is aborted.
+
+        This method returns a "shallow copy" of the current object
+        with modified query timeout.
+        """
+        if timeout is not None:
+            if (
+                isinstance(timeout, bool)
+                or not isinstance(timeout, (int, float))
+                or timeout <= 0
+            ):
+                raise errors.InvalidArgumentError(
+                    f"invalid query timeout: expected a positive number, "
+                    f"got {timeout!r}"
+                )
+            timeout = float(timeout)
+
+        result = self._shallow_clone()
+        result._options = self._options.with_query_timeout(timeout)
+        return result
+
+    def with_lazy_objects(self, enabled: bool = True):
+        """Returns object with lazy decoding of objects enabled or disabled.
+
+        :param enabled bool:
+            Whether fields of the objects returned by future queries
+            are decoded only when accessed for the first time.
+
+        Lazily decoded objects keep the raw data of their row around
+        until they are garbage collected, so this pays off for wide
+        objects of which only a few fields are ever read.  Errors
+        decoding a field are raised when the field is accessed.
+
+        This method returns a "shallow copy" of the current object
+        with modified lazy decoding option.
+        """
+        result = self._shallow_clone()
+        result._options = self._options.with_lazy_objects(bool(enabled))
+        return result
+
     def with_default_module(self, module: typing.Optional[str] = None):
         result = self._shallow_clone()
         result._options = self._options.with_state(
@@ -443,7 +496,8 @@ class _Options:
 
     __slots__ = [
         '_retry_options', '_transaction_options', '_state',
-        '_warning_handler', '_annotations'
+        '_warning_handler', '_annotations', '_query_timeout',
+        '_lazy_objects',
     ]
 
     def __init__(
@@ -453,12 +507,16 @@ class _Options:
         state: State,
         warning_handler: WarningHandler,
         annotations: typing.Dict[str, str],
+        query_timeout: typing.Optional[float] = None,
+        lazy_objects: bool = False,
     ):
         self._retry_options = retry_options
         self._transaction_options = transaction_options
         self._state = state
         self._warning_handler = warning_handler
         self._annotations = annotations
+        self._query_timeout = query_timeout
+        self._lazy_objects = lazy_objects
 
     @property
     def retry_options(self):
@@ -480,6 +538,14 @@ class _Options:
     def annotations(self):
         return self._annotations
 
+    @property
+    def query_timeout(self):
+        return self._query_timeout
+
+    @property
+    def lazy_objects(self):
+        return self._lazy_objects
+
     def with_retry_options(self, options: RetryOptions):
         return _Options(
             options,
@@ -487,6 +553,8 @@ class _Options:
             self._state,
             self._warning_handler,
             self._annotations,
+            self._query_timeout,
+            self._lazy_objects,
         )
 
     def with_transaction_options(self, options: TransactionOptions):
@@ -496,6 +564,8 @@ class _Options:
             self._state,
             self._warning_handler,
             self._annotations,
+            self._query_timeout,
+            self._lazy_objects,
         )
 
     def with_state(self, state: State):
@@ -505,6 +575,8 @@ class _Options:
             state,
             self._warning_handler,
             self._annotations,
+            self._query_timeout,
+            self._lazy_objects,
         )
 
     def with_warning_handler(self, warning_handler: WarningHandler):
@@ -514,6 +586,30 @@ class _Options:
             self._state,
             warning_handler,
             self._annotations,
+            self._query_timeout,
+            self._lazy_objects,
+        )
+
+    def with_query_timeout(self, query_timeout: typing.Optional[float]):
+        return _Options(
+            self._retry_options,
+            self._transaction_options,
+            self._state,
+            self._warning_handler,
+            self._annotations,
+            query_timeout,
+            self._lazy_objects,
+        )
+
+    def with_lazy_objects(self, lazy_objects: bool):
+        return _Options(
+            self._retry_options,
+            self._transaction_options,
+            self._state,
+            self._warning_handler,
+            self._annotations,
+            self._query_timeout,
+            lazy_objects,
         )
 
     def with_annotations(self, annotations: typing.Dict[str, str]):
@@ -523,6 +619,8 @@ class _Options:
             self._state,
             self._warning_handler,
             annotations,
+            self._query_timeout,
+            self._lazy_objects,
         )
 
     @classmethod
@@ -0,0 +1,133 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2016-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+from . import abstract
+from .protocol import protocol
+
+
+class BasePipeline:
+    """A batch of queries sent to the server in a single round trip.
+
+    Queries are only recorded by the ``query*()`` and ``execute()``
+    methods; they are sent when the pipeline is run, back-to-back on
+    a single connection followed by a single Sync message.
+    """
+
+    __slots__ = ("_client", "_contexts")
+
+    def __init__(self, client):
+        self._client = client
+        self._contexts = []
+
+    def __len__(self):
+        return len(self._contexts)
+
+    def __repr__(self):
+        return '<{}.{} queries:{} {:#x}>'.format(
+            'gel', self.__class__.__name__, len(self._contexts), id(self))
+
+    def _take_contexts(self):
+        contexts, self._contexts = self._contexts, []
+        return contexts
+
+    def _add_query(
+        self,
+        query: str,
+        args,
+        kwargs,
+        query_options: abstract.QueryOptions,
+        input_language: protocol.InputLanguage = protocol.InputLanguage.EDGEQL,
+    ) -> None:
+        client = self._client
+        self._contexts.append(abstract.QueryContext(
+            query=abstract.QueryWithArgs(
+                query, args, kwargs, input_language=input_language
+            ),
+            cache=client._get_query_cache(),
+            query_options=query_options,
+            retry_options=client._get_retry_options(),
+            state=client._get_state(),
+            warning_handler=client._get_warning_handler(),
+            annotations=client._get_annotations(),
+            query_timeout=client._get_query_timeout(),
+            lazy_objects=client._get_lazy_objects(),
+        ))
+
+    def _add_execute(
+        self,
+        commands: str,
+        args,
+        kwargs,
+        input_language: protocol.InputLanguage = protocol.InputLanguage.EDGEQL,
+    ) -> None:
+        client = self._client
+        self._contexts.append(abstract.ExecuteContext(
+            query=abstract.QueryWithArgs(
+                commands, args, kwargs, input_language=input_language
+            ),
+            cache=client._get_query_cache(),
+            retry_options=client._get_retry_options(),
+            state=client._get_state(),
+            warning_handler=client._get_warning_handler(),
+            annotations=client._get_annotations(),
+            query_timeout=client._get_query_timeout(),
+        ))
+
+    def query(self, query: str, *args, **kwargs) -> None:
+        self._add_query(query, args, kwargs, abstract._query_opts)
+
+    def query_single(self, query: str, *args, **kwargs) -> None:
+        self._add_query(query, args, kwargs, abstract._query_single_opts)
+
+    def query_required_single(self, query: str, *args, **kwargs) -> None:
+        self._add_query(
+            query, args, kwargs, abstract._query_required_single_opts
+        )
+
+    def query_json(self, query: str, *args, **kwargs) -> None:
+        self._add_query(query, args, kwargs, abstract._query_json_opts)
+
+    def query_single_json(self, query: str, *args, **kwargs) -> None:
+        self._add_query(
+            query, args, kwargs, abstract._query_single_json_opts
+        )
+
+    def query_required_single_json(
+        self, query: str, *args, **kwargs
+    ) -> None:
+        self._add_query(
+            query, args, kwargs, abstract._query_required_single_json_opts
+        )
+
+    def query_sql(self, query: str, *args, **kwargs) -> None:
+        self._add_query(
+            query,
+            args,
+            kwargs,
+            abstract._query_opts,
+            input_language=protocol.InputLanguage.SQL,
+        )
+
+    def execute(self, commands: str, *args, **kwargs) -> None:
+        self._add_execute(commands, args, kwargs)
+
+    def execute_sql(self, commands: str, *args, **kwargs) -> None:
+        self._add_execute(
+            commands, args, kwargs, input_language=protocol.InputLanguage.SQL
+        )
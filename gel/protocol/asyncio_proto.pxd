@@ -17,6 +17,8 @@
 #
 
 
+from libc.stdint cimport uint64_t
+
 from . cimport protocol
 
 from gel.pgproto.debug cimport PG_DEBUG
@@ -32,3 +34,8 @@ cdef class AsyncIOProtocol(protocol.SansIOProtocolBackwardsCompatible):
 
         object loop
         object msg_waiter
+        readonly bint reading_paused
+
+        object drain_waiter
+        bint writing_paused
+        readonly uint64_t drain_waits
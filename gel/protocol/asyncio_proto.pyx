@@ -28,6 +28,12 @@ from gel.pgproto.pgproto cimport (
 from . cimport protocol
 
 
+# Stop reading from the transport once this many bytes are buffered
+# and not yet consumed, e.g. when rows are streamed with query_iter()
+# faster than they are processed.
+DEF READ_BUFFER_HIGH_WATER = 1 << 20
+
+
 cdef class AsyncIOProtocol(protocol.SansIOProtocolBackwardsCompatible):
 
     def __init__(self, con_params, loop):
@@ -39,6 +45,11 @@ cdef class AsyncIOProtocol(protocol.SansIOProtocolBackwardsCompatible):
         self.disconnected_fut = None
 
         self.msg_waiter = None
+        self.reading_paused = False
+
+        self.drain_waiter = None
+        self.writing_paused = False
+        self.drain_waits = 0
 
     cpdef abort(self):
         self.connected = False
@@ -51,11 +62,26 @@ cdef class AsyncIOProtocol(protocol.SansIOProtocolBackwardsCompatible):
         if self.transport is None:
             raise errors.ClientConnectionFailedTemporarilyError()
         self.transport.write(memoryview(buf))
+        self.bytes_sent += buf.len()
+
+    cdef maybe_resume_reading(self):
+        if (
+            self.reading_paused
+            and self.buffer.len() < READ_BUFFER_HIGH_WATER
+        ):
+            self.reading_paused = False
+            if self.transport is not None:
+                self.transport.resume_reading()
 
     async def wait_for_message(self):
         if self.buffer.take_message():
             return
 
+        if self.reading_paused:
+            self.reading_paused = False
+            if self.transport is not None:
+                self.transport.resume_reading()
+
         try:
             self.msg_waiter = self.loop.create_future()
             await self.msg_waiter
@@ -74,6 +100,31 @@ cdef class AsyncIOProtocol(protocol.SansIOProtocolBackwardsCompatible):
     async def try_recv_eagerly(self):
         pass
 
+    async def drain(self):
+        if not self.writing_paused:
+            return
+        if self.transport is None:
+            raise errors.ClientConnectionClosedError()
+
+        # The server may in turn be blocked on sending us the replies
+        # to what we have written, so don't keep them unread.
+        if self.reading_paused:
+            self.reading_paused = False
+            self.transport.resume_reading()
+
+        self.drain_waits += 1
+        try:
+            self.drain_waiter = self.loop.create_future()
+            await self.drain_waiter
+        except asyncio.CancelledError:
+            # Part of a message might have been written already, the
+            # connection cannot be used anymore.
+            try:
+                self.cancelled = True
+                self.abort()
+            finally:
+                raise
+
     async def wait_for_connect(self):
         if self.connected_fut is not None:
             await self.connected_fut
@@ -113,6 +164,11 @@ cdef class AsyncIOProtocol(protocol.SansIOProtocolBackwardsCompatible):
             self.msg_waiter.set_exception(errors.ClientConnectionClosedError())
             self.msg_waiter = None
 
+        if self.drain_waiter is not None and not self.drain_waiter.done():
+            self.drain_waiter.set_exception(
+                errors.ClientConnectionClosedError())
+            self.drain_waiter = None
+
         if self.transport is not None:
             # With asyncio sslproto on CPython 3.10 or lower, a normal exit
             # (connection closed by peer) cannot set the transport._closed
@@ -123,12 +179,16 @@ cdef class AsyncIOProtocol(protocol.SansIOProtocolBackwardsCompatible):
             self.transport = None
 
     def pause_writing(self):
-        pass
+        self.writing_paused = True
 
     def resume_writing(self):
-        pass
+        self.writing_paused = False
+        if self.drain_waiter is not None and not self.drain_waiter.done():
+            self.drain_waiter.set_result(True)
+            self.drain_waiter = None
 
     def data_received(self, data):
+        self.bytes_received += len(data)
         self.buffer.feed_data(data)
 
         if (self.msg_waiter is not None and
@@ -137,5 +197,16 @@ cdef class AsyncIOProtocol(protocol.SansIOProtocolBackwardsCompatible):
             self.msg_waiter.set_result(True)
             self.msg_waiter = None
 
+        # Only pause if there is a complete message to process: the
+        # reading is resumed by the next wait_for_message() call, or
+        # when ReadyForCommand is processed.
+        if (
+            not self.reading_paused
+            and self.buffer.len() >= READ_BUFFER_HIGH_WATER
+            and self.buffer.take_message()
+        ):
+            self.reading_paused = True
+            self.transport.pause_reading()
+
     def eof_received(self):
         pass
@@ -30,3 +30,4 @@ cdef class BlockingIOProtocol(protocol.SansIOProtocolBackwardsCompatible):
         readonly object last_active_timestamp
 
     cdef _disconnect(self)
+    cdef _recv_data(self)
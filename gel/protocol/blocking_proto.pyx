@@ -53,9 +53,17 @@ cdef class BlockingIOProtocol(protocol.SansIOProtocolBackwardsCompatible):
                 pass
             sock.close()
 
+    cdef _recv_data(self):
+        data = self.sock.recv(RECV_BUF)
+        if not data:
+            self._disconnect()
+            raise errors.ClientConnectionClosedError()
+        self.bytes_received += len(data)
+        self.buffer.feed_data(data)
+
     cdef write(self, WriteBuffer buf):
         try:
-            self.sock.send(buf)
+            self.bytes_sent += self.sock.send(buf)
         except OSError as e:
             self._disconnect()
             raise con_utils.wrap_error(e) from e
@@ -70,25 +78,17 @@ cdef class BlockingIOProtocol(protocol.SansIOProtocolBackwardsCompatible):
                     raise TimeoutError
                 try:
                     self.sock.settimeout(timeout)
-                    data = self.sock.recv(RECV_BUF)
+                    self._recv_data()
                 except OSError as e:
                     self._disconnect()
                     raise con_utils.wrap_error(e) from e
-                if not data:
-                    self._disconnect()
-                    raise errors.ClientConnectionClosedError()
-                self.buffer.feed_data(data)
         else:
             while not self.buffer.take_message():
                 try:
-                    data = self.sock.recv(RECV_BUF)
+                    self._recv_data()
                 except OSError as e:
                     self._disconnect()
                     raise con_utils.wrap_error(e) from e
-                if not data:
-                    self._disconnect()
-                    raise errors.ClientConnectionClosedError()
-                self.buffer.feed_data(data)
         self.last_active_timestamp = time.monotonic()
 
     async def try_recv_eagerly(self):
@@ -98,11 +98,7 @@ cdef class BlockingIOProtocol(protocol.SansIOProtocolBackwardsCompatible):
         self.sock.settimeout(0)  # Make non-blocking.
         try:
             while not self.buffer.take_message():
-                data = self.sock.recv(RECV_BUF)
-                if not data:
-                    self._disconnect()
-                    raise errors.ClientConnectionClosedError()
-                self.buffer.feed_data(data)
+                self._recv_data()
         except BlockingIOError:
             # No data in the socket net buffer.
             return
@@ -114,6 +110,10 @@ cdef class BlockingIOProtocol(protocol.SansIOProtocolBackwardsCompatible):
         finally:
             self.sock.settimeout(None)
 
+    async def drain(self):
+        # Writes block until the data is sent.
+        pass
+
     async def wait_for_connect(self):
         return True
 
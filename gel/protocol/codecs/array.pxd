@@ -22,6 +22,7 @@ cdef class BaseArrayCodec(BaseCodec):
     cdef:
         BaseCodec sub_codec
         int32_t cardinality
+        DecodeStep elem_step
 
     cdef _decode_array(self, FRBuffer *buf)
 
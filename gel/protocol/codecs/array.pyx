@@ -93,7 +93,7 @@ cdef class BaseArrayCodec(BaseCodec):
             object result
             Py_ssize_t i
             int32_t elem_len
-            FRBuffer elem_buf
+            DecodeStep *step = &self.elem_step
 
         frb_read(buf, 4)  # ignore flags
         frb_read(buf, 4)  # reserved
@@ -115,18 +115,16 @@ cdef class BaseArrayCodec(BaseCodec):
 
         frb_read(buf, 4)  # Ignore the lower bound information
 
+        if step.kind == DECODE_UNSET:
+            init_decode_step(step, self.sub_codec)
+
         result = cpython.PyList_New(elem_count)
         for i in range(elem_count):
             elem_len = hton.unpack_int32(frb_read(buf, 4))
             if elem_len == -1:
                 elem = None
             else:
-                frb_slice_from(&elem_buf, buf, elem_len)
-                elem = self.sub_codec.decode(&elem_buf)
-                if frb_get_len(&elem_buf):
-                    raise RuntimeError(
-                        f'unexpected trailing data in buffer after '
-                        f'array element decoding: {frb_get_len(&elem_buf)}')
+                elem = decode_element(step, buf, elem_len, 'array')
 
             cpython.Py_INCREF(elem)
             cpython.PyList_SET_ITEM(result, i, elem)
@@ -17,6 +17,15 @@
 #
 
 
+ctypedef struct DecodeStep:
+    # How a single element of a record or an array is decoded,
+    # see init_decode_step().
+    int kind
+    pgproto.decode_func decoder
+    # Borrowed, the codec is kept alive by whoever owns the step.
+    cpython.PyObject *codec
+
+
 cdef class BaseCodec:
 
     cdef:
@@ -52,8 +61,10 @@ cdef class BaseRecordCodec(BaseCodec):
     cdef:
         tuple fields_codecs
         uint64_t encoder_flags
+        DecodeStep *decode_plan
 
     cdef _check_encoder(self)
+    cdef DecodeStep *_get_decode_plan(self) except NULL
 
 
 cdef class EmptyTupleCodec(BaseCodec):
@@ -25,6 +25,17 @@ from collections.abc import Mapping as MappingABC
 cdef uint64_t RECORD_ENCODER_CHECKED = 1 << 0
 cdef uint64_t RECORD_ENCODER_INVALID = 1 << 1
 
+# Kinds of DecodeStep
+DEF DECODE_UNSET = 0
+DEF DECODE_CODEC = 1
+DEF DECODE_SCALAR = 2
+DEF DECODE_INT16 = 3
+DEF DECODE_INT32 = 4
+DEF DECODE_INT64 = 5
+DEF DECODE_FLOAT32 = 6
+DEF DECODE_FLOAT64 = 7
+DEF DECODE_BOOL = 8
+
 cdef bytes NULL_CODEC_ID = b'\x00' * 16
 cdef bytes EMPTY_TUPLE_CODEC_ID = TYPE_IDS.get('empty-tuple').bytes
 
@@ -144,6 +155,28 @@ cdef class BaseRecordCodec(BaseCodec):
     def __cinit__(self):
         self.fields_codecs = ()
         self.encoder_flags = 0
+        self.decode_plan = NULL
+
+    def __dealloc__(self):
+        PyMem_Free(self.decode_plan)
+        self.decode_plan = NULL
+
+    cdef DecodeStep *_get_decode_plan(self) except NULL:
+        # Built on first use, as the codec is fully initialized only
+        # after the constructor returns.
+        cdef:
+            Py_ssize_t i
+            Py_ssize_t count = len(self.fields_codecs)
+
+        if self.decode_plan is NULL:
+            self.decode_plan = <DecodeStep *>PyMem_Malloc(
+                sizeof(DecodeStep) * max(count, 1))
+            if self.decode_plan is NULL:
+                raise MemoryError
+            for i in range(count):
+                init_decode_step(
+                    &self.decode_plan[i], <BaseCodec>self.fields_codecs[i])
+        return self.decode_plan
 
     cdef _check_encoder(self):
         if not (self.encoder_flags & RECORD_ENCODER_CHECKED):
@@ -322,3 +355,76 @@ cdef class EdegDBCodecContext(pgproto.CodecContext):
 
 
 cdef EdegDBCodecContext DEFAULT_CODEC_CONTEXT = EdegDBCodecContext()
+
+
+cdef init_decode_step(DecodeStep *step, BaseCodec codec):
+    cdef pgproto.decode_func decoder
+
+    step.codec = <cpython.PyObject *>codec
+    step.decoder = NULL
+    if type(codec) is not ScalarCodec:
+        step.kind = DECODE_CODEC
+        return
+
+    decoder = (<ScalarCodec>codec).c_decoder
+    step.decoder = decoder
+    if decoder == <pgproto.decode_func>pgproto.int8_decode:
+        step.kind = DECODE_INT64
+    elif decoder == <pgproto.decode_func>pgproto.int4_decode:
+        step.kind = DECODE_INT32
+    elif decoder == <pgproto.decode_func>pgproto.int2_decode:
+        step.kind = DECODE_INT16
+    elif decoder == <pgproto.decode_func>pgproto.float8_decode:
+        step.kind = DECODE_FLOAT64
+    elif decoder == <pgproto.decode_func>pgproto.float4_decode:
+        step.kind = DECODE_FLOAT32
+    elif decoder == <pgproto.decode_func>pgproto.bool_decode:
+        step.kind = DECODE_BOOL
+    else:
+        step.kind = DECODE_SCALAR
+
+
+cdef inline object decode_element(
+    DecodeStep *step, FRBuffer *buf, int32_t elem_len, str container
+):
+    # Decodes the next elem_len bytes of buf, which must not be -1.
+    # Fixed-width values of the expected size are unpacked in place,
+    # anything else gets a buffer slice that has to be fully consumed.
+    cdef:
+        int kind = step.kind
+        FRBuffer elem_buf
+
+    if kind == DECODE_INT64:
+        if elem_len == 8:
+            return cpython.PyLong_FromLongLong(
+                hton.unpack_int64(frb_read(buf, 8)))
+    elif kind == DECODE_FLOAT64:
+        if elem_len == 8:
+            return cpython.PyFloat_FromDouble(
+                hton.unpack_double(frb_read(buf, 8)))
+    elif kind == DECODE_INT32:
+        if elem_len == 4:
+            return cpython.PyLong_FromLong(
+                hton.unpack_int32(frb_read(buf, 4)))
+    elif kind == DECODE_FLOAT32:
+        if elem_len == 4:
+            return cpython.PyFloat_FromDouble(
+                hton.unpack_float(frb_read(buf, 4)))
+    elif kind == DECODE_INT16:
+        if elem_len == 2:
+            return cpython.PyLong_FromLong(
+                hton.unpack_int16(frb_read(buf, 2)))
+    elif kind == DECODE_BOOL:
+        if elem_len == 1:
+            return frb_read(buf, 1)[0] == 1
+
+    frb_slice_from(&elem_buf, buf, elem_len)
+    if kind == DECODE_CODEC:
+        elem = (<BaseCodec>step.codec).decode(&elem_buf)
+    else:
+        elem = step.decoder(DEFAULT_CODEC_CONTEXT, &elem_buf)
+    if frb_get_len(&elem_buf):
+        raise RuntimeError(
+            f'unexpected trailing data in buffer after '
+            f'{container} element decoding: {frb_get_len(&elem_buf)}')
+    return elem
@@ -27,6 +27,7 @@ from gel.datatypes import datatypes
 
 from libc.string cimport memcpy
 from cpython.bytes cimport PyBytes_FromStringAndSize
+from cpython.mem cimport PyMem_Malloc, PyMem_Calloc, PyMem_Free
 
 include "./edb_types.pxi"
 
@@ -62,6 +63,7 @@ DEF CTYPE_ANNO_TYPENAME = 255
 DEF _CODECS_BUILD_CACHE_SIZE = 200
 
 DEF NBASE = 10000
+DEF NBASE_SQUARED = 100000000
 DEF NUMERIC_POS = 0x0000
 DEF NUMERIC_NEG = 0x4000
 
@@ -511,24 +513,26 @@ cdef class CodecsRegistry:
         return res
 
     cdef has_codec(self, bytes type_id):
-        return (
+        if (
             type_id in self.codecs or
             type_id in {NULL_CODEC_ID, EMPTY_TUPLE_CODEC_ID}
-        )
+        ):
+            return True
+        # The caller is going to build the codec instead.
+        self.codecs.misses += 1
+        return False
 
     cdef BaseCodec get_codec(self, bytes type_id):
-        try:
-            return <BaseCodec>self.codecs[type_id]
-        except KeyError:
-            pass
-
         if type_id == NULL_CODEC_ID:
             return NULL_CODEC
 
         if type_id == EMPTY_TUPLE_CODEC_ID:
             return EMPTY_TUPLE_CODEC
 
-        raise LookupError
+        try:
+            return <BaseCodec>self.codecs[type_id]
+        except KeyError:
+            raise LookupError from None
 
     cdef BaseCodec build_codec(self, bytes spec, protocol_version):
         cdef:
@@ -740,11 +744,25 @@ cdef config_memory_decode(pgproto.CodecContext settings, FRBuffer *buf):
 DEF PGVECTOR_MAX_DIM = (1 << 16) - 1
 
 
+cdef inline void _unpack_float32s(float *dst, const char *src, Py_ssize_t n):
+    # Converts `n` big-endian floats in a single pass.  The loop has no
+    # dependencies between iterations, so the C compiler can turn the
+    # byte swaps into vector shuffles.  unpack_float() goes through
+    # a union, so the float data is never written through an int pointer.
+    cdef Py_ssize_t i
+
+    for i in range(n):
+        dst[i] = hton.unpack_float(src + i * 4)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
 cdef pgvector_encode_memview(pgproto.CodecContext settings, WriteBuffer buf,
                              float[:] obj):
     cdef:
         Py_ssize_t objlen
         Py_ssize_t i
+        char *data
 
     objlen = len(obj)
     if objlen > PGVECTOR_MAX_DIM:
@@ -753,8 +771,20 @@ cdef pgvector_encode_memview(pgproto.CodecContext settings, WriteBuffer buf,
     buf.write_int32(4 + objlen*4)
     buf.write_int16(objlen)
     buf.write_int16(0)
-    for i in range(objlen):
-        buf.write_float(obj[i])
+    if not objlen:
+        return
+
+    # Convert into a scratch buffer and write it out in one go rather
+    # than growing the output buffer one float at a time.
+    data = <char *>PyMem_Malloc(objlen * 4)
+    if data == NULL:
+        raise MemoryError
+    try:
+        for i in range(objlen):
+            hton.pack_float(data + i * 4, obj[i])
+        buf.write_cstr(data, objlen * 4)
+    finally:
+        PyMem_Free(data)
 
 
 cdef pgvector_encode(pgproto.CodecContext settings, WriteBuffer buf,
@@ -795,31 +825,19 @@ cdef pgvector_encode(pgproto.CodecContext settings, WriteBuffer buf,
         buf.write_float(obj[i])
 
 
-cdef object ONE_EL_F32_ARRAY = array.array('f', [0.0])
+cdef array.array F32_ARRAY_TEMPLATE = array.array('f')
 
 
 cdef pgvector_decode(pgproto.CodecContext settings, FRBuffer *buf):
     cdef:
         int32_t dim
-        Py_ssize_t size
-        Py_buffer view
-        char *p
-        float[:] array_view
+        array.array val
 
     dim = hton.unpack_uint16(frb_read(buf, 2))
     frb_read(buf, 2)
 
-    size = dim * 4
-    p = frb_read(buf, size)
-
-    # Create a float array with size dim
-    val = ONE_EL_F32_ARRAY * dim
-
-    # And fill it with the buffer contents
-    array_view = val
-    memcpy(&array_view[0], p, size)
-    val.byteswap()
-
+    val = array.clone(F32_ARRAY_TEMPLATE, dim, zero=False)
+    _unpack_float32s(val.data.as_floats, frb_read(buf, dim * 4), dim)
     return val
 
 
@@ -934,13 +952,72 @@ cdef generate_tables():
 generate_tables()
 
 
+cdef inline bint _float_to_half(float f, uint16_t *out):
+    # Returns False if the value is out of range for a half-float.
+    cdef IntFloatSwap swap
+
+    swap.f = f
+    swap.i = (
+        BASE_TABLE[(swap.i >> 23) & 0x1ff]
+        + ((swap.i & 0x007fffff) >> SHIFT_TABLE[(swap.i >> 23) & 0x1ff])
+    )
+
+    if swap.i == BASE_TABLE[255] or swap.i == BASE_TABLE[511]:
+        return False
+
+    out[0] = <uint16_t>swap.i
+    return True
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef pgvector_hv_encode_memview(pgproto.CodecContext settings,
+                                WriteBuffer buf, float[:] obj):
+    cdef:
+        Py_ssize_t objlen
+        Py_ssize_t i
+        uint16_t h = 0
+        char *data
+
+    objlen = len(obj)
+    if objlen > PGVECTOR_MAX_DIM:
+        raise ValueError('too many elements in vector value')
+
+    data = <char *>PyMem_Malloc(objlen * 2)
+    if data == NULL:
+        raise MemoryError
+    try:
+        for i in range(objlen):
+            if not _float_to_half(obj[i], &h):
+                raise ValueError(
+                    '{!r} is out of range for type halfvec'.format(obj[i]))
+            hton.pack_int16(data + i * 2, <int16_t>h)
+
+        buf.write_int32(4 + objlen * 2)
+        buf.write_int16(objlen)
+        buf.write_int16(0)
+        buf.write_cstr(data, objlen * 2)
+    finally:
+        PyMem_Free(data)
+
+
 cdef pgvector_hv_encode(pgproto.CodecContext settings, WriteBuffer buf,
                         object obj):
     cdef:
         Py_ssize_t objlen
         float[:] memview
         Py_ssize_t i
-        IntFloatSwap swap
+        uint16_t h = 0
+
+    # Same as for vector values: consume array.array and numpy.ndarray
+    # through a typed memview without unboxing every element.
+    try:
+        memview = obj
+    except (ValueError, TypeError) as e:
+        pass
+    else:
+        pgvector_hv_encode_memview(settings, buf, memview)
+        return
 
     if not _is_array_iterable(obj):
         raise TypeError(
@@ -955,58 +1032,36 @@ cdef pgvector_hv_encode(pgproto.CodecContext settings, WriteBuffer buf,
     buf.write_int16(objlen)
     buf.write_int16(0)
     for i in range(objlen):
-        swap.f = obj[i]
-        swap.i = (
-            BASE_TABLE[(swap.i >> 23) & 0x1ff]
-            + ((swap.i & 0x007fffff) >> SHIFT_TABLE[(swap.i >> 23) & 0x1ff])
-        )
-
-        if swap.i == BASE_TABLE[255] or swap.i == BASE_TABLE[511]:
+        if not _float_to_half(obj[i], &h):
             raise ValueError(
                 '{!r} is out of range for type halfvec'.format(obj[i]))
-
-        buf.write_int16(swap.i)
-
-
-cdef object ONE_EL16_ARRAY = array.array('H', [0])
+        buf.write_int16(<int16_t>h)
 
 
 cdef pgvector_hv_decode(pgproto.CodecContext settings, FRBuffer *buf):
     cdef:
         int32_t dim
-        Py_ssize_t size
-        Py_buffer view
-        char *p
-        unsigned short[:] tmp_array_view
-        float[:] array_view
+        const char *p
+        float *out
+        array.array val
         Py_ssize_t i
+        uint32_t h
         IntFloatSwap swap
 
     dim = hton.unpack_uint16(frb_read(buf, 2))
     frb_read(buf, 2)
 
-    # We'll read float16 values as an array of uint16 and then convert since
-    # plain vanilla Python doesn't have half-floats.
-    #
-    # TODO: Potentially we might handle it differently if numpy is present since
-    # numpy has half floats since 1.60.
-    size = dim * 2
-    p = frb_read(buf, size)
-    tmp = ONE_EL16_ARRAY * dim
-
-    # And fill it with the buffer contents
-    tmp_array_view = tmp
-    memcpy(&tmp_array_view[0], p, size)
-    tmp.byteswap()
-
-    # Create a float array with size dim
-    val = ONE_EL_F32_ARRAY * dim
+    # Plain vanilla Python doesn't have half-floats, so the values are
+    # widened to float32 straight from the wire.
+    p = frb_read(buf, dim * 2)
+    val = array.clone(F32_ARRAY_TEMPLATE, dim, zero=False)
+    out = val.data.as_floats
     for i in range(dim):
-        swap.i = tmp[i]
+        h = hton.unpack_uint16(p + i * 2)
         swap.i = MANTISSA_TABLE[
-            OFFSET_TABLE[swap.i >> 10] + (swap.i & 0x000003ff)
-        ] + EXP_TABLE[swap.i >> 10]
-        val[i] = swap.f
+            OFFSET_TABLE[h >> 10] + (h & 0x000003ff)
+        ] + EXP_TABLE[h >> 10]
+        out[i] = swap.f
 
     return val
 
@@ -1056,9 +1111,7 @@ cdef pgvector_sv_decode(pgproto.CodecContext settings, FRBuffer *buf):
     cdef:
         int32_t dim
         int32_t nnz
-        Py_ssize_t size
-        char *p
-        float[:] array_view
+        array.array vals
         Py_ssize_t i
 
     dim = hton.unpack_int32(frb_read(buf, 4))
@@ -1070,16 +1123,9 @@ cdef pgvector_sv_decode(pgproto.CodecContext settings, FRBuffer *buf):
     for i in range(nnz):
         keys[i] = hton.unpack_int32(frb_read(buf, 4))
 
-    size = nnz * 4
-    p = frb_read(buf, size)
-
     # Create a float array with size nnz (for values)
-    vals = ONE_EL_F32_ARRAY * nnz
-
-    # And fill it with the buffer contents
-    array_view = vals
-    memcpy(&array_view[0], p, size)
-    vals.byteswap()
+    vals = array.clone(F32_ARRAY_TEMPLATE, nnz, zero=False)
+    _unpack_float32s(vals.data.as_floats, frb_read(buf, nnz * 4), nnz)
 
     res = {'dim': dim}
     res.update(zip(keys, vals))
@@ -1118,36 +1164,170 @@ cdef checked_int8_encode(pgproto.CodecContext settings, WriteBuffer buf, obj):
     pgproto.int8_encode(settings, buf, obj)
 
 
+cdef _write_bigint(
+    WriteBuffer buf, uint16_t sign, const uint16_t *digits, ssize_t ndigits
+):
+    # `digits` are the base 10000 digits, least significant first.
+    cdef ssize_t i
+
+    if ndigits > 0x7fff:
+        raise ValueError('bigint value is too large')
+
+    buf.write_int32(8 + <int32_t>ndigits * 2)  # len
+    buf.write_int16(<int16_t>ndigits)  # ndigits
+    buf.write_int16(<int16_t>ndigits - 1 if ndigits else 0)  # weight
+    buf.write_int16(<int16_t>sign)  # sign
+    buf.write_int16(0)  # dscale
+    for i in range(ndigits - 1, -1, -1):
+        buf.write_int16(<int16_t>digits[i])
+
+
+@cython.cdivision(True)
+cdef uint16_t *_bigint_to_digits(obj, ssize_t *ndigits_out) except NULL:
+    # Converts a non-negative int to base 10000 digits, least
+    # significant first, by long division of its 32-bit words.
+    cdef:
+        ssize_t nbytes = (obj.bit_length() + 7) >> 3
+        ssize_t nwords = (nbytes + 3) >> 2
+        # A 32-bit word holds less than 2.5 base 10000 digits.
+        ssize_t max_digits = nwords * 5 // 2 + 2
+        ssize_t ndigits = 0
+        ssize_t i
+        bytes data = obj.to_bytes(nbytes, 'little')
+        const uint8_t *p = <const uint8_t *>cpython.PyBytes_AS_STRING(data)
+        uint32_t *words
+        uint16_t *digits
+        uint64_t cur
+        uint64_t rem
+
+    words = <uint32_t *>PyMem_Calloc(nwords, sizeof(uint32_t))
+    if words == NULL:
+        raise MemoryError
+    digits = <uint16_t *>PyMem_Malloc(max_digits * sizeof(uint16_t))
+    if digits == NULL:
+        PyMem_Free(words)
+        raise MemoryError
+
+    for i in range(nbytes):
+        words[i >> 2] |= (<uint32_t>p[i]) << ((i & 3) << 3)
+
+    while nwords:
+        # Two digits per pass: the remainder of a division by 10000**2
+        # shifted by 32 bits still fits into 64 bits.
+        rem = 0
+        for i in range(nwords - 1, -1, -1):
+            cur = (rem << 32) | words[i]
+            words[i] = <uint32_t>(cur // NBASE_SQUARED)
+            rem = cur % NBASE_SQUARED
+        digits[ndigits] = <uint16_t>(rem % NBASE)
+        digits[ndigits + 1] = <uint16_t>(rem // NBASE)
+        ndigits += 2
+        while nwords and words[nwords - 1] == 0:
+            nwords -= 1
+
+    while ndigits and digits[ndigits - 1] == 0:
+        ndigits -= 1
+
+    PyMem_Free(words)
+    ndigits_out[0] = ndigits
+    return digits
+
+
+@cython.cdivision(True)
 cdef bigint_encode(pgproto.CodecContext settings, WriteBuffer buf, obj):
     cdef:
         uint16_t sign = NUMERIC_POS
-        list digits = []
+        uint64_t value
+        # 2**64 has 5 base 10000 digits.
+        uint16_t small_digits[5]
+        uint16_t *digits
+        ssize_t ndigits = 0
 
     ensure_is_int(obj)
 
-    if obj == 0:
-        buf.write_int32(8)  # len
-        buf.write_int32(0)  # ndigits + weight
-        buf.write_int16(NUMERIC_POS)  # sign
-        buf.write_int16(0)  # dscale
-        return
-
     if obj < 0:
         sign = NUMERIC_NEG
         obj = -obj
 
-    while obj:
-        mod = obj % NBASE
-        obj //= NBASE
-        digits.append(mod)
+    try:
+        value = obj
+    except OverflowError:
+        digits = _bigint_to_digits(obj, &ndigits)
+        try:
+            _write_bigint(buf, sign, digits, ndigits)
+        finally:
+            PyMem_Free(digits)
+    else:
+        while value:
+            small_digits[ndigits] = <uint16_t>(value % NBASE)
+            value //= NBASE
+            ndigits += 1
+        _write_bigint(
+            buf, sign if ndigits else NUMERIC_POS, small_digits, ndigits)
 
-    buf.write_int32(8 + len(digits) * 2)  # len
-    buf.write_int16(len(digits))  # ndigits
-    buf.write_int16(len(digits) - 1)  # weight
-    buf.write_int16(sign)  # sign
-    buf.write_int16(0)  # dscale
-    for dig in reversed(digits):
-        buf.write_int16(dig)
+
+cdef inline uint16_t _bigint_digit(
+    const char *data, ssize_t ndigits, ssize_t i
+):
+    # Digits past the last one sent are trailing zeros.
+    if i < ndigits:
+        return <uint16_t>hton.unpack_int16(data + i * 2)
+    return 0
+
+
+cdef object _bigint_from_digits(const char *data, ssize_t ndigits,
+                                ssize_t weight):
+    # Converts base 10000 digits, most significant first, to an int
+    # with Horner's scheme on 32-bit words, two digits at a time.
+    cdef:
+        ssize_t total = weight + 1
+        # A base 10000 digit takes less than 27/64 of a 32-bit word.
+        ssize_t max_words = total * 27 // 64 + 2
+        ssize_t nwords = 0
+        ssize_t i = 0
+        ssize_t j
+        uint32_t *words
+        uint64_t mul
+        uint64_t carry
+        uint64_t cur
+        uint8_t *p
+
+    words = <uint32_t *>PyMem_Malloc(max_words * sizeof(uint32_t))
+    if words == NULL:
+        raise MemoryError
+
+    try:
+        while i < total:
+            if i + 1 < total:
+                mul = NBASE_SQUARED
+                carry = (
+                    <uint64_t>_bigint_digit(data, ndigits, i) * NBASE
+                    + _bigint_digit(data, ndigits, i + 1)
+                )
+                i += 2
+            else:
+                mul = NBASE
+                carry = _bigint_digit(data, ndigits, i)
+                i += 1
+            for j in range(nwords):
+                cur = <uint64_t>words[j] * mul + carry
+                words[j] = <uint32_t>cur
+                carry = cur >> 32
+            if carry:
+                words[nwords] = <uint32_t>carry
+                nwords += 1
+
+        result = cpython.PyBytes_FromStringAndSize(NULL, nwords * 4)
+        p = <uint8_t *>cpython.PyBytes_AS_STRING(result)
+        for j in range(nwords):
+            p[j * 4] = <uint8_t>words[j]
+            p[j * 4 + 1] = <uint8_t>(words[j] >> 8)
+            p[j * 4 + 2] = <uint8_t>(words[j] >> 16)
+            p[j * 4 + 3] = <uint8_t>(words[j] >> 24)
+    finally:
+        PyMem_Free(words)
+
+    return int.from_bytes(result, 'little')
 
 
 cdef bigint_decode(pgproto.CodecContext settings, FRBuffer *buf):
@@ -1156,31 +1336,39 @@ cdef bigint_decode(pgproto.CodecContext settings, FRBuffer *buf):
         uint16_t weight = <uint16_t>hton.unpack_int16(frb_read(buf, 2))
         uint16_t sign = <uint16_t>hton.unpack_int16(frb_read(buf, 2))
         uint16_t dscale = <uint16_t>hton.unpack_int16(frb_read(buf, 2))
-        result = ''
-        int32_t i = <int32_t>weight
-        uint16_t d = 0
+        const char *data
+        uint64_t value = 0
+        ssize_t i
 
-    if sign == NUMERIC_NEG:
-        result = '-'
-    elif sign != NUMERIC_POS:
+    if sign != NUMERIC_NEG and sign != NUMERIC_POS:
         raise ValueError("bad bigint sign data")
 
-    if dscale != 0:
+    if dscale != 0 or ndigits > <uint32_t>weight + 1:
         raise ValueError("bigint data has fractional part")
 
     if ndigits == 0:
         return 0
 
-    while i >= 0:
-        if i <= weight and d < ndigits:
-            num = str(<uint16_t>hton.unpack_int16(frb_read(buf, 2)))
-            result += num.zfill(4)
-            d += 1
-        else:
-            result += '0000'
-        i -= 1
+    data = frb_read(buf, ndigits * 2)
+    if weight < 4:
+        # At most 4 digits, which fit into 64 bits.
+        for i in range(weight + 1):
+            value = value * NBASE + _bigint_digit(data, ndigits, i)
+        if sign == NUMERIC_NEG:
+            return -<int64_t>value
+        return value
+
+    result = _bigint_from_digits(data, ndigits, weight)
+    if sign == NUMERIC_NEG:
+        return -result
+    return result
+
 
-    return int(result)
+# Geometry values are named tuples with the (E)WKB encoded value as their
+# only field.  They all share one type: creating a type per value is slow
+# and leaves a heap type behind for the GC to collect with every value.
+cdef object GEOMETRY_TYPE = datatypes.namedtuple_type_new(
+    datatypes.record_desc_new(('wkb',), <object>NULL, <object>NULL))
 
 
 cdef geometry_encode(pgproto.CodecContext settings, WriteBuffer buf, obj):
@@ -1194,10 +1382,7 @@ cdef geometry_decode(pgproto.CodecContext settings, FRBuffer *buf):
         ssize_t buf_len
 
     # Just wrap the bytes into a named tuple with a single field `wkb`
-    descriptor = datatypes.record_desc_new(
-        ('wkb',), <object>NULL, <object>NULL)
-    result = datatypes.namedtuple_new(
-        datatypes.namedtuple_type_new(descriptor))
+    result = datatypes.namedtuple_new(GEOMETRY_TYPE)
 
     # frb_read_all adjusts buf.len, so we need to read it out first
     buf_len = buf.len
@@ -26,8 +26,7 @@ cdef class NamedTupleCodec(BaseNamedRecordCodec):
             Py_ssize_t elem_count
             Py_ssize_t i
             int32_t elem_len
-            BaseCodec elem_codec
-            FRBuffer elem_buf
+            DecodeStep *plan = self._get_decode_plan()
             tuple fields_codecs = (<BaseRecordCodec>self).fields_codecs
 
         elem_count = <Py_ssize_t><uint32_t>hton.unpack_int32(frb_read(buf, 4))
@@ -40,19 +39,13 @@ cdef class NamedTupleCodec(BaseNamedRecordCodec):
         result = datatypes.namedtuple_new(self.namedtuple_type)
 
         for i in range(elem_count):
-            frb_read(buf, 4)  # reserved
-            elem_len = hton.unpack_int32(frb_read(buf, 4))
+            # 4 reserved bytes followed by the element length
+            elem_len = hton.unpack_int32(frb_read(buf, 8) + 4)
 
             if elem_len == -1:
                 elem = None
             else:
-                elem_codec = <BaseCodec>fields_codecs[i]
-                elem = elem_codec.decode(
-                    frb_slice_from(&elem_buf, buf, elem_len))
-                if frb_get_len(&elem_buf):
-                    raise RuntimeError(
-                        f'unexpected trailing data in buffer after named '
-                        f'tuple element decoding: {frb_get_len(&elem_buf)}')
+                elem = decode_element(&plan[i], buf, elem_len, 'named tuple')
 
             cpython.Py_INCREF(elem)
             cpython.PyTuple_SET_ITEM(result, i, elem)
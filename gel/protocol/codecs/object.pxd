@@ -24,7 +24,22 @@ cdef class ObjectCodec(BaseNamedRecordCodec):
         object cached_dataclass_fields
 
     cdef encode_args(self, WriteBuffer buf, dict obj)
+    cdef decode_lazy(self, bytes data, FRBuffer *buf)
 
     @staticmethod
     cdef BaseCodec new(bytes tid, tuple names, tuple flags,
                        tuple cards, tuple codecs, bint is_sparse)
+
+
+@cython.final
+cdef class LazyObjectLoader:
+    cdef:
+        ObjectCodec codec
+        bytes data
+        Py_ssize_t count
+        int32_t *offsets
+        int32_t *lengths
+
+    @staticmethod
+    cdef LazyObjectLoader new(ObjectCodec codec, bytes data,
+                              Py_ssize_t count)
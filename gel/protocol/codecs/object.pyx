@@ -155,8 +155,7 @@ cdef class ObjectCodec(BaseNamedRecordCodec):
             Py_ssize_t elem_count
             Py_ssize_t i
             int32_t elem_len
-            BaseCodec elem_codec
-            FRBuffer elem_buf
+            DecodeStep *plan = self._get_decode_plan()
             tuple fields_codecs = (<BaseRecordCodec>self).fields_codecs
             descriptor = (<BaseNamedRecordCodec>self).descriptor
 
@@ -173,24 +172,61 @@ cdef class ObjectCodec(BaseNamedRecordCodec):
         result = datatypes.object_new(descriptor)
 
         for i in range(elem_count):
-            frb_read(buf, 4)  # reserved
-            elem_len = hton.unpack_int32(frb_read(buf, 4))
+            # 4 reserved bytes followed by the element length
+            elem_len = hton.unpack_int32(frb_read(buf, 8) + 4)
 
             if elem_len == -1:
                 elem = None
             else:
-                elem_codec = <BaseCodec>fields_codecs[i]
-                elem = elem_codec.decode(
-                    frb_slice_from(&elem_buf, buf, elem_len))
-                if frb_get_len(&elem_buf):
-                    raise RuntimeError(
-                        f'unexpected trailing data in buffer after '
-                        f'object element decoding: {frb_get_len(&elem_buf)}')
+                elem = decode_element(&plan[i], buf, elem_len, 'object')
 
             datatypes.object_set(result, i, elem)
 
         return result
 
+    cdef decode_lazy(self, bytes data, FRBuffer *buf):
+        # Like decode(), but only takes note of where the elements are:
+        # they are decoded from `data`, which `buf` points into, when
+        # the field is accessed for the first time.
+        cdef:
+            object result
+            Py_ssize_t elem_count
+            Py_ssize_t i
+            int32_t elem_len
+            const char *start = cpython.PyBytes_AS_STRING(data)
+            LazyObjectLoader loader = None
+            tuple fields_codecs = (<BaseRecordCodec>self).fields_codecs
+            descriptor = (<BaseNamedRecordCodec>self).descriptor
+
+        if self.is_sparse:
+            raise NotImplementedError
+
+        elem_count = <Py_ssize_t><uint32_t>hton.unpack_int32(frb_read(buf, 4))
+
+        if elem_count != len(fields_codecs):
+            raise RuntimeError(
+                f'cannot decode Object: expected {len(fields_codecs)} '
+                f'elements, got {elem_count}')
+
+        result = datatypes.object_new(descriptor)
+
+        for i in range(elem_count):
+            frb_read(buf, 4)  # reserved
+            elem_len = hton.unpack_int32(frb_read(buf, 4))
+
+            if elem_len == -1:
+                datatypes.object_set(result, i, None)
+            else:
+                if loader is None:
+                    loader = LazyObjectLoader.new(self, data, elem_count)
+                loader.offsets[i] = <int32_t>(frb_read(buf, elem_len) - start)
+                loader.lengths[i] = elem_len
+
+        if loader is not None:
+            datatypes.object_set_loader(result, loader)
+
+        return result
+
     def get_dataclass_fields(self):
         cdef descriptor = (<BaseNamedRecordCodec>self).descriptor
 
@@ -262,3 +298,61 @@ cdef class ObjectCodec(BaseNamedRecordCodec):
             name=None,
             elements=elements,
         )
+
+
+@cython.final
+cdef class LazyObjectLoader:
+    # Decodes the fields of an object returned by
+    # ObjectCodec.decode_lazy(), called by the object itself.
+
+    @staticmethod
+    cdef LazyObjectLoader new(ObjectCodec codec, bytes data,
+                              Py_ssize_t count):
+        cdef LazyObjectLoader loader
+
+        loader = LazyObjectLoader.__new__(LazyObjectLoader)
+        loader.offsets = <int32_t *>PyMem_Malloc(
+            count * 2 * sizeof(int32_t))
+        if loader.offsets == NULL:
+            raise MemoryError
+        loader.lengths = loader.offsets + count
+        loader.codec = codec
+        loader.data = data
+        loader.count = count
+        return loader
+
+    def __dealloc__(self):
+        PyMem_Free(self.offsets)
+        self.offsets = self.lengths = NULL
+
+    def __call__(self, Py_ssize_t i):
+        cdef:
+            FRBuffer buf
+            BaseCodec codec
+
+        if i < 0 or i >= self.count:
+            raise IndexError('object field index out of range')
+
+        codec = <BaseCodec>self.codec.fields_codecs[i]
+        frb_init(
+            &buf,
+            cpython.PyBytes_AS_STRING(self.data) + self.offsets[i],
+            self.lengths[i],
+        )
+        try:
+            if (
+                type(codec) is ObjectCodec
+                and not (<ObjectCodec>codec).is_sparse
+            ):
+                # Linked objects share the data of the whole row.
+                elem = (<ObjectCodec>codec).decode_lazy(self.data, &buf)
+            else:
+                elem = codec.decode(&buf)
+            if frb_get_len(&buf):
+                raise RuntimeError(
+                    f'unexpected trailing data in buffer after '
+                    f'object element decoding: {frb_get_len(&buf)}')
+        except Exception as ex:
+            raise errors.ClientError(
+                'unable to decode data to Python objects') from ex
+        return elem
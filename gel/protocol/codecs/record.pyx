@@ -29,8 +29,7 @@ cdef class RecordCodec(BaseNamedRecordCodec):
             Py_ssize_t elem_count
             Py_ssize_t i
             int32_t elem_len
-            BaseCodec elem_codec
-            FRBuffer elem_buf
+            DecodeStep *plan = self._get_decode_plan()
             tuple fields_codecs = (<BaseRecordCodec>self).fields_codecs
             descriptor = (<BaseNamedRecordCodec>self).descriptor
 
@@ -44,19 +43,13 @@ cdef class RecordCodec(BaseNamedRecordCodec):
         result = datatypes.record_new(descriptor)
 
         for i in range(elem_count):
-            frb_read(buf, 4)  # reserved
-            elem_len = hton.unpack_int32(frb_read(buf, 4))
+            # 4 reserved bytes followed by the element length
+            elem_len = hton.unpack_int32(frb_read(buf, 8) + 4)
 
             if elem_len == -1:
                 elem = None
             else:
-                elem_codec = <BaseCodec>fields_codecs[i]
-                elem = elem_codec.decode(
-                    frb_slice_from(&elem_buf, buf, elem_len))
-                if frb_get_len(&elem_buf):
-                    raise RuntimeError(
-                        f'unexpected trailing data in buffer after '
-                        f'record element decoding: {frb_get_len(&elem_buf)}')
+                elem = decode_element(&plan[i], buf, elem_len, 'record')
 
             datatypes.record_set(result, i, elem)
 
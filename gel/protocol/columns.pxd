@@ -0,0 +1,72 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2016-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+@cython.final
+cdef class ResultColumn:
+
+    cdef:
+        str name
+        int kind
+        BaseCodec codec
+        array.array values
+        list objects
+        list nulls
+        Py_ssize_t length
+
+        # Arrow strings
+        array.array offsets
+        array.array data
+
+        # Arrow dictionary-encoded enums
+        dict enum_index
+        list enum_labels
+
+        # NumPy vector matrices: the number of elements in every row,
+        # -1 until the first non-empty value is seen.
+        Py_ssize_t dim
+
+        object arrow_type
+
+    cdef reset(self)
+    cdef inline append_null(self)
+    cdef inline decode(self, FRBuffer *buf)
+    cdef decode_vector(self, FRBuffer *buf)
+    cdef vectors_to_objects(self)
+    cdef as_array(self)
+    cdef as_numpy(self, object np)
+    cdef as_arrow(self, object pa)
+
+
+@cython.final
+cdef class ColumnsBuilder:
+
+    cdef:
+        str format
+        object module
+        BaseCodec out_dc
+        tuple columns
+        Py_ssize_t nrows
+
+        list batches
+        Py_ssize_t batch_rows
+
+    cdef init_columns(self, BaseCodec out_dc)
+    cdef decode_row(self, BaseCodec out_dc, FRBuffer *buf)
+    cdef flush_batch(self)
+    cdef finish(self, BaseCodec out_dc)
@@ -0,0 +1,642 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2016-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+DEF COL_SKIP = 0
+DEF COL_OBJECT = 1
+DEF COL_INT16 = 2
+DEF COL_INT32 = 3
+DEF COL_INT64 = 4
+DEF COL_FLOAT32 = 5
+DEF COL_FLOAT64 = 6
+DEF COL_BOOL = 7
+DEF COL_DATETIME = 8
+# Only used for Arrow results
+DEF COL_STR = 9
+DEF COL_ENUM = 10
+# Only used for NumPy results
+DEF COL_VECTOR = 11
+
+# Microseconds between 1970-01-01 and 2000-01-01, the epoch used
+# by the wire format of all timestamp types.
+DEF UNIX_EPOCH_OFFSET_US = 946684800000000
+
+# Number of rows in each Arrow record batch.
+DEF ARROW_BATCH_ROWS = 65536
+
+
+cdef dict COLUMN_KINDS = {
+    'std::int16': COL_INT16,
+    'std::int32': COL_INT32,
+    'std::int64': COL_INT64,
+    'std::float32': COL_FLOAT32,
+    'std::float64': COL_FLOAT64,
+    'std::bool': COL_BOOL,
+    'std::datetime': COL_DATETIME,
+    'std::pg::timestamptz': COL_DATETIME,
+    'cal::local_datetime': COL_DATETIME,
+    'std::pg::timestamp': COL_DATETIME,
+}
+
+cdef dict ARRAY_TYPECODES = {
+    COL_INT16: 'h',
+    COL_INT32: 'i',
+    COL_INT64: 'q',
+    COL_FLOAT32: 'f',
+    COL_FLOAT64: 'd',
+    COL_BOOL: 'b',
+    COL_DATETIME: 'q',
+    COL_ENUM: 'i',
+    COL_VECTOR: 'f',
+}
+
+cdef dict NUMPY_DTYPES = {
+    COL_INT16: 'int16',
+    COL_INT32: 'int32',
+    COL_INT64: 'int64',
+    COL_FLOAT32: 'float32',
+    COL_FLOAT64: 'float64',
+    COL_BOOL: 'bool',
+    COL_DATETIME: 'datetime64[us]',
+}
+
+cdef dict COLUMNS_METHOD = {
+    'array': 'query_columns',
+    'numpy': 'query_numpy',
+    'arrow': 'query_arrow',
+}
+
+
+cdef _arrow_type(object pa, BaseCodec codec):
+    # Returns None if the type should be inferred by pyarrow.
+    cdef:
+        BaseCodec sub_codec
+        tuple fields_codecs
+
+    codec_type = type(codec)
+    if codec_type is ScalarCodec:
+        name = codec.name
+        if name == 'std::int16':
+            return pa.int16()
+        elif name == 'std::int32':
+            return pa.int32()
+        elif name == 'std::int64':
+            return pa.int64()
+        elif name == 'std::float32':
+            return pa.float32()
+        elif name == 'std::float64':
+            return pa.float64()
+        elif name == 'std::bool':
+            return pa.bool_()
+        elif name in {'std::str', 'std::json', 'std::pg::json'}:
+            return pa.large_string()
+        elif name == 'std::bytes':
+            return pa.large_binary()
+        elif name == 'std::uuid':
+            return pa.binary(16)
+        elif name in {'std::datetime', 'std::pg::timestamptz'}:
+            return pa.timestamp('us', tz='UTC')
+        elif name in {'cal::local_datetime', 'std::pg::timestamp'}:
+            return pa.timestamp('us')
+        elif name in {'cal::local_date', 'std::pg::date'}:
+            return pa.date32()
+        elif name == 'cal::local_time':
+            return pa.time64('us')
+        elif name == 'std::duration':
+            return pa.duration('us')
+        return None
+
+    elif codec_type is EnumCodec:
+        return pa.dictionary(pa.int32(), pa.large_string())
+
+    elif codec_type is ArrayCodec or codec_type is SetCodec:
+        sub_type = _arrow_type(pa, (<BaseArrayCodec>codec).sub_codec)
+        if sub_type is None:
+            return None
+        return pa.large_list(sub_type)
+
+    elif (
+        codec_type is TupleCodec
+        or codec_type is NamedTupleCodec
+        or codec_type is ObjectCodec
+    ):
+        fields = []
+        fields_codecs = (<BaseRecordCodec>codec).fields_codecs
+        for i, name in enumerate(_record_field_names(codec)):
+            if name is None:
+                continue
+            sub_type = _arrow_type(pa, <BaseCodec>fields_codecs[i])
+            if sub_type is None:
+                return None
+            fields.append(pa.field(name, sub_type))
+        return pa.struct(fields)
+
+    return None
+
+
+cdef list _record_field_names(BaseCodec codec):
+    # Field names of a record codec; None for implicit object fields.
+    cdef:
+        list names = []
+        Py_ssize_t i
+        Py_ssize_t count = len((<BaseRecordCodec>codec).fields_codecs)
+
+    if type(codec) is TupleCodec:
+        return [str(i) for i in range(count)]
+
+    descriptor = (<BaseNamedRecordCodec>codec).descriptor
+    for i in range(count):
+        if datatypes.record_desc_pointer_is_implicit(descriptor, i):
+            names.append(None)
+        else:
+            names.append(datatypes.record_desc_pointer_name(descriptor, i))
+    return names
+
+
+cdef _arrow_value(BaseCodec codec, object value):
+    # Converts a decoded value into something pyarrow can ingest.
+    cdef:
+        BaseCodec sub_codec
+        tuple fields_codecs
+        dict rv
+
+    if value is None:
+        return None
+
+    codec_type = type(codec)
+    if codec_type is ScalarCodec:
+        if codec.name == 'std::uuid':
+            return value.bytes
+        return value
+
+    elif codec_type is EnumCodec:
+        return str(value)
+
+    elif codec_type is ArrayCodec or codec_type is SetCodec:
+        sub_codec = (<BaseArrayCodec>codec).sub_codec
+        return [_arrow_value(sub_codec, item) for item in value]
+
+    elif codec_type is TupleCodec or codec_type is NamedTupleCodec:
+        rv = {}
+        fields_codecs = (<BaseRecordCodec>codec).fields_codecs
+        for i, name in enumerate(_record_field_names(codec)):
+            rv[name] = _arrow_value(<BaseCodec>fields_codecs[i], value[i])
+        return rv
+
+    elif codec_type is ObjectCodec:
+        rv = {}
+        fields_codecs = (<BaseRecordCodec>codec).fields_codecs
+        for i, name in enumerate(_record_field_names(codec)):
+            if name is None:
+                continue
+            # Link properties are only accessible by item.
+            if name.startswith('@'):
+                field = value[name]
+            else:
+                field = getattr(value, name)
+            rv[name] = _arrow_value(<BaseCodec>fields_codecs[i], field)
+        return rv
+
+    return value
+
+
+cdef _arrow_validity(object pa, Py_ssize_t length, list nulls):
+    cdef bytearray bitmap
+
+    if not nulls:
+        return None
+    bitmap = bytearray(b'\xff') * ((length + 7) >> 3)
+    for i in nulls:
+        bitmap[i >> 3] &= ~(1 << (i & 7))
+    return pa.py_buffer(bitmap)
+
+
+@cython.final
+cdef class ResultColumn:
+
+    def __cinit__(self, str name, int kind, BaseCodec codec):
+        self.name = name
+        self.kind = kind
+        self.codec = codec
+
+        if kind == COL_ENUM:
+            self.enum_labels = [None] * len((<EnumCodec>codec).cls)
+            for member in (<EnumCodec>codec).cls:
+                self.enum_labels[member._index_] = member.value
+            self.enum_index = {
+                label: i for i, label in enumerate(self.enum_labels)
+            }
+
+        self.reset()
+
+    cdef reset(self):
+        # Arrow buffers built from the previous storage may still be
+        # referenced, so always start over with fresh objects.
+        kind = self.kind
+        self.length = 0
+        self.dim = -1
+        if kind == COL_OBJECT:
+            self.objects = []
+        elif kind != COL_SKIP:
+            self.nulls = []
+            if kind == COL_STR:
+                self.offsets = array.array('q', [0])
+                self.data = array.array('B')
+            else:
+                self.values = array.array(ARRAY_TYPECODES[kind])
+
+    cdef inline append_null(self):
+        cdef:
+            Py_ssize_t n = self.length
+            Py_ssize_t itemsize
+
+        if self.kind == COL_OBJECT:
+            self.objects.append(None)
+        elif self.kind == COL_STR:
+            array.resize_smart(self.offsets, n + 2)
+            self.offsets.data.as_longlongs[n + 1] = (
+                self.offsets.data.as_longlongs[n])
+            self.nulls.append(n)
+        elif self.kind == COL_VECTOR:
+            if self.dim > 0:
+                array.resize_smart(self.values, (n + 1) * self.dim)
+                memset(
+                    self.values.data.as_floats + n * self.dim,
+                    0,
+                    self.dim * sizeof(float),
+                )
+            self.nulls.append(n)
+        elif self.kind != COL_SKIP:
+            itemsize = self.values.ob_descr.itemsize
+            array.resize_smart(self.values, n + 1)
+            memset(self.values.data.as_chars + n * itemsize, 0, itemsize)
+            self.nulls.append(n)
+        self.length = n + 1
+
+    cdef inline decode(self, FRBuffer *buf):
+        cdef:
+            Py_ssize_t n = self.length
+            Py_ssize_t size
+            int kind = self.kind
+
+        if kind == COL_OBJECT:
+            self.objects.append(self.codec.decode(buf))
+        elif kind == COL_SKIP:
+            frb_read(buf, frb_get_len(buf))
+        elif kind == COL_STR:
+            # Text is sent as UTF-8, which is what Arrow uses as well.
+            size = frb_get_len(buf)
+            array.extend_buffer(self.data, <char*>frb_read(buf, size), size)
+            array.resize_smart(self.offsets, n + 2)
+            self.offsets.data.as_longlongs[n + 1] = (
+                self.offsets.data.as_longlongs[n] + size)
+        elif kind == COL_ENUM:
+            array.resize_smart(self.values, n + 1)
+            self.values.data.as_ints[n] = self.enum_index[
+                pgproto.text_decode(DEFAULT_CODEC_CONTEXT, buf)]
+        elif kind == COL_VECTOR:
+            self.decode_vector(buf)
+            return
+        else:
+            array.resize_smart(self.values, n + 1)
+            if kind == COL_INT64:
+                self.values.data.as_longlongs[n] = hton.unpack_int64(
+                    frb_read(buf, 8))
+            elif kind == COL_FLOAT64:
+                self.values.data.as_doubles[n] = hton.unpack_double(
+                    frb_read(buf, 8))
+            elif kind == COL_INT32:
+                self.values.data.as_ints[n] = hton.unpack_int32(
+                    frb_read(buf, 4))
+            elif kind == COL_FLOAT32:
+                self.values.data.as_floats[n] = hton.unpack_float(
+                    frb_read(buf, 4))
+            elif kind == COL_INT16:
+                self.values.data.as_shorts[n] = hton.unpack_int16(
+                    frb_read(buf, 2))
+            elif kind == COL_BOOL:
+                self.values.data.as_schars[n] = frb_read(buf, 1)[0] != 0
+            elif kind == COL_DATETIME:
+                self.values.data.as_longlongs[n] = (
+                    hton.unpack_int64(frb_read(buf, 8)) +
+                    UNIX_EPOCH_OFFSET_US
+                )
+            else:
+                raise RuntimeError(f'unexpected column kind: {kind}')
+        self.length = n + 1
+
+    cdef decode_vector(self, FRBuffer *buf):
+        # Vectors are unpacked into consecutive rows of a single
+        # float32 buffer, which as_numpy() exposes as a matrix.
+        cdef:
+            Py_ssize_t n = self.length
+            Py_ssize_t dim
+
+        frb_check(buf, 4)
+        dim = hton.unpack_uint16(buf.buf)
+
+        if self.dim < 0:
+            # Rows before the first value are all empty.
+            self.dim = dim
+            array.resize(self.values, n * dim)
+            memset(self.values.data.as_floats, 0, n * dim * sizeof(float))
+        elif dim != self.dim:
+            # Vectors of different lengths don't make up a matrix.
+            self.vectors_to_objects()
+            self.objects.append(self.codec.decode(buf))
+            self.length = n + 1
+            return
+
+        frb_read(buf, 4)
+        array.resize_smart(self.values, (n + 1) * dim)
+        _unpack_float32s(
+            self.values.data.as_floats + n * dim, frb_read(buf, dim * 4), dim)
+        self.length = n + 1
+
+    cdef vectors_to_objects(self):
+        cdef:
+            Py_ssize_t dim = self.dim
+            list objects = []
+
+        for i in range(self.length):
+            objects.append(self.values[i * dim:(i + 1) * dim])
+        for i in self.nulls:
+            objects[i] = None
+
+        self.kind = COL_OBJECT
+        self.objects = objects
+        self.values = None
+        self.nulls = None
+
+    cdef as_array(self):
+        cdef list rv
+
+        if self.kind == COL_OBJECT:
+            return self.objects
+        elif not self.nulls:
+            return self.values
+
+        rv = self.values.tolist()
+        for i in self.nulls:
+            rv[i] = None
+        return rv
+
+    cdef as_numpy(self, object np):
+        if self.kind == COL_OBJECT:
+            rv = np.empty(self.length, dtype=object)
+            # Assign one by one: a slice assignment would make NumPy
+            # broadcast sequence values (arrays, tuples) into the array.
+            for i, val in enumerate(self.objects):
+                rv[i] = val
+            return rv
+
+        if self.kind == COL_VECTOR:
+            # Zero-copy as well: one row per vector.
+            rv = np.frombuffer(self.values, dtype='float32').reshape(
+                self.length, max(self.dim, 0))
+            if self.nulls:
+                mask = np.zeros(rv.shape, dtype=bool)
+                mask[self.nulls] = True
+                rv = np.ma.MaskedArray(rv, mask=mask)
+            return rv
+
+        dtype = NUMPY_DTYPES[self.kind]
+        if not self.length:
+            return np.empty(0, dtype=dtype)
+
+        # Zero-copy: the array shares the memory of `self.values`.
+        rv = np.frombuffer(self.values, dtype=dtype)
+        if self.nulls:
+            mask = np.zeros(self.length, dtype=bool)
+            mask[self.nulls] = True
+            rv = np.ma.MaskedArray(rv, mask=mask)
+        return rv
+
+    cdef as_arrow(self, object pa):
+        cdef:
+            int kind = self.kind
+
+        if kind == COL_OBJECT:
+            values = [_arrow_value(self.codec, v) for v in self.objects]
+            rv = pa.array(values, type=self.arrow_type)
+            if self.arrow_type is None and rv.type != pa.null():
+                # Keep the inferred type consistent across batches.
+                self.arrow_type = rv.type
+            return rv
+
+        validity = _arrow_validity(pa, self.length, self.nulls)
+        null_count = len(self.nulls)
+
+        if kind == COL_STR:
+            return pa.Array.from_buffers(
+                self.arrow_type,
+                self.length,
+                [validity, pa.py_buffer(self.offsets), pa.py_buffer(self.data)],
+                null_count,
+            )
+        elif kind == COL_ENUM:
+            indices = pa.Array.from_buffers(
+                pa.int32(),
+                self.length,
+                [validity, pa.py_buffer(self.values)],
+                null_count,
+            )
+            return pa.DictionaryArray.from_arrays(
+                indices, pa.array(self.enum_labels, type=pa.large_string()))
+        elif kind == COL_BOOL:
+            # Arrow booleans are bit-packed; ours are bytes.
+            return pa.Array.from_buffers(
+                pa.int8(),
+                self.length,
+                [validity, pa.py_buffer(self.values)],
+                null_count,
+            ).cast(pa.bool_())
+        else:
+            return pa.Array.from_buffers(
+                self.arrow_type,
+                self.length,
+                [validity, pa.py_buffer(self.values)],
+                null_count,
+            )
+
+
+@cython.final
+cdef class ColumnsBuilder:
+    """Decodes a set of records directly into per-column arrays.
+
+    Used instead of a result list by the ``query_columns()``,
+    ``query_numpy()`` and ``query_arrow()`` methods: fields of
+    fixed-width scalar types are unpacked straight from the wire into
+    ``array.array`` storage without allocating a Python object per row
+    or per value.  Arrow results are additionally split into record
+    batches of ``ARROW_BATCH_ROWS`` rows as the data is received.
+    """
+
+    def __cinit__(self, str format, BaseCodec out_dc):
+        if format not in COLUMNS_METHOD:
+            raise ValueError(f'unsupported columnar format: {format!r}')
+
+        try:
+            if format == 'numpy':
+                import numpy
+                self.module = numpy
+            elif format == 'arrow':
+                import pyarrow
+                self.module = pyarrow
+        except ImportError as e:
+            raise errors.InterfaceError(
+                f'{COLUMNS_METHOD[format]}() requires the "{e.name}" '
+                f'package to be installed'
+            ) from None
+
+        self.format = format
+        self.nrows = 0
+        self.batches = []
+        self.batch_rows = 0
+        self.init_columns(out_dc)
+
+    cdef init_columns(self, BaseCodec out_dc):
+        cdef:
+            tuple fields_codecs
+            Py_ssize_t i
+            BaseCodec codec
+            list columns = []
+            int kind
+            ResultColumn column
+            bint arrow = self.format == 'arrow'
+            bint numpy = self.format == 'numpy'
+
+        if not (
+            type(out_dc) is TupleCodec
+            or type(out_dc) is NamedTupleCodec
+            or type(out_dc) is RecordCodec
+            or (
+                type(out_dc) is ObjectCodec
+                and not (<ObjectCodec>out_dc).is_sparse
+            )
+        ):
+            raise errors.InterfaceError(
+                f'{COLUMNS_METHOD[self.format]}() expects the query to '
+                f'return a set of objects, named tuples or tuples'
+            )
+
+        fields_codecs = (<BaseRecordCodec>out_dc).fields_codecs
+        for i, name in enumerate(_record_field_names(out_dc)):
+            codec = <BaseCodec>fields_codecs[i]
+            if name is None:
+                kind = COL_SKIP
+            elif type(codec) is ScalarCodec:
+                kind = COLUMN_KINDS.get(codec.name, COL_OBJECT)
+                if arrow and codec.name == 'std::str':
+                    kind = COL_STR
+                elif numpy and codec.name == 'ext::pgvector::vector':
+                    kind = COL_VECTOR
+            elif arrow and type(codec) is EnumCodec:
+                kind = COL_ENUM
+            else:
+                kind = COL_OBJECT
+
+            column = ResultColumn(name, kind, codec)
+            if arrow:
+                column.arrow_type = _arrow_type(self.module, codec)
+            columns.append(column)
+
+        self.columns = tuple(columns)
+        self.out_dc = out_dc
+
+    cdef decode_row(self, BaseCodec out_dc, FRBuffer *buf):
+        cdef:
+            Py_ssize_t elem_count
+            Py_ssize_t i
+            int32_t elem_len
+            FRBuffer elem_buf
+            ResultColumn column
+            tuple columns
+
+        if out_dc is not self.out_dc:
+            # The server sent a new output descriptor before any data,
+            # e.g. because the schema has changed since the last Parse.
+            if self.nrows:
+                raise RuntimeError(
+                    'output descriptor changed in the middle of a result')
+            self.init_columns(out_dc)
+
+        columns = self.columns
+        elem_count = <Py_ssize_t><uint32_t>hton.unpack_int32(frb_read(buf, 4))
+        if elem_count != len(columns):
+            raise RuntimeError(
+                f'cannot decode columns: expected {len(columns)} '
+                f'elements, got {elem_count}')
+
+        for i in range(elem_count):
+            column = <ResultColumn>columns[i]
+            frb_read(buf, 4)  # reserved
+            elem_len = hton.unpack_int32(frb_read(buf, 4))
+
+            if elem_len == -1:
+                column.append_null()
+            else:
+                column.decode(frb_slice_from(&elem_buf, buf, elem_len))
+                if frb_get_len(&elem_buf):
+                    raise RuntimeError(
+                        f'unexpected trailing data in buffer after '
+                        f'column element decoding: {frb_get_len(&elem_buf)}')
+
+        self.nrows += 1
+        self.batch_rows += 1
+        if self.batch_rows >= ARROW_BATCH_ROWS and self.format == 'arrow':
+            self.flush_batch()
+
+    cdef flush_batch(self):
+        cdef:
+            ResultColumn column
+            list arrays = []
+            list names = []
+
+        pa = self.module
+        for column in self.columns:
+            if column.kind == COL_SKIP:
+                continue
+            arrays.append(column.as_arrow(pa))
+            names.append(column.name)
+            column.reset()
+
+        self.batches.append(pa.RecordBatch.from_arrays(arrays, names=names))
+        self.batch_rows = 0
+
+    cdef finish(self, BaseCodec out_dc):
+        cdef:
+            ResultColumn column
+            dict rv = {}
+
+        if out_dc is not self.out_dc and not self.nrows:
+            self.init_columns(out_dc)
+
+        if self.format == 'arrow':
+            if self.batch_rows or not self.batches:
+                self.flush_batch()
+            return self.module.Table.from_batches(self.batches)
+
+        for column in self.columns:
+            if column.kind == COL_SKIP:
+                continue
+            if self.format == 'numpy':
+                rv[column.name] = column.as_numpy(self.module)
+            else:
+                rv[column.name] = column.as_array()
+        return rv
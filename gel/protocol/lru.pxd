@@ -25,4 +25,8 @@ cdef class LRUMapping:
         object _dict_move_to_end
         object _dict_get
 
+        readonly uint64_t hits
+        readonly uint64_t misses
+        readonly uint64_t evictions
+
     cdef get(self, key, default)
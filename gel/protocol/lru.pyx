@@ -42,6 +42,10 @@ cdef class LRUMapping:
     # So new entries and hits are always promoted to the end of the
     # entries dict, whereas the unused one will group in the
     # beginning of it.
+    #
+    # Lookups through `get()` and `[]` are counted as hits or misses;
+    # `in` checks are not.  Entries dropped to maintain `max_size` are
+    # counted as evictions.
 
     def __init__(self, *, maxsize):
         if maxsize <= 0:
@@ -52,16 +56,28 @@ cdef class LRUMapping:
         self._dict_move_to_end = self._dict.move_to_end
         self._dict_get = self._dict.get
         self._maxsize = maxsize
+        self.hits = self.misses = self.evictions = 0
+
+    @property
+    def maxsize(self):
+        return self._maxsize
 
     cdef get(self, key, default):
         o = self._dict_get(key, _LRU_MARKER)
         if o is _LRU_MARKER:
+            self.misses += 1
             return default
+        self.hits += 1
         self._dict_move_to_end(key)  # last=True
         return o
 
     def __getitem__(self, key):
-        o = self._dict[key]
+        try:
+            o = self._dict[key]
+        except KeyError:
+            self.misses += 1
+            raise
+        self.hits += 1
         self._dict_move_to_end(key)  # last=True
         return o
 
@@ -73,6 +89,7 @@ cdef class LRUMapping:
             self._dict[key] = o
             if len(self._dict) > self._maxsize:
                 self._dict.popitem(last=False)
+                self.evictions += 1
 
     def __delitem__(self, key):
         del self._dict[key]
@@ -88,3 +105,6 @@ cdef class LRUMapping:
 
     def clear(self):
         self._dict.clear()
+
+    def reset_stats(self):
+        self.hits = self.misses = self.evictions = 0
@@ -19,6 +19,7 @@
 
 cimport cython
 cimport cpython
+from cpython cimport array
 
 from libc.stdint cimport int16_t, int32_t, uint16_t, \
                          uint32_t, int64_t, uint64_t
@@ -35,6 +36,7 @@ from gel.pgproto.debug cimport PG_DEBUG
 
 include "./lru.pxd"
 include "./codecs/codecs.pxd"
+include "./columns.pxd"
 
 
 ctypedef object (*decode_row_method)(BaseCodec, FRBuffer *buf)
@@ -90,6 +92,9 @@ cdef class ExecuteContext:
         uint64_t allow_capabilities
         object state
         object annotations
+        object columnar_format
+        object descriptor_cache
+        bint lazy_objects
 
         # Contextual variables
         readonly bytes cardinality
@@ -97,9 +102,13 @@ cdef class ExecuteContext:
         readonly BaseCodec out_dc
         readonly uint64_t capabilities
         readonly tuple warnings
+        bytes in_type_data
+        bytes out_type_data
 
     cdef inline bint has_na_cardinality(self)
+    cdef inline tuple cache_key(self)
     cdef bint load_from_cache(self)
+    cdef bint load_from_descriptor_cache(self, tuple key)
     cdef inline store_to_cache(self)
 
 
@@ -132,15 +141,26 @@ cdef class SansIOProtocol:
         BaseCodec state_codec
         object state_cache
 
+        # Cumulative counters for query observers, see gel.observers
+        readonly uint64_t bytes_sent
+        readonly uint64_t bytes_received
+        readonly uint64_t rows_decoded
+        readonly uint64_t cache_hits
+        readonly uint64_t cache_misses
+        readonly double parse_time
+        readonly double execute_time
+        readonly double decode_time
+
     cdef encode_args(self, BaseCodec in_dc, WriteBuffer buf, args, kwargs)
     cdef encode_state(self, state)
 
-    cdef parse_data_messages(self, BaseCodec out_dc, result)
+    cdef parse_data_messages(self, BaseCodec out_dc, result,
+                             bint lazy=*)
     cdef parse_sync_message(self)
     cdef parse_command_complete_message(self)
     cdef parse_describe_type_message(self, ExecuteContext ctx)
     cdef parse_describe_state_message(self)
-    cdef parse_type_data(self, CodecsRegistry reg)
+    cdef parse_type_data(self, CodecsRegistry reg, ExecuteContext ctx=*)
     cdef _amend_parse_error(
         self,
         exc,
@@ -158,6 +178,7 @@ cdef class SansIOProtocol:
 
     cdef write(self, WriteBuffer buf)
     cpdef abort(self)
+    cdef maybe_resume_reading(self)
 
     cdef reset_status(self)
 
@@ -169,6 +190,16 @@ cdef class SansIOProtocol:
     cdef ensure_connected(self)
 
     cdef WriteBuffer encode_parse_params(self, ExecuteContext ctx)
+    cdef WriteBuffer encode_execute_message(
+        self, ExecuteContext ctx, WriteBuffer params, args, kwargs)
+    cdef parse_execute_error(self, ExecuteContext ctx)
+    cdef parse_data_messages_safe(self, BaseCodec out_dc, result,
+                                  bint lazy=*)
+    cdef ensure_has_result(self, ExecuteContext ctx)
+    cdef parse_execute_many_message(
+        self, ExecuteContext ctx, Py_ssize_t completed)
+    cdef bint _skip_buffered_until_sync(self) except -1
+    cdef unpack_result(self, ExecuteContext ctx, list ret)
 
 
 include "protocol_v0.pxd"
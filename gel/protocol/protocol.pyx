@@ -20,7 +20,9 @@ cimport cython
 
 cimport cpython
 cimport cpython.datetime
+from cpython cimport array
 
+import array
 import asyncio
 import collections
 import datetime
@@ -53,6 +55,7 @@ from gel.pgproto.pgproto import UUID
 from libc.stdint cimport int8_t, uint8_t, int16_t, uint16_t, \
                          int32_t, uint32_t, int64_t, uint64_t, \
                          UINT32_MAX
+from libc.string cimport memset
 
 from gel.datatypes cimport datatypes
 from . cimport cpythonx
@@ -65,6 +68,7 @@ from gel import scram
 include "./consts.pxi"
 include "./lru.pyx"
 include "./codecs/codecs.pyx"
+include "./columns.pyx"
 
 
 cpython.datetime.import_datetime()
@@ -85,6 +89,10 @@ _QUERY_SINGLE_METHOD = {
 
 ALL_CAPABILITIES = 0xFFFFFFFFFFFFFFFF
 
+# execute_many() writes the buffered Execute messages out once
+# they reach this size.
+DEF EXECUTE_MANY_FLUSH_SIZE = 65536
+
 cdef dict OLD_ERROR_CODES = {
     0x05_03_00_01: 0x05_03_01_01,  # TransactionSerializationError #2431
     0x05_03_00_02: 0x05_03_01_02,  # TransactionDeadlockError      #2431
@@ -110,6 +118,9 @@ cdef class ExecuteContext:
         allow_capabilities: enums.Capability = enums.Capability.ALL,
         state: typing.Optional[dict] = None,
         annotations: typing.Optional[dict[str, str]] = None,
+        columnar_format: typing.Optional[str] = None,
+        descriptor_cache=None,
+        lazy_objects: bool = False,
     ):
         self.query = query
         self.args = args
@@ -131,12 +142,16 @@ cdef class ExecuteContext:
         self.capabilities = 0
         self.warnings = ()
         self.annotations = annotations
+        self.columnar_format = columnar_format
+        self.descriptor_cache = descriptor_cache
+        self.lazy_objects = bool(lazy_objects)
+        self.in_type_data = self.out_type_data = None
 
     cdef inline bint has_na_cardinality(self):
         return self.cardinality == CARDINALITY_NOT_APPLICABLE
 
-    cdef bint load_from_cache(self):
-        key = (
+    cdef inline tuple cache_key(self):
+        return (
             self.query,
             self.output_format,
             self.implicit_limit,
@@ -144,27 +159,70 @@ cdef class ExecuteContext:
             self.inline_typeids,
             self.expect_one,
         )
+
+    cdef bint load_from_cache(self):
+        key = self.cache_key()
         rv = self.qc.get(key, None)
         if rv is None:
+            if self.descriptor_cache is not None:
+                return self.load_from_descriptor_cache(key)
             return False
         else:
             self.cardinality, self.in_dc, self.out_dc, self.capabilities = rv
             return True
 
+    cdef bint load_from_descriptor_cache(self, tuple key):
+        # Rebuilds the codecs from type descriptors persisted by another
+        # process, see gel._descriptor_cache.
+        cdef:
+            CodecsRegistry reg = self.reg
+            BaseCodec in_dc, out_dc
+
+        rv = self.descriptor_cache.get(key)
+        if rv is None:
+            return False
+
+        cardinality, capabilities, in_tid, in_data, out_tid, out_data = rv
+        protocol_version = self.descriptor_cache.protocol_version
+        try:
+            if reg.has_codec(in_tid):
+                in_dc = reg.get_codec(in_tid)
+            else:
+                in_dc = reg.build_codec(in_data, protocol_version)
+            if reg.has_codec(out_tid):
+                out_dc = reg.get_codec(out_tid)
+            else:
+                out_dc = reg.build_codec(out_data, protocol_version)
+        except Exception:
+            self.descriptor_cache.discard(key)
+            return False
+
+        self.cardinality = cardinality
+        self.capabilities = capabilities
+        self.in_dc = in_dc
+        self.out_dc = out_dc
+        self.qc[key] = (cardinality, in_dc, out_dc, capabilities)
+        return True
+
     cdef inline store_to_cache(self):
         assert self.in_dc is not None
         assert self.out_dc is not None
-        key = (
-            self.query,
-            self.output_format,
-            self.implicit_limit,
-            self.inline_typenames,
-            self.inline_typeids,
-            self.expect_one,
-        )
+        key = self.cache_key()
         self.qc[key] = (
             self.cardinality, self.in_dc, self.out_dc, self.capabilities
         )
+        if (
+            self.descriptor_cache is not None
+            and self.out_type_data is not None
+        ):
+            self.descriptor_cache.put(key, (
+                self.cardinality,
+                self.capabilities,
+                self.in_dc.get_tid(),
+                self.in_type_data,
+                self.out_dc.get_tid(),
+                self.out_type_data,
+            ))
 
 
 cdef class SansIOProtocol:
@@ -189,6 +247,15 @@ cdef class SansIOProtocol:
         self.state_codec = None
         self.state_cache = (None, None)
 
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.rows_decoded = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.parse_time = 0
+        self.execute_time = 0
+        self.decode_time = 0
+
     cdef reset_status(self):
         self.last_status = None
         self.last_details = None
@@ -208,6 +275,9 @@ cdef class SansIOProtocol:
     cdef write(self, WriteBuffer buf):
         raise NotImplementedError
 
+    cdef maybe_resume_reading(self):
+        pass
+
     async def wait_for_message(self):
         raise NotImplementedError
 
@@ -216,6 +286,12 @@ cdef class SansIOProtocol:
         # buffer.  Needed for blocking-io connections.
         raise NotImplementedError
 
+    async def drain(self):
+        # Wait until the transport accepts more data.  Called after
+        # every chunk of a bulk write, so that the amount of data
+        # buffered for sending stays bounded.
+        raise NotImplementedError
+
     async def wait_for_connect(self):
         raise NotImplementedError
 
@@ -355,6 +431,71 @@ cdef class SansIOProtocol:
         if exc is not None:
             raise exc
 
+        self.ensure_has_result(ctx)
+
+    async def _parse_pipeline(self, list ctxs):
+        cdef:
+            WriteBuffer packet
+            WriteBuffer buf
+            ExecuteContext ctx
+            char mtype
+            Py_ssize_t i = 0
+
+        packet = WriteBuffer.new()
+        for ctx in ctxs:
+            buf = WriteBuffer.new_message(PREPARE_MSG)
+            self.write_annotations(ctx, buf)
+            buf.write_buffer(self.encode_parse_params(ctx))
+            buf.end_message()
+            packet.write_buffer(buf)
+        packet.write_bytes(SYNC_MESSAGE)
+        self.write(packet)
+
+        # Every Parse message is answered with a CommandDataDescription;
+        # after an error the server skips everything up to the Sync.
+        exc = None
+        while True:
+            if not self.buffer.take_message():
+                await self.wait_for_message()
+            mtype = self.buffer.get_message_type()
+
+            try:
+                if mtype == STMT_DATA_DESC_MSG:
+                    ctx = ctxs[i]
+                    self.parse_describe_type_message(ctx)
+                    ctx.store_to_cache()
+                    i += 1
+
+                elif mtype == STATE_DATA_DESC_MSG:
+                    self.parse_describe_state_message()
+
+                elif mtype == ERROR_RESPONSE_MSG:
+                    ctx = ctxs[i]
+                    exc = self.parse_error_message()
+                    exc._query = ctx.query
+                    exc = self._amend_parse_error(
+                        exc,
+                        ctx.output_format,
+                        ctx.expect_one,
+                        ctx.required_one,
+                    )
+
+                elif mtype == READY_FOR_COMMAND_MSG:
+                    self.parse_sync_message()
+                    break
+
+                else:
+                    self.fallthrough()
+            finally:
+                self.buffer.finish_message()
+
+        if exc is not None:
+            raise exc
+
+        for ctx in ctxs:
+            self.ensure_has_result(ctx)
+
+    cdef ensure_has_result(self, ExecuteContext ctx):
         if ctx.required_one and ctx.has_na_cardinality():
             assert ctx.output_format != OutputFormat.NONE
             methname = _QUERY_SINGLE_METHOD[ctx.required_one][ctx.output_format]
@@ -362,15 +503,11 @@ cdef class SansIOProtocol:
                 f'query cannot be executed with {methname}() as it '
                 f'does not return any data')
 
-    async def _execute(self, ctx: ExecuteContext):
+    cdef WriteBuffer encode_execute_message(
+        self, ExecuteContext ctx, WriteBuffer params, args, kwargs
+    ):
         cdef:
-            WriteBuffer packet
             WriteBuffer buf
-            WriteBuffer params
-            char mtype
-            object result
-
-        params = self.encode_parse_params(ctx)
 
         buf = WriteBuffer.new_message(EXECUTE_MSG)
         self.write_annotations(ctx, buf)
@@ -380,16 +517,79 @@ cdef class SansIOProtocol:
         buf.write_bytes(ctx.in_dc.get_tid())
         buf.write_bytes(ctx.out_dc.get_tid())
 
-        self.encode_args(ctx.in_dc, buf, ctx.args, ctx.kwargs)
+        self.encode_args(ctx.in_dc, buf, args, kwargs)
 
         buf.end_message()
+        return buf
+
+    cdef parse_execute_error(self, ExecuteContext ctx):
+        cdef:
+            WriteBuffer buf
+
+        exc = self.parse_error_message()
+        exc._query = ctx.query
+        if exc.get_code() == parameter_type_mismatch_code:
+            if not isinstance(ctx.in_dc, NullCodec):
+                buf = WriteBuffer.new()
+                try:
+                    self.encode_args(ctx.in_dc, buf, ctx.args, ctx.kwargs)
+                except errors.QueryArgumentError as ex:
+                    exc = ex
+                finally:
+                    buf = None
+        else:
+            exc = self._amend_parse_error(
+                exc,
+                ctx.output_format,
+                ctx.expect_one,
+                ctx.required_one,
+            )
+        return exc
+
+    cdef parse_data_messages_safe(self, BaseCodec out_dc, result,
+                                  bint lazy=False):
+        # An error during data decoding.  We need to handle this as
+        # gracefully as possible: return the exception so that the
+        # caller can raise it once SYNC is received, and ignore all
+        # 'D' messages for this query.
+        started = time.perf_counter()
+        try:
+            self.parse_data_messages(out_dc, result, lazy)
+        except Exception as ex:
+            exc = errors.ClientError(
+                'unable to decode data to Python objects')
+            exc.__cause__ = ex
+            # Take care of a partially consumed 'D' message
+            # and the ones yet unparsed.
+            while self.buffer.take_message_type(DATA_MSG):
+                self.buffer.discard_message()
+            return exc
+        finally:
+            self.decode_time += time.perf_counter() - started
+        return None
+
+    async def _execute(self, ctx: ExecuteContext):
+        cdef:
+            WriteBuffer packet
+            WriteBuffer buf
+            WriteBuffer params
+            char mtype
+            object result
+
+        if ctx.columnar_format is None:
+            result = []
+        else:
+            # Validates the output shape before anything is sent.
+            result = ColumnsBuilder(ctx.columnar_format, ctx.out_dc)
+
+        params = self.encode_parse_params(ctx)
+        buf = self.encode_execute_message(ctx, params, ctx.args, ctx.kwargs)
 
         packet = WriteBuffer.new()
         packet.write_buffer(buf)
         packet.write_bytes(SYNC_MESSAGE)
         self.write(packet)
 
-        result = []
         exc = None
         while True:
             if not self.buffer.take_message():
@@ -407,21 +607,8 @@ cdef class SansIOProtocol:
 
                 elif mtype == DATA_MSG:
                     if exc is None:
-                        try:
-                            self.parse_data_messages(ctx.out_dc, result)
-                        except Exception as ex:
-                            # An error during data decoding.  We need to
-                            # handle this as gracefully as possible:
-                            # * save the exception to raise it once SYNC is
-                            #   received;
-                            # * ignore all 'D' messages for this query.
-                            exc = errors.ClientError(
-                                'unable to decode data to Python objects')
-                            exc.__cause__ = ex
-                            # Take care of a partially consumed 'D' message
-                            # and the ones yet unparsed.
-                            while self.buffer.take_message_type(DATA_MSG):
-                                self.buffer.discard_message()
+                        exc = self.parse_data_messages_safe(
+                            ctx.out_dc, result, ctx.lazy_objects)
                     else:
                         self.buffer.discard_message()
 
@@ -429,26 +616,7 @@ cdef class SansIOProtocol:
                     self.parse_command_complete_message()
 
                 elif mtype == ERROR_RESPONSE_MSG:
-                    exc = self.parse_error_message()
-                    exc._query = ctx.query
-                    if exc.get_code() == parameter_type_mismatch_code:
-                        if not isinstance(ctx.in_dc, NullCodec):
-                            buf = WriteBuffer.new()
-                            try:
-                                self.encode_args(
-                                    ctx.in_dc, buf, ctx.args, ctx.kwargs
-                                )
-                            except errors.QueryArgumentError as ex:
-                                exc = ex
-                            finally:
-                                buf = None
-                    else:
-                        exc = self._amend_parse_error(
-                            exc,
-                            ctx.output_format,
-                            ctx.expect_one,
-                            ctx.required_one,
-                        )
+                    exc = self.parse_execute_error(ctx)
 
                 elif mtype == READY_FOR_COMMAND_MSG:
                     self.parse_sync_message()
@@ -465,6 +633,76 @@ cdef class SansIOProtocol:
         else:
             return result
 
+    async def _execute_pipeline(self, list ctxs):
+        cdef:
+            WriteBuffer packet
+            ExecuteContext ctx
+            char mtype
+            list results
+            Py_ssize_t i = 0
+
+        packet = WriteBuffer.new()
+        for ctx in ctxs:
+            packet.write_buffer(
+                self.encode_execute_message(
+                    ctx, self.encode_parse_params(ctx), ctx.args, ctx.kwargs
+                )
+            )
+        packet.write_bytes(SYNC_MESSAGE)
+        self.write(packet)
+
+        # Replies arrive in the order the Execute messages were sent,
+        # each one terminated by its CommandComplete.  Once an error is
+        # reported the server skips the remaining messages up to the Sync.
+        results = [[] for _ in range(len(ctxs))]
+        exc = None
+        decode_exc = None
+        while True:
+            if not self.buffer.take_message():
+                await self.wait_for_message()
+            mtype = self.buffer.get_message_type()
+
+            try:
+                if mtype == STMT_DATA_DESC_MSG:
+                    # our in/out type spec is out-dated
+                    ctx = ctxs[i]
+                    self.parse_describe_type_message(ctx)
+                    ctx.store_to_cache()
+
+                elif mtype == STATE_DATA_DESC_MSG:
+                    self.parse_describe_state_message()
+
+                elif mtype == DATA_MSG:
+                    if decode_exc is None:
+                        ctx = ctxs[i]
+                        decode_exc = self.parse_data_messages_safe(
+                            ctx.out_dc, results[i], ctx.lazy_objects)
+                    else:
+                        self.buffer.discard_message()
+
+                elif mtype == COMMAND_COMPLETE_MSG:
+                    self.parse_command_complete_message()
+                    i += 1
+
+                elif mtype == ERROR_RESPONSE_MSG:
+                    exc = self.parse_execute_error(ctxs[i])
+
+                elif mtype == READY_FOR_COMMAND_MSG:
+                    self.parse_sync_message()
+                    break
+
+                else:
+                    self.fallthrough()
+
+            finally:
+                self.buffer.finish_message()
+
+        if decode_exc is not None:
+            raise decode_exc
+        if exc is not None:
+            raise exc
+        return results
+
     cdef encode_state(self, state):
         cdef WriteBuffer buf
 
@@ -486,24 +724,326 @@ cdef class SansIOProtocol:
         self.reset_status()
 
         if ctx.load_from_cache():
-            pass
-        elif not ctx.args and not ctx.kwargs and not ctx.required_one:
+            self.cache_hits += 1
+        elif (
+            not ctx.args
+            and not ctx.kwargs
+            and not ctx.required_one
+            and ctx.columnar_format is None
+        ):
             # We don't have knowledge about the in/out desc of the command, but
             # the caller didn't provide any arguments, so let's try using NULL
             # for both in (assumed) and out (the server will correct it) desc
             # without an additional Parse, unless required_one is set because
             # it'll be too late to find out the cardinality is wrong when the
-            # command is already executed.
+            # command is already executed.  The same goes for columnar
+            # results, which need to know the output shape upfront.
+            self.cache_misses += 1
+            ctx.in_dc = ctx.out_dc = NULL_CODEC
+        else:
+            self.cache_misses += 1
+            started = time.perf_counter()
+            try:
+                await self._parse(ctx)
+            finally:
+                self.parse_time += time.perf_counter() - started
+            ctx.store_to_cache()
+
+        in_dc = ctx.in_dc
+        try:
+            return await self._timed_execute(ctx)
+        except errors.ParameterTypeMismatchError:
+            # The cached input descriptor is outdated, e.g. it was loaded
+            # from the descriptor cache or the schema has changed since.
+            # The server has rejected the command without executing it
+            # and sent the new descriptor along, so just try again,
+            # unless the error has failed the current transaction.
+            if (
+                in_dc is NULL_CODEC
+                or ctx.in_dc is in_dc
+                or self.xact_status == TRANS_INERROR
+            ):
+                raise
+
+        return await self._timed_execute(ctx)
+
+    async def _timed_execute(self, ctx: ExecuteContext):
+        started = time.perf_counter()
+        try:
+            return await self._execute(ctx)
+        finally:
+            self.execute_time += time.perf_counter() - started
+
+    async def execute_iter(self, ctx: ExecuteContext):
+        cdef:
+            WriteBuffer packet
+            char mtype
+            list rows
+            bint done = False
+
+        self.ensure_connected()
+        self.reset_status()
+
+        if ctx.load_from_cache():
+            pass
+        elif not ctx.args and not ctx.kwargs:
+            # See the comment in execute().
             ctx.in_dc = ctx.out_dc = NULL_CODEC
         else:
             await self._parse(ctx)
             ctx.store_to_cache()
 
-        return await self._execute(ctx)
+        packet = WriteBuffer.new()
+        packet.write_buffer(
+            self.encode_execute_message(
+                ctx, self.encode_parse_params(ctx), ctx.args, ctx.kwargs
+            )
+        )
+        packet.write_bytes(SYNC_MESSAGE)
+        self.write(packet)
+
+        # Unlike _execute(), rows are handed out in batches of whatever
+        # DATA messages are currently buffered, so the memory used is
+        # bounded by the read buffer rather than by the result size.
+        try:
+            exc = None
+            while True:
+                if not self.buffer.take_message():
+                    await self.wait_for_message()
+                mtype = self.buffer.get_message_type()
+
+                rows = None
+                try:
+                    if mtype == STMT_DATA_DESC_MSG:
+                        # our in/out type spec is out-dated
+                        self.parse_describe_type_message(ctx)
+                        ctx.store_to_cache()
+
+                    elif mtype == STATE_DATA_DESC_MSG:
+                        self.parse_describe_state_message()
+
+                    elif mtype == DATA_MSG:
+                        if exc is None:
+                            rows = []
+                            exc = self.parse_data_messages_safe(
+                                ctx.out_dc, rows, ctx.lazy_objects)
+                        else:
+                            self.buffer.discard_message()
+
+                    elif mtype == COMMAND_COMPLETE_MSG:
+                        self.parse_command_complete_message()
+
+                    elif mtype == ERROR_RESPONSE_MSG:
+                        exc = self.parse_execute_error(ctx)
+
+                    elif mtype == READY_FOR_COMMAND_MSG:
+                        self.parse_sync_message()
+                        done = True
+                        break
+
+                    else:
+                        self.fallthrough()
+
+                finally:
+                    self.buffer.finish_message()
+
+                if rows and exc is None:
+                    yield rows
+
+            if exc is not None:
+                raise exc
+
+        finally:
+            if not done and self.connected:
+                # The consumer stopped early.  The rest of the result can
+                # be arbitrarily large, so rather than reading it all the
+                # connection is aborted, unless the end of the result is
+                # already buffered.  Aborting would silently roll back
+                # a transaction though, so in one the rest is skipped.
+                if self.is_in_transaction():
+                    await self._skip_until_sync()
+                elif not self._skip_buffered_until_sync():
+                    self.abort()
+
+    async def _skip_until_sync(self):
+        while not self._skip_buffered_until_sync():
+            await self.wait_for_message()
+
+    cdef bint _skip_buffered_until_sync(self) except -1:
+        cdef char mtype
+        while self.buffer.take_message():
+            mtype = self.buffer.get_message_type()
+
+            if mtype == READY_FOR_COMMAND_MSG:
+                self.parse_sync_message()
+                return True
+            elif mtype == PARAMETER_STATUS_MSG or mtype == LOG_MSG:
+                self.fallthrough()
+            else:
+                self.buffer.discard_message()
+        return False
+
+    async def execute_pipeline(self, list ctxs):
+        cdef:
+            ExecuteContext ctx
+            list to_parse = []
+
+        self.ensure_connected()
+        self.reset_status()
+
+        for ctx in ctxs:
+            if ctx.load_from_cache():
+                pass
+            elif not ctx.args and not ctx.kwargs and not ctx.required_one:
+                # See the comment in execute().
+                ctx.in_dc = ctx.out_dc = NULL_CODEC
+            else:
+                to_parse.append(ctx)
+
+        if to_parse:
+            await self._parse_pipeline(to_parse)
+
+        results = await self._execute_pipeline(ctxs)
+        return [
+            self.unpack_result(ctx, ret) for ctx, ret in zip(ctxs, results)
+        ]
+
+    async def execute_many(self, ctx: ExecuteContext, args_seq):
+        cdef:
+            WriteBuffer packet
+            WriteBuffer params
+            Py_ssize_t sent = 0
+            Py_ssize_t completed = 0
+            char mtype
+
+        self.ensure_connected()
+        self.reset_status()
+
+        if not ctx.load_from_cache():
+            await self._parse(ctx)
+            ctx.store_to_cache()
+
+        params = self.encode_parse_params(ctx)
+        packet = WriteBuffer.new()
+        exc = None
+        try:
+            for args in args_seq:
+                if isinstance(args, MappingABC):
+                    kwargs = args
+                    args = ()
+                else:
+                    kwargs = None
+                try:
+                    packet.write_buffer(
+                        self.encode_execute_message(ctx, params, args, kwargs)
+                    )
+                except errors.EdgeDBError as ex:
+                    exc = ex
+                except Exception as ex:
+                    # Codecs raise e.g. OverflowError for values out of
+                    # the range of the argument type.
+                    exc = errors.InvalidArgumentError(
+                        f'invalid input for query arguments: {ex}')
+                    exc.__cause__ = ex
+                if exc is not None:
+                    exc._args_index = sent
+                    break
+                sent += 1
+
+                if packet.len() >= EXECUTE_MANY_FLUSH_SIZE:
+                    self.write(packet)
+                    packet = WriteBuffer.new()
+                    await self.drain()
+
+                    # Consume replies as they come so that an error stops
+                    # the stream early and the server is never blocked on
+                    # writing to us while we are writing to it.
+                    if not self.buffer.take_message():
+                        await self.try_recv_eagerly()
+                    while exc is None and self.buffer.take_message():
+                        completed, exc = self.parse_execute_many_message(
+                            ctx, completed)
+                    if exc is not None:
+                        break
+
+        finally:
+            # The Executes written so far must be completed by our own
+            # Sync, no matter how the loop above ended, or they would be
+            # run by the Sync of whatever query uses the connection next.
+            try:
+                packet.write_bytes(SYNC_MESSAGE)
+                self.write(packet)
+
+                while True:
+                    if not self.buffer.take_message():
+                        await self.wait_for_message()
+                    mtype = self.buffer.get_message_type()
+
+                    if mtype == READY_FOR_COMMAND_MSG:
+                        self.parse_sync_message()
+                        break
+                    else:
+                        completed, ex = self.parse_execute_many_message(
+                            ctx, completed)
+                        # A server error for an argument set sent before
+                        # an argument encoding error happened first.
+                        if ex is not None and (
+                            exc is None or ex._args_index < exc._args_index
+                        ):
+                            exc = ex
+            except BaseException:
+                self.abort()
+                raise
+
+        if exc is not None:
+            raise exc
+
+    cdef parse_execute_many_message(
+        self, ExecuteContext ctx, Py_ssize_t completed
+    ):
+        cdef:
+            char mtype = self.buffer.get_message_type()
+
+        exc = None
+        try:
+            if mtype == COMMAND_COMPLETE_MSG:
+                self.parse_command_complete_message()
+                completed += 1
+
+            elif mtype == STMT_DATA_DESC_MSG:
+                # our in/out type spec is out-dated
+                self.parse_describe_type_message(ctx)
+                ctx.store_to_cache()
+
+            elif mtype == STATE_DATA_DESC_MSG:
+                self.parse_describe_state_message()
+
+            elif mtype == DATA_MSG:
+                self.buffer.discard_message()
+
+            elif mtype == ERROR_RESPONSE_MSG:
+                exc = self.parse_error_message()
+                exc._query = ctx.query
+                exc._args_index = completed
+
+            else:
+                self.fallthrough()
+
+        finally:
+            self.buffer.finish_message()
+
+        return completed, exc
 
     async def query(self, ctx: ExecuteContext):
         ret = await self.execute(ctx)
-        if ctx.expect_one:
+        if ctx.columnar_format is not None:
+            return (<ColumnsBuilder>ret).finish(ctx.out_dc)
+        return self.unpack_result(ctx, ret)
+
+    cdef unpack_result(self, ExecuteContext ctx, list ret):
+        if ctx.output_format == OutputFormat.NONE:
+            return None
+        elif ctx.expect_one:
             if ret or not ctx.required_one:
                 if ret:
                     return ret[0]
@@ -675,13 +1215,11 @@ cdef class SansIOProtocol:
             await self._sync()
             raise exc
 
-        # TODO: flow-control is missing here. For now this is fine
-        # since this method is only called on a blocking connection.
-
         async for data in data_gen:
             buf = WriteBuffer.new_message(DUMP_BLOCK_MSG)
             buf.write_bytes(data)
             self.write(buf.end_message())
+            await self.drain()
 
             if not self.buffer.take_message():
                 await self.try_recv_eagerly()
@@ -1040,7 +1578,7 @@ cdef class SansIOProtocol:
 
             ctx.capabilities = self.buffer.read_int64()
             ctx.cardinality = self.buffer.read_byte()
-            ctx.in_dc, ctx.out_dc = self.parse_type_data(ctx.reg)
+            ctx.in_dc, ctx.out_dc = self.parse_type_data(ctx.reg, ctx)
         finally:
             self.buffer.finish_message()
 
@@ -1064,7 +1602,7 @@ cdef class SansIOProtocol:
         finally:
             self.buffer.finish_message()
 
-    cdef parse_type_data(self, CodecsRegistry reg):
+    cdef parse_type_data(self, CodecsRegistry reg, ExecuteContext ctx=None):
         cdef:
             bytes type_id
             BaseCodec in_dc, out_dc
@@ -1076,6 +1614,8 @@ cdef class SansIOProtocol:
             in_dc = reg.get_codec(type_id)
         else:
             in_dc = reg.build_codec(type_data, self.protocol_version)
+        if ctx is not None and ctx.descriptor_cache is not None:
+            ctx.in_type_data = type_data
 
         type_id = self.buffer.read_bytes(16)
         type_data = self.buffer.read_len_prefixed_bytes()
@@ -1084,10 +1624,13 @@ cdef class SansIOProtocol:
             out_dc = reg.get_codec(type_id)
         else:
             out_dc = reg.build_codec(type_data, self.protocol_version)
+        if ctx is not None and ctx.descriptor_cache is not None:
+            ctx.out_type_data = type_data
 
         return in_dc, out_dc
 
-    cdef parse_data_messages(self, BaseCodec out_dc, result):
+    cdef parse_data_messages(self, BaseCodec out_dc, result,
+                             bint lazy=False):
         cdef:
             ReadBuffer buf = self.buffer
 
@@ -1100,6 +1643,8 @@ cdef class SansIOProtocol:
             const char* cbuf
             ssize_t cbuf_len
             object row
+            bint columnar = type(result) is ColumnsBuilder
+            bytes data
 
             FRBuffer _rbuf
             FRBuffer *rbuf = &_rbuf
@@ -1108,10 +1653,16 @@ cdef class SansIOProtocol:
             if buf.get_message_type() != DATA_MSG:
                 raise RuntimeError('first message is not "DataMsg"')
 
-            if not isinstance(result, list):
+            if not isinstance(result, (list, ColumnsBuilder)):
                 raise RuntimeError(
                     f'result is not a list, but {result!r}')
 
+        # Only objects can be decoded lazily.
+        lazy = lazy and (
+            type(out_dc) is ObjectCodec
+            and not (<ObjectCodec>out_dc).is_sparse
+        )
+
         while take_message_type(buf, DATA_MSG):
             cbuf = try_consume_message(buf, &cbuf_len)
             if cbuf == NULL:
@@ -1138,8 +1689,21 @@ cdef class SansIOProtocol:
                 # so we want to skip first 6 bytes:
                 frb_init(rbuf, cbuf + 6, cbuf_len - 6)
 
-            row = decoder(out_dc, rbuf)
-            result.append(row)
+            if columnar:
+                (<ColumnsBuilder>result).decode_row(out_dc, rbuf)
+            elif lazy:
+                # The message buffer is reused, so lazily decoded
+                # objects keep a copy of their row.
+                data = cpython.PyBytes_FromStringAndSize(
+                    rbuf.buf, frb_get_len(rbuf))
+                frb_init(
+                    rbuf, cpython.PyBytes_AS_STRING(data), len(data))
+                row = (<ObjectCodec>out_dc).decode_lazy(data, rbuf)
+                result.append(row)
+            else:
+                row = decoder(out_dc, rbuf)
+                result.append(row)
+            self.rows_decoded += 1
 
             if frb_get_len(rbuf):
                 raise RuntimeError(
@@ -1175,6 +1739,10 @@ cdef class SansIOProtocol:
 
         self.buffer.finish_message()
 
+        # The connection may go back to the pool now, make sure it
+        # still notices if the server closes it.
+        self.maybe_resume_reading()
+
     cdef _amend_parse_error(
         self,
         exc,
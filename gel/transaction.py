@@ -196,6 +196,12 @@ class BaseTransaction:
     def _get_annotations(self) -> typing.Dict[str, str]:
         return self._client._get_annotations()
 
+    def _get_query_timeout(self) -> typing.Optional[float]:
+        return self._client._get_query_timeout()
+
+    def _get_lazy_objects(self) -> bool:
+        return self._client._get_lazy_objects()
+
     async def _query(self, query_context: abstract.QueryContext):
         await self._ensure_transaction()
         return await self._connection.raw_query(query_context)
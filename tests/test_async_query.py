@@ -28,6 +28,16 @@ import uuid
 import asyncio
 import edgedb
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
 from edgedb import abstract
 from gel import _testbase as tb
 from edgedb.options import RetryOptions
@@ -653,6 +663,26 @@ class TestAsyncQuery(tb.AsyncQueryTestCase):
 
         self.assertEqual(testar, val)
 
+    async def test_async_args_bigint_large(self):
+        testar = [
+            2 ** 64 - 1,
+            2 ** 64,
+            -(2 ** 64),
+            10 ** 16 - 1,
+            10 ** 16,
+            7 ** 500,
+            -(3 ** 1000),
+            # More digits than int() parses from a string by default.
+            10 ** 5000 + 1,
+            -(10 ** 5000),
+        ]
+
+        val = await self.client.query_single(
+            'select <array<bigint>>$arg',
+            arg=testar)
+
+        self.assertEqual(testar, val)
+
     async def test_async_args_bigint_pack(self):
         val = await self.client.query_single(
             'select <bigint>$arg',
@@ -1166,3 +1196,268 @@ class TestAsyncQuery(tb.AsyncQueryTestCase):
 
         res = await self.client.query_sql("SELECT FROM generate_series(0, 1)")
         self.assertEqual(res[0].as_dict(), {})
+
+    async def test_async_pipeline_01(self):
+        pipeline = self.client.pipeline()
+        for _ in range(2):
+            # The second run hits the query cache.
+            pipeline.query('select {1, 2, 3}')
+            pipeline.query_single('select <str>$0', 'hello')
+            pipeline.query_required_single_json('select <int64>$a', a=42)
+            pipeline.execute('select 1')
+            self.assertEqual(len(pipeline), 4)
+            res = await pipeline.run()
+            self.assertEqual(
+                res, [edgedb.Set((1, 2, 3)), 'hello', '42', None]
+            )
+            self.assertEqual(len(pipeline), 0)
+
+        self.assertEqual(await self.client.pipeline().run(), [])
+
+    async def test_async_pipeline_02(self):
+        pipeline = self.client.pipeline()
+        pipeline.query('select 1')
+        pipeline.query('select 1 / 0')
+        pipeline.query('select 2')
+        with self.assertRaises(edgedb.DivisionByZeroError):
+            await pipeline.run()
+
+        pipeline.query_required_single('select <str>{}')
+        with self.assertRaises(edgedb.NoDataError):
+            await pipeline.run()
+
+        pipeline.query('select 1')
+        self.assertEqual(await pipeline.run(), [edgedb.Set((1,))])
+
+    async def test_async_execute_many_01(self):
+        await self.client.execute_many(
+            'insert test::Tmp { tmp := <str>$0 }',
+            (('many-{}'.format(i),) for i in range(1000)),
+        )
+        await self.client.execute_many(
+            'insert test::Tmp { tmp := <str>$tmp }',
+            [{'tmp': 'many-named'}],
+        )
+        self.assertEqual(
+            await self.client.query_single('''
+                select count(test::Tmp filter .tmp like 'many-%')
+            '''),
+            1001,
+        )
+        await self.client.execute('''
+            delete test::Tmp filter .tmp like 'many-%'
+        ''')
+
+    async def test_async_execute_many_02(self):
+        with self.assertRaises(edgedb.DivisionByZeroError) as e:
+            await self.client.execute_many(
+                'select 1 // <int64>$0', [(2,), (1,), (0,), (1,)]
+            )
+        self.assertEqual(e.exception.get_args_index(), 2)
+
+        with self.assertRaises(edgedb.QueryArgumentError) as e:
+            await self.client.execute_many(
+                'select 1 // <int64>$0', [(2,), ('1',)]
+            )
+        self.assertEqual(e.exception.get_args_index(), 1)
+
+        await self.client.execute_many('select 1 // <int64>$0', [])
+        self.assertEqual(await self.client.query_single('select 1'), 1)
+
+    async def test_async_query_iter_01(self):
+        rows = []
+        async for row in self.client.query_iter(
+            'select range_unpack(range(0, <int64>$0))', 100_000
+        ):
+            rows.append(row)
+        self.assertEqual(rows, list(range(100_000)))
+
+        rows = [row async for row in self.client.query_iter('select <str>{}')]
+        self.assertEqual(rows, [])
+
+        with self.assertRaises(edgedb.DivisionByZeroError):
+            async for row in self.client.query_iter(
+                'select 1 // {1, 0}'
+            ):
+                pass
+
+    async def test_async_query_iter_02(self):
+        # Stop early: the connection must be released and reusable.
+        client = self.client
+        for _ in range(client.max_concurrency + 1):
+            rows = client.query_iter('select range_unpack(range(0, 100000))')
+            async for row in rows:
+                if row == 10:
+                    break
+            await rows.aclose()
+
+        self.assertEqual(await client.query_single('select 42'), 42)
+
+    async def test_async_query_columns_01(self):
+        cols = await self.client.query_columns('''
+            for x in {1, 2, 3} union (
+                i16 := <int16>x,
+                i32 := <int32>x,
+                i64 := x,
+                f32 := <float32>x / 2,
+                f64 := <float64>x / 2,
+                b := x > 1,
+                dt := <datetime>'2000-01-01T00:00:01Z',
+                s := <str>x,
+            )
+        ''')
+        self.assertEqual(list(cols), [
+            'i16', 'i32', 'i64', 'f32', 'f64', 'b', 'dt', 's'])
+        self.assertEqual(cols['i16'].typecode, 'h')
+        self.assertEqual(cols['i16'].tolist(), [1, 2, 3])
+        self.assertEqual(cols['i32'].tolist(), [1, 2, 3])
+        self.assertEqual(cols['i64'].typecode, 'q')
+        self.assertEqual(cols['i64'].tolist(), [1, 2, 3])
+        self.assertEqual(cols['f32'].tolist(), [0.5, 1.0, 1.5])
+        self.assertEqual(cols['f64'].typecode, 'd')
+        self.assertEqual(cols['f64'].tolist(), [0.5, 1.0, 1.5])
+        self.assertEqual(cols['b'].tolist(), [0, 1, 1])
+        self.assertEqual(cols['dt'].tolist(), [946684801000000] * 3)
+        self.assertEqual(cols['s'], ['1', '2', '3'])
+
+        cols = await self.client.query_columns(
+            'select (<int64>$0, <str>$1)', 42, 'hello')
+        self.assertEqual(cols['0'].tolist(), [42])
+        self.assertEqual(cols['1'], ['hello'])
+
+        cols = await self.client.query_columns(
+            'select (a := <int64>{}, b := <str>{})')
+        self.assertEqual(cols['a'].tolist(), [])
+        self.assertEqual(cols['b'], [])
+
+    async def test_async_query_columns_02(self):
+        cols = await self.client.query_columns('''
+            for x in {1, 2, 3} union {
+                a := x,
+                b := x if x != 2 else <int64>{},
+            }
+        ''')
+        self.assertEqual(cols['a'].tolist(), [1, 2, 3])
+        self.assertEqual(cols['b'], [1, None, 3])
+
+        with self.assertRaisesRegex(
+            edgedb.InterfaceError, r'query_columns\(\) expects'
+        ):
+            await self.client.query_columns('select 1')
+
+        # The connection is still usable.
+        self.assertEqual(await self.client.query_single('select 42'), 42)
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    async def test_async_query_numpy_01(self):
+        cols = await self.client.query_numpy('''
+            for x in {1, 2, 3} union {
+                i64 := x,
+                f64 := <float64>x / 2,
+                b := x > 1,
+                dt := <datetime>'2000-01-01T00:00:01Z',
+                s := <str>x,
+                opt := x if x != 2 else <int64>{},
+            }
+        ''')
+        self.assertEqual(cols['i64'].dtype, numpy.int64)
+        self.assertEqual(cols['i64'].tolist(), [1, 2, 3])
+        self.assertEqual(cols['f64'].tolist(), [0.5, 1.0, 1.5])
+        self.assertEqual(cols['b'].dtype, numpy.bool_)
+        self.assertEqual(cols['b'].tolist(), [False, True, True])
+        self.assertEqual(cols['dt'].dtype, numpy.dtype('datetime64[us]'))
+        self.assertEqual(
+            cols['dt'][0], numpy.datetime64('2000-01-01T00:00:01', 'us'))
+        self.assertEqual(cols['s'].dtype, object)
+        self.assertEqual(cols['s'].tolist(), ['1', '2', '3'])
+        self.assertIsInstance(cols['opt'], numpy.ma.MaskedArray)
+        self.assertEqual(cols['opt'].tolist(), [1, None, 3])
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    async def test_async_query_arrow_01(self):
+        table = await self.client.query_arrow('''
+            for x in {1, 2, 3} union {
+                i64 := x,
+                f64 := <float64>x / 2,
+                b := x > 1,
+                s := <str>x if x != 2 else <str>{},
+                dt := <datetime>'2000-01-01T00:00:01Z',
+                arr := [x, x + 1],
+                tup := (a := x, b := <str>x),
+            }
+        ''')
+        self.assertEqual(table.num_rows, 3)
+        self.assertEqual(table.schema.field('i64').type, pyarrow.int64())
+        self.assertEqual(table.schema.field('f64').type, pyarrow.float64())
+        self.assertEqual(table.schema.field('b').type, pyarrow.bool_())
+        self.assertEqual(
+            table.schema.field('dt').type, pyarrow.timestamp('us', tz='UTC'))
+        self.assertEqual(table.column('i64').to_pylist(), [1, 2, 3])
+        self.assertEqual(table.column('f64').to_pylist(), [0.5, 1.0, 1.5])
+        self.assertEqual(table.column('b').to_pylist(), [False, True, True])
+        self.assertEqual(table.column('s').to_pylist(), ['1', None, '3'])
+        self.assertEqual(
+            table.column('arr').to_pylist(), [[1, 2], [2, 3], [3, 4]])
+        self.assertEqual(
+            table.column('tup').to_pylist()[0], {'a': 1, 'b': '1'})
+
+        table = await self.client.query_arrow(
+            'select (a := <int64>{}, b := <str>{})')
+        self.assertEqual(table.num_rows, 0)
+        self.assertEqual(table.column_names, ['a', 'b'])
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    async def test_async_query_arrow_02(self):
+        # Results larger than a single record batch.
+        table = await self.client.query_arrow('''
+            for x in range_unpack(range(0, 200000)) union (
+                x := x, s := <str>x
+            )
+        ''')
+        self.assertEqual(table.num_rows, 200000)
+        self.assertGreater(len(table.to_batches()), 1)
+        self.assertEqual(
+            table.column('x').to_pylist(), list(range(200000)))
+        self.assertEqual(table.column('s')[199999].as_py(), '199999')
+
+        table = await self.client.query_arrow('''
+            with e := <MyEnum>{'A', 'B', 'A'}
+            select (e := e,)
+        ''')
+        self.assertTrue(pyarrow.types.is_dictionary(table.column('e').type))
+        self.assertEqual(
+            sorted(table.column('e').to_pylist()), ['A', 'A', 'B'])
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    async def test_async_query_arrow_03(self):
+        # Link properties of nested objects.
+        await self.client.execute('''
+            CREATE TYPE test::arrow_target {
+                CREATE PROPERTY val -> str;
+            };
+            CREATE TYPE test::arrow_source {
+                CREATE LINK l -> test::arrow_target {
+                    CREATE PROPERTY weight -> int32;
+                }
+            };
+        ''')
+        try:
+            await self.client.execute('''
+                INSERT test::arrow_source {
+                    l := (INSERT test::arrow_target {
+                        val := "hello",
+                        @weight := 42,
+                    })
+                };
+            ''')
+            table = await self.client.query_arrow('''
+                SELECT test::arrow_source { l: { val, @weight } }
+            ''')
+            self.assertEqual(
+                table.column('l').to_pylist(),
+                [{'val': 'hello', '@weight': 42}])
+        finally:
+            await self.client.execute('''
+                DROP TYPE test::arrow_source;
+                DROP TYPE test::arrow_target;
+            ''')
@@ -17,13 +17,19 @@
 #
 
 import asyncio
+import os
 import random
+import socket
+import tempfile
+import time
 
 import edgedb
 
 from gel import _testbase as tb
 from edgedb import errors
 from edgedb import asyncio_client
+from gel import observers
+from gel.protocol import protocol
 
 
 class TestAsyncIOClient(tb.AsyncQueryTestCase):
@@ -354,6 +360,257 @@ class TestAsyncIOClient(tb.AsyncQueryTestCase):
 
         await client.aclose()
 
+    async def test_client_cache_stats(self):
+        client = self.create_client(max_concurrency=1, query_cache_size=2)
+
+        stats = client.cache_stats()
+        self.assertEqual(stats.query_cache.maxsize, 2)
+        self.assertEqual(stats.query_cache.size, 0)
+        self.assertEqual(stats.codecs.maxsize, 1000)
+
+        for i in range(3):
+            await client.query(f"SELECT {i}")
+        stats = client.cache_stats()
+        self.assertEqual(stats.query_cache.size, 2)
+        self.assertEqual(stats.query_cache.evictions, 1)
+        self.assertGreater(stats.codecs.size, 0)
+
+        hits = stats.query_cache.hits
+        await client.query("SELECT 2")
+        self.assertEqual(client.cache_stats().query_cache.hits, hits + 1)
+
+        await client.aclose()
+
+    async def test_client_pool_stats(self):
+        client = self.create_client(max_concurrency=1)
+
+        stats = client.pool_stats()
+        self.assertEqual(stats.max_concurrency, 1)
+        self.assertEqual(stats.free, 1)
+        self.assertEqual(stats.acquires, 0)
+
+        await asyncio.gather(*[client.query("SELECT 1") for _ in range(3)])
+
+        stats = client.pool_stats()
+        self.assertEqual(stats.free, 1)
+        self.assertEqual(stats.waiters, 0)
+        self.assertEqual(stats.acquires, 3)
+        # The first query took the free connection, the others waited.
+        self.assertEqual(stats.waits, 2)
+        self.assertEqual(sum(n for _, n in stats.wait_time_histogram), 2)
+        self.assertGreater(stats.wait_time, 0)
+
+        await client.aclose()
+
+    async def test_client_query_observer(self):
+        finished = []
+
+        class Observer(observers.QueryObserver):
+            def query_started(self, query, query_hash):
+                return query
+
+            def query_finished(self, token, stats, error):
+                finished.append((token, stats, error))
+
+        client = self.create_client(max_concurrency=1)
+        observer = Observer()
+        client.add_query_observer(observer)
+
+        await client.query("SELECT {1, 2, 3}")
+        await client.query("SELECT {1, 2, 3}")
+        with self.assertRaises(errors.DivisionByZeroError):
+            await client.query("SELECT 1 / 0")
+        client.remove_query_observer(observer)
+        await client.query("SELECT {1, 2, 3}")
+
+        self.assertEqual(len(finished), 3)
+        query, stats, error = finished[1]
+        self.assertEqual(query, "SELECT {1, 2, 3}")
+        self.assertEqual(stats.query_hash, finished[0][1].query_hash)
+        self.assertTrue(stats.cache_hit)
+        self.assertEqual(stats.rows, 3)
+        self.assertEqual(stats.attempts, 1)
+        self.assertGreater(stats.bytes_sent, 0)
+        self.assertGreater(stats.bytes_received, 0)
+        self.assertIsNone(error)
+        self.assertIsInstance(finished[2][2], errors.DivisionByZeroError)
+
+        await client.aclose()
+
+    async def test_client_min_size(self):
+        with self.assertRaises(ValueError):
+            self.create_client(max_concurrency=1, min_size=2)
+
+        client = self.create_client(max_concurrency=3, min_size=2)
+        self.assertEqual(client.min_size, 2)
+
+        def open_count():
+            return sum(
+                ch._con is not None and not ch._con.is_closed()
+                for ch in client._impl._holders
+            )
+
+        await client.prewarm().ensure_connected()
+        for _ in range(100):
+            if open_count() >= 2:
+                break
+            await asyncio.sleep(0.1)
+        self.assertEqual(open_count(), 2)
+        self.assertEqual(client.free_size, 3)
+
+        # A lost connection is replaced in the background.
+        for ch in client._impl._holders:
+            if ch._con is not None:
+                ch._con.terminate()
+                break
+        for _ in range(100):
+            if open_count() >= 2:
+                break
+            await asyncio.sleep(0.1)
+        self.assertEqual(open_count(), 2)
+
+        await client.aclose()
+
+    async def test_client_max_idle_time(self):
+        client = self.create_client(
+            max_concurrency=3, min_size=1, max_idle_time=0.5
+        )
+
+        def open_count():
+            return sum(
+                ch._con is not None and not ch._con.is_closed()
+                for ch in client._impl._holders
+            )
+
+        await client.ensure_connected()
+        client.prewarm(3)
+        for _ in range(100):
+            if open_count() == 3:
+                break
+            await asyncio.sleep(0.05)
+        self.assertEqual(open_count(), 3)
+
+        # Idle connections are closed down to min_size.
+        for _ in range(100):
+            if open_count() == 1:
+                break
+            await asyncio.sleep(0.1)
+        self.assertEqual(open_count(), 1)
+        self.assertEqual(client.free_size, 3)
+        self.assertEqual(await client.query_single("SELECT 1"), 1)
+
+        await client.aclose()
+
+    async def test_client_multi_host(self):
+        with socket.socket() as sock:
+            sock.bind(("localhost", 0))
+            unused_port = sock.getsockname()[1]
+        port = self.get_connect_args()["port"]
+
+        client = self.create_client(
+            host=f"localhost,localhost:{unused_port}",
+            port=port,
+            max_concurrency=2,
+        )
+        cons = [await client._impl.acquire() for _ in range(2)]
+        for con in cons:
+            self.assertEqual(con.connected_addr(), ("localhost", port))
+            await client._impl.release(con)
+
+        # The second connection went to the host with less load first,
+        # which is down and is not used until its backoff expires.
+        hosts = client._impl._hosts
+        self.assertEqual(hosts[0].failures, 0)
+        self.assertEqual(hosts[1].failures, 1)
+        self.assertFalse(hosts[1].is_available(time.monotonic()))
+        self.assertEqual(await client.query_single("SELECT 1"), 1)
+
+        await client.aclose()
+
+    async def test_client_query_timeout(self):
+        client = self.create_client(max_concurrency=1)
+
+        has_sleep = await client.query_single("""
+            SELECT EXISTS(
+                SELECT schema::Function FILTER .name = 'sys::_sleep'
+            )
+        """)
+        if not has_sleep:
+            self.skipTest("No sys::_sleep function")
+
+        for timeout in (0, -1, True, "1"):
+            with self.assertRaises(errors.InvalidArgumentError):
+                client.with_query_timeout(timeout)
+
+        with self.assertRaises(errors.QueryTimeoutError):
+            await client.with_query_timeout(0.2).query(
+                "SELECT sys::_sleep(3)")
+
+        # The server cancelled the query, the connection is still pooled.
+        self.assertEqual(await client.query_single("SELECT 1"), 1)
+        self.assertEqual(client.free_size, 1)
+
+        await client.aclose()
+
+    async def test_client_share_codecs(self):
+        client1 = self.create_client(max_concurrency=1, share_codecs=True)
+        client2 = self.create_client(max_concurrency=1, share_codecs=True)
+        client3 = self.create_client(max_concurrency=1)
+
+        for client in (client1, client2, client3):
+            await client.query("SELECT (a := 1, b := 'x')")
+
+        self.assertIs(
+            client1._impl.codecs_registry, client2._impl.codecs_registry)
+        self.assertIsNot(
+            client1._impl.codecs_registry, client3._impl.codecs_registry)
+
+        await client1.aclose()
+        await client2.aclose()
+        await client3.aclose()
+
+    async def test_client_descriptor_cache(self):
+        query = "SELECT (a := <int64>$a, b := <str>$b)"
+        with tempfile.TemporaryDirectory() as cache_dir:
+            client = self.create_client(descriptor_cache_dir=cache_dir)
+            r = await client.query_single(query, a=1, b="x")
+            self.assertEqual((r.a, r.b), (1, "x"))
+            await client.aclose()
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+            # A new client picks the descriptors up from the file.
+            client = self.create_client(descriptor_cache_dir=cache_dir)
+            await client.ensure_connected()
+            self.assertIsNotNone(
+                client._impl.descriptor_cache.get(
+                    (query, protocol.OutputFormat.BINARY, 0,
+                     False, False, True)))
+            r = await client.query_single(query, a=2, b="y")
+            self.assertEqual((r.a, r.b), (2, "y"))
+            await client.aclose()
+
+    async def test_client_descriptor_cache_outdated(self):
+        def key(query):
+            return (query, protocol.OutputFormat.BINARY, 0, False, False, True)
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            client = self.create_client(descriptor_cache_dir=cache_dir)
+            self.assertEqual(
+                await client.query_single("SELECT <int32>$0", 1), 1)
+
+            # Pretend that the input type of another query has changed
+            # since its descriptor was stored: the server rejects the
+            # outdated descriptor and the query is transparently retried.
+            cache = client._impl.descriptor_cache
+            cache.put(
+                key("SELECT <int64>$0"), cache.get(key("SELECT <int32>$0")))
+            client._impl.query_cache.clear()
+            self.assertEqual(
+                await client.query_single("SELECT <int64>$0", 2), 2)
+            self.assertEqual(
+                await client.query_single("SELECT <int64>$0", 3), 3)
+            await client.aclose()
+
     async def _test_connection_broken(self, executor, broken_evt):
         broken_evt.set()
 
@@ -19,6 +19,7 @@
 import asyncio
 import queue
 import random
+import socket
 import threading
 import time
 
@@ -27,6 +28,7 @@ import edgedb
 from gel import _testbase as tb
 from edgedb import errors
 from edgedb import blocking_client
+from gel import observers
 
 
 class TestBlockingClient(tb.SyncQueryTestCase):
@@ -363,6 +365,216 @@ class TestBlockingClient(tb.SyncQueryTestCase):
 
         client.close()
 
+    def test_client_cache_stats(self):
+        client = self.create_client(max_concurrency=1, query_cache_size=2)
+
+        stats = client.cache_stats()
+        self.assertEqual(stats.query_cache.maxsize, 2)
+        self.assertEqual(stats.query_cache.size, 0)
+        self.assertEqual(stats.codecs.maxsize, 1000)
+
+        for i in range(3):
+            client.query(f"SELECT {i}")
+        stats = client.cache_stats()
+        self.assertEqual(stats.query_cache.size, 2)
+        self.assertEqual(stats.query_cache.evictions, 1)
+        self.assertGreater(stats.codecs.size, 0)
+
+        hits = stats.query_cache.hits
+        client.query("SELECT 2")
+        self.assertEqual(client.cache_stats().query_cache.hits, hits + 1)
+
+        client.close()
+
+    def test_client_query_observer(self):
+        finished = []
+
+        class Observer(observers.QueryObserver):
+            def query_started(self, query, query_hash):
+                return query
+
+            def query_finished(self, token, stats, error):
+                finished.append((token, stats, error))
+
+        client = self.create_client(max_concurrency=1)
+        observer = Observer()
+        client.add_query_observer(observer)
+
+        client.query("SELECT {1, 2, 3}")
+        client.query("SELECT {1, 2, 3}")
+        with self.assertRaises(errors.DivisionByZeroError):
+            client.query("SELECT 1 / 0")
+        client.remove_query_observer(observer)
+        client.query("SELECT {1, 2, 3}")
+
+        self.assertEqual(len(finished), 3)
+        query, stats, error = finished[1]
+        self.assertEqual(query, "SELECT {1, 2, 3}")
+        self.assertEqual(stats.query_hash, finished[0][1].query_hash)
+        self.assertTrue(stats.cache_hit)
+        self.assertEqual(stats.rows, 3)
+        self.assertEqual(stats.attempts, 1)
+        self.assertGreater(stats.bytes_sent, 0)
+        self.assertGreater(stats.bytes_received, 0)
+        self.assertIsNone(error)
+        self.assertIsInstance(finished[2][2], errors.DivisionByZeroError)
+
+        client.close()
+
+    def test_client_pool_stats(self):
+        client = self.create_client(max_concurrency=1)
+
+        stats = client.pool_stats()
+        self.assertEqual(stats.max_concurrency, 1)
+        self.assertEqual(stats.free, 1)
+        self.assertEqual(stats.acquires, 0)
+
+        for _ in range(3):
+            client.query("SELECT 1")
+        stats = client.pool_stats()
+        self.assertEqual(stats.acquires, 3)
+        self.assertEqual(stats.waits, 0)
+
+        waiting = threading.Event()
+        for tx in client.transaction():
+            with tx:
+                tx.query("SELECT 1")
+                t = threading.Thread(
+                    target=lambda: (waiting.set(), client.query("SELECT 1"))
+                )
+                t.start()
+                waiting.wait()
+                for _ in range(100):
+                    if client.pool_stats().waiters == 1:
+                        break
+                    time.sleep(0.01)
+                self.assertEqual(client.pool_stats().waiters, 1)
+                self.assertEqual(client.pool_stats().free, 0)
+        t.join()
+
+        stats = client.pool_stats()
+        self.assertEqual(stats.waiters, 0)
+        self.assertEqual(stats.waits, 1)
+        self.assertEqual(stats.acquires, 5)
+        self.assertEqual(sum(n for _, n in stats.wait_time_histogram), 1)
+
+        client.close()
+
+    def test_client_min_size(self):
+        with self.assertRaises(ValueError):
+            self.create_client(max_concurrency=1, min_size=2)
+
+        client = self.create_client(max_concurrency=3, min_size=2)
+        self.assertEqual(client.min_size, 2)
+
+        def open_count():
+            return sum(
+                ch._con is not None and not ch._con.is_closed()
+                for ch in client._impl._holders
+            )
+
+        client.prewarm().ensure_connected()
+        for _ in range(100):
+            if open_count() >= 2:
+                break
+            time.sleep(0.1)
+        self.assertEqual(open_count(), 2)
+        self.assertEqual(client.free_size, 3)
+
+        # A lost connection is replaced in the background.
+        for ch in client._impl._holders:
+            if ch._con is not None:
+                ch._con.terminate()
+                break
+        for _ in range(100):
+            if open_count() >= 2:
+                break
+            time.sleep(0.1)
+        self.assertEqual(open_count(), 2)
+
+        client.close()
+
+    def test_client_max_idle_time(self):
+        client = self.create_client(
+            max_concurrency=3, min_size=1, max_idle_time=0.5
+        )
+
+        def open_count():
+            return sum(
+                ch._con is not None and not ch._con.is_closed()
+                for ch in client._impl._holders
+            )
+
+        client.ensure_connected()
+        client.prewarm(3)
+        for _ in range(100):
+            if open_count() == 3:
+                break
+            time.sleep(0.05)
+        self.assertEqual(open_count(), 3)
+
+        # Idle connections are closed down to min_size.
+        for _ in range(100):
+            if open_count() == 1:
+                break
+            time.sleep(0.1)
+        self.assertEqual(open_count(), 1)
+        self.assertEqual(client.free_size, 3)
+        self.assertEqual(client.query_single("SELECT 1"), 1)
+
+        client.close()
+
+    def test_client_multi_host(self):
+        with socket.socket() as sock:
+            sock.bind(("localhost", 0))
+            unused_port = sock.getsockname()[1]
+        port = self.get_connect_args()["port"]
+
+        client = self.create_client(
+            host=f"localhost,localhost:{unused_port}",
+            port=port,
+            max_concurrency=2,
+        )
+        cons = [client._iter_coroutine(client._impl.acquire())
+                for _ in range(2)]
+        for con in cons:
+            self.assertEqual(con.connected_addr(), ("localhost", port))
+            client._iter_coroutine(client._impl.release(con))
+
+        # The second connection went to the host with less load first,
+        # which is down and is not used until its backoff expires.
+        hosts = client._impl._hosts
+        self.assertEqual(hosts[0].failures, 0)
+        self.assertEqual(hosts[1].failures, 1)
+        self.assertFalse(hosts[1].is_available(time.monotonic()))
+        self.assertEqual(client.query_single("SELECT 1"), 1)
+
+        client.close()
+
+    def test_client_query_timeout(self):
+        client = self.create_client(max_concurrency=1)
+
+        has_sleep = client.query_single("""
+            SELECT EXISTS(
+                SELECT schema::Function FILTER .name = 'sys::_sleep'
+            )
+        """)
+        if not has_sleep:
+            self.skipTest("No sys::_sleep function")
+
+        for timeout in (0, -1, True, "1"):
+            with self.assertRaises(errors.InvalidArgumentError):
+                client.with_query_timeout(timeout)
+
+        with self.assertRaises(errors.QueryTimeoutError):
+            client.with_query_timeout(0.2).query("SELECT sys::_sleep(3)")
+
+        # The server cancelled the query, the connection is still pooled.
+        self.assertEqual(client.query_single("SELECT 1"), 1)
+        self.assertEqual(client.free_size, 1)
+
+        client.close()
+
     def _test_connection_broken(self, executor, broken_evt):
         self.loop.call_soon_threadsafe(broken_evt.set)
 
@@ -460,6 +460,43 @@ class TestConUtils(unittest.TestCase):
         self.assertEqual(connect_config.password, 'passw1')
         self.assertEqual(connect_config.database, 'inst1_db')
 
+    def test_split_hosts(self):
+        args = {'dsn': 'gel://user@h1,h2:5657,[::1]:3/db?x=1', 'host': None}
+        self.assertEqual(
+            [a['dsn'] for a in con_utils.split_hosts(args)],
+            [
+                'gel://user@h1/db?x=1',
+                'gel://user@h2:5657/db?x=1',
+                'gel://user@[::1]:3/db?x=1',
+            ],
+        )
+
+        args = {'dsn': None, 'host': 'h1,h2:5657,[::1]', 'port': 5658}
+        self.assertEqual(
+            [(a['host'], a['port']) for a in con_utils.split_hosts(args)],
+            [('h1', 5658), ('h2', 5657), ('::1', 5658)],
+        )
+
+        for args in [
+            {'dsn': 'gel://user@h1/db', 'host': None},
+            {'dsn': None, 'host': 'h1', 'port': 5658},
+            {'dsn': 'instance', 'host': None},
+            {'dsn': None, 'host': None},
+        ]:
+            with self.subTest(args):
+                self.assertEqual(con_utils.split_hosts(args), [args])
+
+        args = {'dsn': None, 'host': ['h1', 'h2'], 'port': [1, 2]}
+        self.assertEqual(
+            [(a['host'], a['port']) for a in con_utils.split_hosts(args)],
+            [('h1', 1), ('h2', 2)],
+        )
+
+        with self.assertRaises(ValueError):
+            con_utils.split_hosts({'dsn': None, 'host': 'h1,h2:port'})
+        with self.assertRaises(ValueError):
+            con_utils.split_hosts({'dsn': None, 'host': 'h1,h2', 'port': [1]})
+
     def test_validate_wait_until_available(self):
         invalid = [
             ' ',
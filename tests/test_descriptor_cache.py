@@ -0,0 +1,94 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2016-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import os
+import tempfile
+import unittest
+
+from gel import _descriptor_cache
+
+
+def _key(i):
+    return (f'SELECT {i}', 98, 0, False, False, False)
+
+
+def _entry(i):
+    return (b'm', i, b'\x00' * 16, b'', bytes([i]) * 16, b'desc%d' % i)
+
+
+class TestDescriptorCache(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+
+    def open(self, addr=('localhost', 5656), maxsize=10):
+        cache = _descriptor_cache.DescriptorCache(
+            self.dir.name, maxsize=maxsize)
+        cache.bind(addr, 'main', (3, 0))
+        return cache
+
+    def test_descriptor_cache_roundtrip(self):
+        cache = _descriptor_cache.DescriptorCache(self.dir.name, maxsize=10)
+        # Nothing is stored until the cache is bound to a server.
+        cache.put(_key(0), _entry(0))
+        self.assertEqual(os.listdir(self.dir.name), [])
+
+        cache = self.open()
+        self.assertEqual(cache.protocol_version, (3, 0))
+        for i in range(3):
+            cache.put(_key(i), _entry(i))
+        cache.put(_key(1), _entry(5))
+
+        cache = self.open()
+        self.assertEqual(cache.get(_key(0)), _entry(0))
+        self.assertEqual(cache.get(_key(1)), _entry(5))
+        self.assertEqual(cache.get(_key(2)), _entry(2))
+        self.assertIsNone(cache.get(_key(3)))
+
+        cache = self.open(addr=('localhost', 5657))
+        self.assertIsNone(cache.get(_key(0)))
+
+    def test_descriptor_cache_bounded(self):
+        cache = self.open(maxsize=3)
+        for i in range(20):
+            cache.put(_key(i), _entry(i))
+
+        [fn] = os.listdir(self.dir.name)
+        with open(os.path.join(self.dir.name, fn)) as f:
+            self.assertLessEqual(len(f.readlines()), 6)
+
+        cache = self.open(maxsize=3)
+        for i in range(17):
+            self.assertIsNone(cache.get(_key(i)))
+        for i in range(17, 20):
+            self.assertEqual(cache.get(_key(i)), _entry(i))
+
+    def test_descriptor_cache_corrupted(self):
+        cache = self.open()
+        cache.put(_key(0), _entry(0))
+        [fn] = os.listdir(self.dir.name)
+        with open(os.path.join(self.dir.name, fn), 'a') as f:
+            f.write('["SELECT 1", 98, 0, fal\n')
+            f.write('garbage\n')
+        cache.put(_key(1), _entry(1))
+
+        cache = self.open()
+        self.assertEqual(cache.get(_key(0)), _entry(0))
+        self.assertEqual(cache.get(_key(1)), _entry(1))
@@ -0,0 +1,407 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2019-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import asyncio
+import datetime
+import unittest
+
+import edgedb
+
+from gel import _testbase as tb
+from gel import base_client
+from edgedb import errors
+
+from . import _fakeserver as fs
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+def _no_backoff(attempt):
+    return 0
+
+
+class TestFakeServer(tb.TestCase):
+
+    USER = fs.Shape({
+        'name': fs.Scalar('std::str'),
+        'age': fs.Scalar('std::int64'),
+    }, type_name='default::User')
+
+    def make_server(self, **kwargs):
+        return fs.FakeServer([
+            fs.Query(
+                'SELECT User { name, age }',
+                output=self.USER,
+                rows=[{'name': 'alice', 'age': 42}],
+            ),
+        ], **kwargs)
+
+    async def start_server(self, **kwargs):
+        server = self.make_server(**kwargs)
+        await server.start()
+        self.addCleanup(server.stop)
+        return server
+
+    def create_client(self, server, **kwargs):
+        client = edgedb.create_async_client(
+            **server.connect_args(), **kwargs
+        ).with_retry_options(edgedb.RetryOptions(3, _no_backoff))
+        self.addCleanup(client.aclose)
+        return client
+
+    async def test_fakeserver_query(self):
+        server = await self.start_server()
+        client = self.create_client(server)
+        user = await client.query_required_single('SELECT User { name, age }')
+        self.assertEqual((user.name, user.age), ('alice', 42))
+
+        with self.assertRaises(errors.InvalidReferenceError):
+            await client.query('SELECT Unknown')
+
+    async def test_fakeserver_scram(self):
+        server = await self.start_server(users={'admin': 'secret'})
+        client = self.create_client(server, user='admin', password='secret')
+        users = await client.query('SELECT User { name, age }')
+        self.assertEqual(len(users), 1)
+
+        client = self.create_client(server, user='admin', password='wrong')
+        with self.assertRaises(errors.AuthenticationError):
+            await client.ensure_connected()
+
+    async def test_fakeserver_retry(self):
+        server = await self.start_server()
+        client = self.create_client(server)
+        fault = server.inject(errors.TransactionConflictError, times=2)
+        await client.query('SELECT User { name, age }')
+        self.assertEqual(fault.hits, 2)
+        self.assertEqual(server.executed['SELECT User { name, age }'], 3)
+
+        server.inject(errors.TransactionConflictError, times=None)
+        with self.assertRaises(errors.TransactionConflictError):
+            await client.query('SELECT User { name, age }')
+        self.assertEqual(server.executed['SELECT User { name, age }'], 6)
+
+    async def test_fakeserver_transaction_retry(self):
+        server = await self.start_server()
+        client = self.create_client(server)
+        server.inject(errors.TransactionConflictError, query='COMMIT;')
+        async for tx in client.transaction():
+            async with tx:
+                await tx.query('SELECT User { name, age }')
+        self.assertEqual(server.executed['COMMIT;'], 2)
+        self.assertEqual(server.executed['ROLLBACK;'], 1)
+
+    async def test_fakeserver_disconnect(self):
+        server = await self.start_server()
+        client = self.create_client(server)
+        await client.query('SELECT User { name, age }')
+        connections = server.connection_count
+        server.inject(errors.IdleSessionTimeoutError, disconnect=True)
+        await client.query('SELECT User { name, age }')
+        self.assertEqual(server.connection_count, connections + 1)
+
+    async def test_fakeserver_idle_timeout(self):
+        server = await self.start_server(
+            session_idle_timeout=datetime.timedelta(seconds=0.1))
+        client = self.create_client(server)
+        await client.query('SELECT User { name, age }')
+        connections = server.connection_count
+        await asyncio.sleep(0.3)
+        await client.query('SELECT User { name, age }')
+        self.assertEqual(server.connection_count, connections + 1)
+
+    async def test_fakeserver_execute_many_backpressure(self):
+        # The server reads slower than the client writes, so the
+        # client has to wait for the transport to drain.
+        server = await self.start_server(latency=0.002)
+        server.add_query(fs.Query(
+            'INSERT User { name := <str>$name }',
+            args=fs.Shape({'name': fs.Scalar('std::str')}),
+            status='INSERT',
+        ))
+        client = self.create_client(server, max_concurrency=1)
+        await client.execute_many(
+            'INSERT User { name := <str>$name }',
+            [{'name': str(i) * 1000} for i in range(4000)],
+        )
+        self.assertEqual(
+            server.executed['INSERT User { name := <str>$name }'], 4000)
+        protocol = client._impl._holders[0]._con._protocol
+        self.assertGreater(protocol.drain_waits, 0)
+
+    async def test_fakeserver_execute_many_encode_error(self):
+        server = await self.start_server()
+        query = 'INSERT User { name := <str>$name, age := <int64>$age }'
+        server.add_query(fs.Query(
+            query,
+            args=fs.Shape({
+                'name': fs.Scalar('std::str'),
+                'age': fs.Scalar('std::int64'),
+            }),
+            status='INSERT',
+        ))
+        client = self.create_client(server, max_concurrency=1)
+        # Enough argument sets for some of them to be flushed before
+        # the one that cannot be encoded.
+        args_seq = [{'name': 'x' * 1000, 'age': i} for i in range(200)]
+        args_seq.append({'name': 'overflow', 'age': 2 ** 70})
+
+        with self.assertRaises(errors.InvalidArgumentError) as cm:
+            await client.execute_many(query, args_seq)
+        self.assertEqual(cm.exception.get_args_index(), 200)
+        self.assertIsInstance(cm.exception.__cause__, OverflowError)
+        # The preceding argument sets are synced by execute_many()
+        # itself rather than by the next query on the connection.
+        self.assertEqual(server.executed[query], 200)
+        await client.query('SELECT User { name, age }')
+        self.assertEqual(server.executed[query], 200)
+
+        # A server error for an argument set flushed before the
+        # encoding error is the one reported.
+        server.inject(errors.ConstraintViolationError, query=query,
+                      delay=0.1)
+        with self.assertRaises(errors.ConstraintViolationError) as cm:
+            await client.execute_many(query, args_seq)
+        self.assertEqual(cm.exception.get_args_index(), 0)
+        await client.query('SELECT User { name, age }')
+
+    async def test_fakeserver_query_iter_stop_early(self):
+        server = await self.start_server()
+        server.add_query(fs.Query(
+            'SELECT Log',
+            output=fs.Scalar('std::str'),
+            rows=['x' * 1000] * 10000,
+        ))
+        client = self.create_client(server, max_concurrency=1)
+        await client.ensure_connected()
+        connections = server.connection_count
+
+        rows = client.query_iter('SELECT Log')
+        try:
+            async for _ in rows:
+                break
+        finally:
+            await rows.aclose()
+
+        # The rest of the result is not read: the connection is reset
+        # instead, and a new one is made for the next query.
+        users = await client.query('SELECT User { name, age }')
+        self.assertEqual(len(users), 1)
+        self.assertEqual(server.connection_count, connections + 1)
+
+    async def test_fakeserver_query_iter_stop_early_in_transaction(self):
+        server = await self.start_server()
+        server.add_query(fs.Query(
+            'SELECT Log',
+            output=fs.Scalar('std::str'),
+            rows=['x' * 1000] * 10000,
+        ))
+        client = self.create_client(server, max_concurrency=1)
+        await client.ensure_connected()
+        connections = server.connection_count
+
+        async for tx in client.transaction():
+            async with tx:
+                await tx.query('SELECT User { name, age }')
+                rows = await tx._connection.raw_query_iter(
+                    client._make_query_iter_context('SELECT Log', (), {}))
+                try:
+                    async for _ in rows:
+                        break
+                finally:
+                    await rows.aclose()
+
+                # The rest of the result is skipped rather than the
+                # connection reset, so the transaction can go on.
+                users = await tx.query('SELECT User { name, age }')
+                self.assertEqual(len(users), 1)
+
+        self.assertEqual(server.connection_count, connections)
+        self.assertEqual(server.executed['SELECT Log'], 1)
+        self.assertEqual(server.executed['COMMIT;'], 1)
+
+    async def test_fakeserver_resume_reading(self):
+        server = await self.start_server()
+        server.add_query(fs.Query(
+            'SELECT Log',
+            output=fs.Scalar('std::str'),
+            rows=['x' * 1000] * 1200,
+        ))
+        client = self.create_client(server, max_concurrency=1)
+        # The reply fits in the socket buffers and rows are consumed
+        # slower than they arrive, so reading gets paused with the rest
+        # of the reply, including ReadyForCommand, already buffered.
+        count = 0
+        async for _ in client.query_iter('SELECT Log'):
+            count += 1
+            await asyncio.sleep(0)
+        self.assertEqual(count, 1200)
+
+        # The idle connection must not be left with reading paused.
+        protocol = client._impl._holders[0]._con._protocol
+        self.assertFalse(protocol.reading_paused)
+
+    async def test_fakeserver_lazy_objects(self):
+        server = await self.start_server()
+        server.add_query(fs.Query(
+            'SELECT Post { title, body, author: { name, age } }',
+            output=fs.Shape({
+                'title': fs.Scalar('std::str'),
+                'body': fs.Scalar('std::str'),
+                'author': self.USER,
+            }, type_name='default::Post'),
+            rows=[
+                {
+                    'title': 'hello',
+                    'body': None,
+                    'author': {'name': 'alice', 'age': 42},
+                },
+            ],
+        ))
+        client = self.create_client(server)
+        query = 'SELECT Post { title, body, author: { name, age } }'
+
+        eager = await client.query_single(query)
+        post = await client.with_lazy_objects().query_single(query)
+        self.assertEqual(post.title, 'hello')
+        self.assertIsNone(post.body)
+        self.assertEqual(post.author.age, 42)
+        self.assertEqual(repr(post), repr(eager))
+
+        # Eager decoding can be switched back on.
+        post = await client.with_lazy_objects(False).query_single(query)
+        self.assertEqual(repr(post), repr(eager))
+
+    async def test_fakeserver_fixed_width_scalars(self):
+        server = await self.start_server()
+        fixed = ['int16', 'int32', 'int64', 'float32', 'float64', 'bool']
+        server.add_query(fs.Query(
+            'SELECT Metrics',
+            output=fs.Shape({
+                **{name: fs.Scalar(f'std::{name}') for name in fixed},
+                'pair': fs.Tuple(fs.Scalar('std::int64'),
+                                 fs.Scalar('std::bool')),
+                'counts': fs.Array(fs.Scalar('std::int32')),
+            }, type_name='default::Metrics'),
+            rows=[
+                {
+                    'int16': -2, 'int32': 2 ** 31 - 1, 'int64': -2 ** 63,
+                    'float32': 0.5, 'float64': 1e300, 'bool': True,
+                    'pair': (7, False), 'counts': [1, None, -3],
+                },
+                {
+                    'int16': None, 'int32': None, 'int64': None,
+                    'float32': None, 'float64': None, 'bool': None,
+                    'pair': None, 'counts': [],
+                },
+            ],
+        ))
+        client = self.create_client(server)
+
+        full, empty = await client.query('SELECT Metrics')
+        self.assertEqual(
+            [getattr(full, name) for name in fixed],
+            [-2, 2 ** 31 - 1, -2 ** 63, 0.5, 1e300, True])
+        self.assertIs(full.bool, True)
+        self.assertEqual(full.pair, (7, False))
+        self.assertEqual(full.counts, [1, None, -3])
+        for name in fixed + ['pair']:
+            self.assertIsNone(getattr(empty, name))
+        self.assertEqual(empty.counts, [])
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    async def test_fakeserver_arrow_link_properties(self):
+        server = await self.start_server()
+        server.add_query(fs.Query(
+            'SELECT Post { title, author: { name, @role } }',
+            output=fs.Shape({
+                'title': fs.Scalar('std::str'),
+                'author': fs.Shape({
+                    'name': fs.Scalar('std::str'),
+                    '@role': fs.Scalar('std::str'),
+                }, type_name='default::User'),
+            }, type_name='default::Post'),
+            rows=[
+                {
+                    'title': 'hello',
+                    'author': {'name': 'alice', '@role': 'editor'},
+                },
+                {'title': 'draft', 'author': None},
+            ],
+        ))
+        client = self.create_client(server)
+
+        table = await client.query_arrow(
+            'SELECT Post { title, author: { name, @role } }')
+        self.assertEqual(table.column('title').to_pylist(),
+                         ['hello', 'draft'])
+        self.assertEqual(
+            table.column('author').to_pylist(),
+            [{'name': 'alice', '@role': 'editor'}, None])
+
+    async def test_fakeserver_share_codecs(self):
+        server = await self.start_server()
+        client1 = self.create_client(server, share_codecs=True)
+        client2 = self.create_client(server, share_codecs=True)
+        client3 = self.create_client(server)
+        for client in (client1, client2, client3):
+            await client.query('SELECT User { name, age }')
+
+        reg = client1._impl.codecs_registry
+        self.assertIs(client2._impl.codecs_registry, reg)
+        self.assertIsNot(client3._impl.codecs_registry, reg)
+
+        # Registries are per protocol version as well.
+        protocol = client1._impl._holders[0]._con._protocol
+        key = (
+            client1._impl._working_addr,
+            client1._impl._working_params.branch,
+            protocol.protocol_version,
+        )
+        self.assertIs(base_client._shared_codecs_registries[key], reg)
+
+    async def test_fakeserver_pool_load(self):
+        server = await self.start_server(latency=0.01)
+        client = self.create_client(server, max_concurrency=4)
+        await asyncio.gather(*(
+            client.query('SELECT User { name, age }') for _ in range(20)
+        ))
+        self.assertLessEqual(server.peak_connections, 4)
+        self.assertEqual(server.executed['SELECT User { name, age }'], 20)
+
+    def test_fakeserver_blocking(self):
+        server = self.make_server(users={'admin': 'secret'})
+        with server.run_in_thread():
+            client = edgedb.create_client(
+                **server.connect_args(), user='admin', password='secret')
+            try:
+                server.inject(
+                    errors.TransactionConflictError,
+                    query='SELECT User { name, age }')
+                for tx in client.transaction():
+                    with tx:
+                        user = tx.query_required_single(
+                            'SELECT User { name, age }')
+                self.assertEqual(user.name, 'alice')
+                self.assertEqual(
+                    server.executed['SELECT User { name, age }'], 2)
+            finally:
+                client.close()
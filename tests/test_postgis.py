@@ -554,3 +554,27 @@ class TestPostgis(tb.SyncQueryTestCase):
             select <box3d>{text!r} = (<tuple<box3d, str>>$0).0
         ''', (Geo(wkb=data), 'ok'))
         self.assertTrue(val)
+
+    def test_postgis_10(self):
+        # All decoded values share one named tuple type.
+        vals = self.client.query('''
+            with module ext::postgis
+            select {<geometry>'point(1 2)', <geometry>'point(3 4)'}
+        ''')
+        geog = self.client.query_single('''
+            with module ext::postgis
+            select <geography>'point(1 2)'
+        ''')
+        self.assertIs(type(vals[0]), type(vals[1]))
+        self.assertIs(type(vals[0]), type(geog))
+        self.assertEqual(
+            vals[0].wkb,
+            b'\x01\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\xf0?\x00\x00'
+            b'\x00\x00\x00\x00\x00@',
+        )
+        # Geography is encoded as EWKB with the default SRID 4326.
+        self.assertEqual(
+            geog.wkb,
+            b'\x01\x01\x00\x00 \xe6\x10\x00\x00\x00\x00\x00\x00\x00\x00'
+            b'\xf0?\x00\x00\x00\x00\x00\x00\x00@',
+        )
@@ -17,9 +17,12 @@
 #
 
 
+import datetime
+
 from gel import _testbase as tb
 
 from edgedb import State
+from edgedb import abstract
 
 
 class TestState(tb.TestCase):
@@ -124,3 +127,33 @@ class TestState(tb.TestCase):
             .as_dict()["globals"],
             {"m::i": 4, "y::g3": "3333"},
         )
+
+    def test_state_lowered(self):
+        s1 = State.defaults().with_default_module("m")
+
+        # The same dict is handed to the protocol, which caches the
+        # encoded state by identity.
+        d1 = abstract._lower_state(s1, None)
+        self.assertEqual(d1, {"module": "m"})
+        self.assertIs(abstract._lower_state(s1, None), d1)
+
+        d2 = abstract._lower_state(s1, 1.5)
+        self.assertEqual(d2, {
+            "module": "m",
+            "config": {
+                "query_execution_timeout": datetime.timedelta(seconds=1.5),
+            },
+        })
+        self.assertIs(abstract._lower_state(s1, 1.5), d2)
+        self.assertEqual(s1.as_dict(), {"module": "m"})
+
+        s2 = s1.with_config(foo=1)
+        self.assertEqual(abstract._lower_state(s2, 1.5)["config"], {
+            "foo": 1,
+            "query_execution_timeout": datetime.timedelta(seconds=1.5),
+        })
+
+        self.assertIsNone(abstract._lower_state(None, None))
+        self.assertIs(
+            abstract._lower_state(None, 1.5),
+            abstract._lower_state(None, 1.5))
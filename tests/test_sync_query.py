@@ -22,10 +22,16 @@ import json
 import random
 import threading
 import time
+import unittest
 import uuid
 
 import edgedb
 
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
 from edgedb import abstract
 from gel import _testbase as tb
 from edgedb.protocol import protocol
@@ -883,3 +889,94 @@ class TestSyncQuery(tb.SyncQueryTestCase):
                 tx.execute('''
                     INSERT test::Tmp { id := <uuid>$0, tmp := '' }
                 ''', uuid.uuid4())
+
+    def test_sync_pipeline_01(self):
+        pipeline = self.client.pipeline()
+        for _ in range(2):
+            # The second run hits the query cache.
+            pipeline.query('select {1, 2, 3}')
+            pipeline.query_single('select <str>$0', 'hello')
+            pipeline.query_required_single_json('select <int64>$a', a=42)
+            pipeline.execute('select 1')
+            self.assertEqual(len(pipeline), 4)
+            res = pipeline.run()
+            self.assertEqual(
+                res, [edgedb.Set((1, 2, 3)), 'hello', '42', None]
+            )
+            self.assertEqual(len(pipeline), 0)
+
+        pipeline.query('select 1')
+        pipeline.query('select 1 / 0')
+        pipeline.query('select 2')
+        with self.assertRaises(edgedb.DivisionByZeroError):
+            pipeline.run()
+
+        pipeline.query('select 1')
+        self.assertEqual(pipeline.run(), [edgedb.Set((1,))])
+
+    def test_sync_execute_many_01(self):
+        self.client.execute_many(
+            'insert test::Tmp { tmp := <str>$0 }',
+            (('many-{}'.format(i),) for i in range(1000)),
+        )
+        self.assertEqual(
+            self.client.query_single('''
+                select count(test::Tmp filter .tmp like 'many-%')
+            '''),
+            1000,
+        )
+        self.client.execute('''
+            delete test::Tmp filter .tmp like 'many-%'
+        ''')
+
+        with self.assertRaises(edgedb.DivisionByZeroError) as e:
+            self.client.execute_many(
+                'select 1 // <int64>$0', [(2,), (1,), (0,), (1,)]
+            )
+        self.assertEqual(e.exception.get_args_index(), 2)
+
+    def test_sync_query_iter_01(self):
+        rows = list(self.client.query_iter(
+            'select range_unpack(range(0, <int64>$0))', 100_000
+        ))
+        self.assertEqual(rows, list(range(100_000)))
+
+        for _ in range(self.client.max_concurrency + 1):
+            rows = self.client.query_iter(
+                'select range_unpack(range(0, 100000))'
+            )
+            for row in rows:
+                if row == 10:
+                    break
+            rows.close()
+
+        self.assertEqual(self.client.query_single('select 42'), 42)
+
+        with self.assertRaises(edgedb.DivisionByZeroError):
+            list(self.client.query_iter('select 1 // {1, 0}'))
+
+    def test_sync_query_columns_01(self):
+        cols = self.client.query_columns('''
+            for x in {1, 2, 3} union {
+                a := x,
+                b := <float64>x / 2,
+                c := x if x != 2 else <int64>{},
+                s := <str>x,
+            }
+        ''')
+        self.assertEqual(cols['a'].tolist(), [1, 2, 3])
+        self.assertEqual(cols['b'].tolist(), [0.5, 1.0, 1.5])
+        self.assertEqual(cols['c'], [1, None, 3])
+        self.assertEqual(cols['s'], ['1', '2', '3'])
+
+        with self.assertRaises(edgedb.InterfaceError):
+            self.client.query_columns('select 1')
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_sync_query_arrow_01(self):
+        table = self.client.query_arrow('''
+            for x in {1, 2, 3} union (a := x, s := <str>x)
+        ''')
+        self.assertEqual(table.column_names, ['a', 's'])
+        self.assertEqual(table.column('a').to_pylist(), [1, 2, 3])
+        self.assertEqual(table.column('s').to_pylist(), ['1', '2', '3'])
@@ -23,6 +23,11 @@ import array
 import math
 import unittest
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 # An array.array subtype where indexing doesn't work.
 # We use this to verify that the non-boxing memoryview based
@@ -283,3 +288,52 @@ class TestVector(tb.SyncQueryTestCase):
                 ''',
                 [1_000_000],
             )
+
+        # The memview fast path is used for halfvec values too.
+        val = self.client.query_single(
+            '''
+                select <json><ext::pgvector::halfvec>$0
+            ''',
+            brokenarray('f', [3.0, 9.0, -42.5])
+        )
+        self.assertEqual(val, '[3, 9, -42.5]')
+
+        with self.assertRaises(edgedb.InvalidArgumentError):
+            self.client.query_single(
+                '''
+                    select <ext::pgvector::halfvec>$0
+                ''',
+                array.array('f', [1_000_000]),
+            )
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_vector_numpy_01(self):
+        cols = self.client.query_numpy('''
+            for x in {1, 2, 3} union (
+                i := x,
+                v := <ext::pgvector::vector>[x, x + 0.5, -x],
+                opt := (
+                    <ext::pgvector::vector>[x, x]
+                    if x != 2 else <ext::pgvector::vector>{}
+                ),
+            )
+        ''')
+        self.assertEqual(cols['v'].dtype, numpy.float32)
+        self.assertEqual(cols['v'].shape, (3, 3))
+        self.assertEqual(
+            cols['v'].tolist(),
+            [[1, 1.5, -1], [2, 2.5, -2], [3, 3.5, -3]])
+        self.assertIsInstance(cols['opt'], numpy.ma.MaskedArray)
+        self.assertEqual(
+            cols['opt'].tolist(), [[1, 1], [None, None], [3, 3]])
+
+        # Vectors of different lengths are returned one by one.
+        cols = self.client.query_numpy('''
+            for x in {1, 2} union (
+                v := <ext::pgvector::vector>(
+                    [1.0] if x = 1 else [1.0, 2.0])
+            )
+        ''')
+        self.assertEqual(cols['v'].dtype, object)
+        self.assertEqual(
+            sorted(list(v) for v in cols['v']), [[1], [1, 2]])